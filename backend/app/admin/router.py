@@ -1,6 +1,6 @@
 
-from select import select
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.deps import get_db
@@ -18,12 +18,18 @@ from app.admin.service import (
     review_company,
     review_ngo,
     get_donation_logs,
+    donation_log_export_query,
     get_pending_companies,
     get_pending_ngos,
     get_verified_companies,
-    get_verified_ngos
+    get_verified_ngos,
+    get_chain_audit_log
 )
-from app.models.clinic_requirments import ClinicRequirements
+from app.core.cache import cached_json, tenant_tag
+from app.core.pagination import Page, PageParams
+from app.exports.service import export_response
+from app.blockchain.client import health_check
+from app.services.rollup_service import get_dashboard_kpis, PLATFORM, PLATFORM_TENANT_ID
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -72,13 +78,27 @@ async def review_ngo_endpoint(
 
 @router.get(
     "/donations",
-    response_model=list[AdminDonationLogResponse],
+    response_model=Page[AdminDonationLogResponse],
+    response_model_exclude_unset=True,
 )
 async def get_donation_logs_endpoint(
+    page: PageParams = Depends(),
     db: AsyncSession = Depends(get_db),
 ):
-    print("Fetching donation logs")
-    return await get_donation_logs(db)
+    return await get_donation_logs(db, page)
+
+
+@router.get("/donations/export")
+async def export_donation_logs(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+):
+    return export_response(
+        donation_log_export_query(),
+        "donation_logs",
+        export_format,
+        gzip,
+    )
 
 
 @router.get(
@@ -103,70 +123,55 @@ async def get_ngo_requests(
 
 @router.get(
     "/admin/companies/verified",
-    response_model=list[CompanyResponse]
+    response_model=Page[CompanyResponse],
+    response_model_exclude_unset=True,
 )
 async def fetch_verified_companies(
+    page: PageParams = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    return await get_verified_companies(db)
+    return await get_verified_companies(db, page)
 
 
 @router.get(
     "/admin/ngos/verified",
-    response_model=list[NGOResponse]
+    response_model=Page[NGOResponse],
+    response_model_exclude_unset=True,
 )
 async def fetch_verified_ngos(
+    page: PageParams = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    return await get_verified_ngos(db)
-
-from sqlalchemy import select, func
+    return await get_verified_ngos(db, page)
 
 @router.get("/dashboard")
-async def admin_dashboard(db: AsyncSession = Depends(get_db)):
-
-    total_requirements = await db.scalar(
-        select(func.count()).select_from(ClinicRequirements)
-    )
-
-    confirmed = await db.scalar(
-        select(func.count())
-        .select_from(ClinicRequirements)
-        .where(ClinicRequirements.status == "CONFIRMED")
-    )
+async def admin_dashboard(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    async def build():
+        return {
+            "kpis": await get_dashboard_kpis(db, PLATFORM),
+        }
 
-    allocated = await db.scalar(
-        select(func.count())
-        .select_from(ClinicRequirements)
-        .where(ClinicRequirements.status == "ALLOCATED")
+    return await cached_json(
+        request,
+        {"role": "ADMIN"},
+        [tenant_tag(PLATFORM, PLATFORM_TENANT_ID)],
+        build,
     )
 
-    return {
-        "kpis": {
-            "total_requirements": total_requirements or 0,
-            "confirmed": confirmed or 0,
-            "allocated": allocated or 0,
-        }
-    }
 
 
+@router.get("/blockchain/audit", summary="On-chain audit events, paged from the local mirror")
+async def admin_chain_audit(
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_db),
+):
+    return await get_chain_audit_log(db, page)
 
-# @router.get("/blockchain/audit")
-# async def admin_blockchain_audit():
-#     logs = []
-#     total = contract.functions.totalLogs().call()
 
-#     for i in range(total):
-#         action, record_hash, timestamp = contract.functions.getLog(i).call()
-#         logs.append({
-#             "index": i,
-#             "action": action,
-#             "record_hash": record_hash,
-#             "timestamp": timestamp,
-#         })
+@router.get("/blockchain/health", summary="Blockchain node connectivity and circuit breaker state")
+async def admin_chain_health():
+    return await run_in_threadpool(health_check)
 
-#     return {
-#         "total_logs": total,
-#         "logs": logs,
-#         "network": "Ethereum (Ganache)",
-#     }
@@ -34,29 +34,34 @@ class AdminReviewResponse(BaseModel):
 
 
 class AdminDonationLogResponse(BaseModel):
-    id: int
-    company_id: int
+    # all optional: clients may project a subset with `fields=`
+    id: Optional[int] = None
+    company_id: Optional[int] = None
     ngo_id:  Optional[int] = None 
-    item_name: str
-    quantity: int
-    purpose: str
-    status: str
-    authorized_at: datetime
+    item_name: Optional[str] = None
+    quantity: Optional[int] = None
+    purpose: Optional[str] = None
+    status: Optional[str] = None
+    authorized_at: Optional[datetime] = None
+    clinic_requirement_id: Optional[int] = None
+    allocated_at: Optional[datetime] = None
+    received: Optional[bool] = None
+    received_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
 class CompanyResponse(BaseModel):
-    id: int
-    company_name: str
+    id: Optional[int] = None
+    company_name: Optional[str] = None
     is_verified: Optional[bool] = None
 
     class Config:
         from_attributes = True
 
 class NGOResponse(BaseModel):
-    id: int
-    ngo_name: str
+    id: Optional[int] = None
+    ngo_name: Optional[str] = None
     is_verified: Optional[bool] = None
 
     class Config:
@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -12,6 +13,12 @@ from app.auth.invitation_token import create_invite_token
 from app.notifications.email_service import send_csr_password_setup_email, send_ngo_password_setup_email
 from app.core.config import settings
 from app.models.user import User    
+from app.core.pagination import PageParams, paginate, project
+from app.auth.org_status import invalidate_org_status
+from app.models.chain_audit_event import ChainAuditEvent, ChainSyncCursor
+from app.blockchain.indexer import CURSOR_NAME as AUDIT_CURSOR_NAME
+
+logger = logging.getLogger(__name__)
 
 async def get_pending_companies(db: AsyncSession):
     result = await db.execute(
@@ -78,14 +85,15 @@ async def review_company(
             email=str(company.official_email),
             csr_uid=company.csr_uid
         )
-        print("Generated token for CSR password setup:", token)
+        logger.info("CSR password setup invitation issued", extra={"company_id": company.id})
 
         invite_link = (
             f"{settings.FRONTEND_URL}/static/set-csr-password.html"
             f"?token={token}"
         )
 
-        await send_csr_password_setup_email(
+        send_csr_password_setup_email(
+            db,
             to_email=company.official_email,
             company_name=company.company_name,
             csr_uid=company.csr_uid,
@@ -106,6 +114,7 @@ async def review_company(
     )
 
     await db.commit()
+    invalidate_org_status("CSR", company.id)
 
     return {
         "csr_uid": company.csr_uid,
@@ -143,15 +152,16 @@ async def review_ngo(
             email=str(ngo.official_email),
             ngo_uid=ngo.ngo_uid,
         )
-        print("Generated token for NGO password setup:", token)
+        logger.info("NGO password setup invitation issued", extra={"ngo_id": ngo.id})
 
         invite_link = (
             f"{settings.FRONTEND_URL}/static/set-ngo-password.html"
             f"?token={token}"
         )
 
-        # 4️⃣ Send email
-        await send_ngo_password_setup_email(
+        # 4️⃣ Queue email (sent after commit)
+        send_ngo_password_setup_email(
+            db,
             to_email=ngo.official_email,
             ngo_name=ngo.ngo_name,
             ngo_uid=ngo.ngo_uid,
@@ -175,6 +185,7 @@ async def review_ngo(
 
     # 6️⃣ Save
     await db.commit()
+    invalidate_org_status("NGO", ngo.id)
 
     return {
         "ngo_uid": ngo.ngo_uid,
@@ -183,77 +194,123 @@ async def review_ngo(
 
 
 from sqlalchemy import case, func
-async def get_donation_logs(db: AsyncSession):
-    result = await db.execute(
-        select(
-            # Donation fields (same as your current response)
-            Donation.id,
-            Donation.company_id,
-            Donation.ngo_id,
-            Donation.item_name,
-            Donation.quantity,
-            Donation.purpose,
-            Donation.authorized_at,
 
-            # ✅ Clinic allocation field (THIS IS WHAT YOU WANT)
-            DonationAllocation.clinic_requirement_id,
+DONATION_LOG_FIELDS = {
+    # Donation fields
+    "id": Donation.id,
+    "company_id": Donation.company_id,
+    "ngo_id": Donation.ngo_id,
+    "item_name": Donation.item_name,
+    "quantity": Donation.quantity,
+    "purpose": Donation.purpose,
+    "authorized_at": Donation.authorized_at,
+
+    # Clinic allocation field
+    "clinic_requirement_id": DonationAllocation.clinic_requirement_id,
+
+    # Optional allocation metadata
+    "allocated_at": DonationAllocation.allocated_at,
+    "received": DonationAllocation.received,
+    "received_at": DonationAllocation.received_at,
+
+    # ✅ FINAL DERIVED STATUS (business-correct)
+    "status": case(
+        (
+            DonationAllocation.received.is_(True),
+            "CLINIC_ACCEPTED"
+        ),
+        (
+            DonationAllocation.donation_id.isnot(None),
+            "NGO_ACCEPTED"
+        ),
+        else_="AUTHORIZED"
+    ),
+}
+
+
+async def get_donation_logs(db: AsyncSession, page: PageParams):
+    return await paginate(
+        db,
+        select(*project(DONATION_LOG_FIELDS, page.fields))
+        .select_from(Donation)
+        .outerjoin(
+            DonationAllocation,
+            DonationAllocation.donation_id == Donation.id
+        ),
+        # one row per allocation: the allocation id keeps the key unique,
+        # so a page boundary inside a donation skips none of its rows
+        (Donation.created_at, Donation.id, func.coalesce(DonationAllocation.id, 0)),
+        page,
+    )
 
-            # Optional allocation metadata
-            DonationAllocation.allocated_at,
-            DonationAllocation.received,
-            DonationAllocation.received_at,
 
-            # ✅ FINAL DERIVED STATUS (business-correct)
-            case(
-                (
-                    DonationAllocation.received.is_(True),
-                    "CLINIC_ACCEPTED"
-                ),
-                (
-                    DonationAllocation.donation_id.isnot(None),
-                    "NGO_ACCEPTED"
-                ),
-                else_="AUTHORIZED"
-            ).label("status"),
-        )
+def donation_log_export_query():
+    """
+    Full donation log, oldest first, for streaming exports.
+    """
+    return (
+        select(*project(DONATION_LOG_FIELDS, None))
+        .select_from(Donation)
         .outerjoin(
             DonationAllocation,
             DonationAllocation.donation_id == Donation.id
         )
-        .order_by(
-            func.coalesce(
-                DonationAllocation.allocated_at,
-                Donation.authorized_at
-            ).desc()
-        )
-        .limit(10)
+        .order_by(Donation.id)
     )
 
-    return result.mappings().all()
 
+COMPANY_FIELDS = {
+    "id": Company.id,
+    "company_name": Company.company_name,
+    "is_verified": Company.is_verified,
+}
 
+NGO_FIELDS = {
+    "id": NGO.id,
+    "ngo_name": NGO.ngo_name,
+    "is_verified": NGO.is_verified,
+}
 
-async def get_verified_companies(db: AsyncSession):
-    result = await db.execute(
-        select(Company)
-        .where(Company.is_verified.is_(True))
-        .order_by(Company.id.desc())
+
+async def get_verified_companies(db: AsyncSession, page: PageParams):
+    # companies have no created_at, the id is the only sort key
+    return await paginate(
+        db,
+        select(*project(COMPANY_FIELDS, page.fields))
+        .where(Company.is_verified.is_(True)),
+        (Company.id,),
+        page,
     )
-    return result.scalars().all()
 
 
-async def get_verified_ngos(db: AsyncSession):
-    result = await db.execute(
-        select(NGO)
-        .where(NGO.is_verified.is_(True))
-        .order_by(NGO.id.desc())
+async def get_verified_ngos(db: AsyncSession, page: PageParams):
+    return await paginate(
+        db,
+        select(*project(NGO_FIELDS, page.fields))
+        .where(NGO.is_verified.is_(True)),
+        (NGO.created_at, NGO.id),
+        page,
     )
-    return result.scalars().all()
+
+
+COMPANY_DONATION_FIELDS = {
+    "id": Donation.id,
+    "item_name": Donation.item_name,
+    "quantity": Donation.quantity,
+    "purpose": Donation.purpose,
+    "board_resolution_ref": Donation.board_resolution_ref,
+    "csr_policy_declared": Donation.csr_policy_declared,
+    "status": Donation.status,
+    "authorized_at": Donation.authorized_at,
+    "created_at": Donation.created_at,
+    "ngo_id": Donation.ngo_id,
+}
 
 
 async def get_company_with_donations(
     db: AsyncSession,
-    company_id: int
+    company_id: int,
+    page: PageParams,
 ):
     result = await db.execute(
         select(
@@ -262,53 +319,27 @@ async def get_company_with_donations(
             Company.cin,
             Company.pan,
             Company.is_verified,
-
-            Donation.id.label("donation_id"),
-            Donation.item_name,
-            Donation.quantity,
-            Donation.purpose,
-            Donation.board_resolution_ref,
-            Donation.csr_policy_declared,
-            Donation.status,
-            Donation.authorized_at,
-            Donation.created_at,
-            Donation.ngo_id,
         )
-        .join(Donation, Donation.company_id == Company.id, isouter=True)
         .where(Company.id == company_id)   # 👈 FILTER HERE
-        .order_by(Donation.created_at.desc().nullslast())
     )
+    row = result.mappings().one_or_none()
 
-    rows = result.mappings().all()
-
-    if not rows:
+    if not row:
         return None   # or raise HTTPException(404)
 
-    company = {
-        "id": rows[0]["id"],
-        "company_name": rows[0]["company_name"],
-        "cin": rows[0]["cin"],
-        "pan": rows[0]["pan"],
-        "is_verified": rows[0]["is_verified"],
-        "donations": []
-    }
-
-    for row in rows:
-        if row["donation_id"] is not None:
-            company["donations"].append({
-                "id": row["donation_id"],
-                "item_name": row["item_name"],
-                "quantity": row["quantity"],
-                "purpose": row["purpose"],
-                "board_resolution_ref": row["board_resolution_ref"],
-                "csr_policy_declared": row["csr_policy_declared"],
-                "status": row["status"],
-                "authorized_at": row["authorized_at"],
-                "created_at": row["created_at"],
-                "ngo_id": row["ngo_id"],
-            })
+    donations = await paginate(
+        db,
+        select(*project(COMPANY_DONATION_FIELDS, page.fields))
+        .where(Donation.company_id == company_id),
+        (Donation.created_at, Donation.id),
+        page,
+    )
 
-    return company
+    return {
+        **row,
+        "donations": donations["items"],
+        "next_cursor": donations["next_cursor"],
+    }
 
 
 async def get_ngo_with_donations_and_allocations(
@@ -378,4 +409,30 @@ async def get_ngo_with_donations_and_allocations(
                 } if row["clinic_requirement_id"] is not None else None
             })
 
-    return ngo
\ No newline at end of file
+    return ngo
+
+
+CHAIN_AUDIT_FIELDS = {
+    "block_number": ChainAuditEvent.block_number,
+    "log_index": ChainAuditEvent.log_index,
+    "tx_hash": ChainAuditEvent.tx_hash,
+    "action": ChainAuditEvent.action,
+    "record_hash": ChainAuditEvent.record_hash,
+    "timestamp": ChainAuditEvent.chain_timestamp,
+}
+
+
+async def get_chain_audit_log(db: AsyncSession, page: PageParams):
+    """
+    Page over the local mirror of on-chain audit events, newest first.
+    """
+    result = await paginate(
+        db,
+        select(*project(CHAIN_AUDIT_FIELDS, page.fields)),
+        (ChainAuditEvent.block_number, ChainAuditEvent.log_index),
+        page,
+    )
+
+    cursor = await db.get(ChainSyncCursor, AUDIT_CURSOR_NAME)
+    result["last_synced_block"] = cursor.last_block if cursor else None
+    return result
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.audit.schema import BulkVerifyRequest
+from app.audit.service import verify_bulk, verify_entity
+from app.core.security import get_current_principal
+from app.db.deps import get_db
+from app.schemas.auth import Principal
+
+router = APIRouter(prefix="/audit", tags=["Audit"])
+
+
+@router.get("/{entity}/{entity_id}/verify", summary="Verify the audit trail of one record")
+async def verify_entity_endpoint(
+    entity: str,
+    entity_id: int,
+    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    return await verify_entity(db, entity, entity_id, principal)
+
+
+@router.post("/verify", summary="Verify many audit records in one pass")
+async def verify_bulk_endpoint(
+    data: BulkVerifyRequest,
+    db: AsyncSession = Depends(get_db),
+    principal: Principal = Depends(get_current_principal),
+):
+    return await verify_bulk(db, data, principal)
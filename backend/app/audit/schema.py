@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+
+class BulkVerifyRequest(BaseModel):
+    """
+    Pick records by entity ids, by anchoring batch, or walk the whole
+    log with `after_id`. Filters combine.
+    """
+    entity: str | None = Field(None, example="donation")
+    ids: list[int] | None = None
+    batch_id: int | None = None
+    after_id: int = 0
+    limit: int = Field(1000, ge=1)
@@ -0,0 +1,266 @@
+import json
+
+from fastapi import HTTPException
+from sqlalchemy import String, and_, cast, false, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.blockchain.canonical import SNAPSHOT_BUILDERS
+from app.blockchain.merkle import verify_proof
+from app.blockchain.service import audit_leaf
+from app.core.config import settings
+from app.models.audit_record import AuditBatch, AuditRecord
+from app.models.chain_audit_event import ChainAuditEvent
+from app.models.clinic_requirments import ClinicRequirements
+from app.models.donation import Donation
+from app.models.donation_allocations import DonationAllocations
+from app.schemas.auth import Principal
+
+# URL entity name -> AuditRecord.entity_type
+ENTITY_TYPES = {
+    "donation": "DONATION",
+    "allocation": "DONATION_ALLOCATION",
+}
+
+SOURCE_MODELS = {
+    "DONATION": Donation,
+    "DONATION_ALLOCATION": DonationAllocations,
+}
+
+# worst first
+VERDICTS = ("MISMATCH", "UNCONFIRMED", "PENDING", "VERIFIED")
+
+
+def _entity_type(entity: str) -> str:
+    try:
+        return ENTITY_TYPES[entity]
+    except KeyError:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown audit entity '{entity}'"
+        )
+
+
+def _owned_ids(principal: Principal, entity_type: str):
+    """
+    Ids, as stored in AuditRecord.entity_id, of the entities of one type
+    the caller's organization is party to: the donating company, the
+    receiving NGO, or a clinic it was allocated to.
+    """
+    if entity_type == "DONATION":
+        model = Donation
+        stmt = select(cast(Donation.id, String))
+    else:
+        model = DonationAllocations
+        stmt = (
+            select(cast(DonationAllocations.id, String))
+            .join(Donation, Donation.id == DonationAllocations.donation_id)
+        )
+
+    if principal.role == "CSR":
+        return stmt.where(Donation.company_id == principal.company_id)
+    if principal.role == "NGO":
+        return stmt.where(Donation.ngo_id == principal.ngo_id)
+    if principal.role == "CLINIC":
+        if model is Donation:
+            stmt = stmt.join(
+                DonationAllocations, DonationAllocations.donation_id == Donation.id
+            )
+        return stmt.join(
+            ClinicRequirements,
+            ClinicRequirements.id == DonationAllocations.clinic_requirement_id,
+        ).where(ClinicRequirements.clinic_id == principal.clinic_id)
+    return None
+
+
+def _visible_to(principal: Principal):
+    """
+    Filter limiting audit records to the caller's own entities.
+    Admins see everything; records of other tenants are simply absent.
+    """
+    if principal.role == "ADMIN":
+        return None
+
+    clauses = []
+    for entity_type in SOURCE_MODELS:
+        owned = _owned_ids(principal, entity_type)
+        if owned is not None:
+            clauses.append(and_(
+                AuditRecord.entity_type == entity_type,
+                AuditRecord.entity_id.in_(owned),
+            ))
+    return or_(*clauses) if clauses else false()
+
+
+def _verify_one(record: AuditRecord, batch, source_row, on_chain_roots: set) -> dict:
+    payload = json.loads(record.payload)
+    leaf = audit_leaf(
+        record.action,
+        record.entity_type,
+        record.entity_id,
+        payload,
+        record.recorded_at,
+    )
+
+    checks = {
+        # the stored record still hashes to its recorded hash
+        "hash_matches": leaf.hex() == record.record_hash,
+        # the live row still matches the snapshot taken at audit time
+        "source_matches": (
+            source_row is not None
+            and SNAPSHOT_BUILDERS[record.entity_type](source_row) == payload.get("snapshot")
+        ),
+        "proof_valid": None,
+        "anchored": None,
+        "on_chain": None,
+    }
+
+    if batch is not None:
+        checks["proof_valid"] = verify_proof(
+            leaf, record.proof or [], bytes.fromhex(batch.merkle_root)
+        )
+        checks["anchored"] = batch.status == "ANCHORED"
+        if checks["anchored"]:
+            checks["on_chain"] = batch.merkle_root in on_chain_roots
+
+    if False in (checks["hash_matches"], checks["source_matches"], checks["proof_valid"]):
+        verdict = "MISMATCH"
+    elif not checks["anchored"]:
+        verdict = "PENDING"
+    elif not checks["on_chain"]:
+        verdict = "UNCONFIRMED"
+    else:
+        verdict = "VERIFIED"
+
+    return {
+        "audit_id": record.id,
+        "action": record.action,
+        "entity_type": record.entity_type,
+        "entity_id": record.entity_id,
+        "record_hash": record.record_hash,
+        "recorded_at": record.recorded_at,
+        "batch_id": record.batch_id,
+        "merkle_root": batch.merkle_root if batch else None,
+        "tx_hash": batch.tx_hash if batch else None,
+        "block_number": batch.block_number if batch else None,
+        "proof": record.proof,
+        "checks": checks,
+        "verdict": verdict,
+    }
+
+
+async def verify_records(db: AsyncSession, records: list[AuditRecord]) -> list[dict]:
+    """
+    Verify many records in one pass: batches, indexed chain events and
+    source rows are each loaded with a single IN query, the hashing and
+    proof checks then run in memory.
+    """
+    batch_ids = {r.batch_id for r in records if r.batch_id is not None}
+    batches = {}
+    if batch_ids:
+        result = await db.execute(
+            select(AuditBatch).where(AuditBatch.id.in_(batch_ids))
+        )
+        batches = {b.id: b for b in result.scalars()}
+
+    roots = {b.merkle_root for b in batches.values() if b.status == "ANCHORED"}
+    on_chain_roots = set()
+    if roots:
+        result = await db.execute(
+            select(ChainAuditEvent.record_hash)
+            .where(ChainAuditEvent.record_hash.in_(roots))
+        )
+        on_chain_roots = set(result.scalars())
+
+    sources = {}
+    for entity_type, model in SOURCE_MODELS.items():
+        ids = {int(r.entity_id) for r in records if r.entity_type == entity_type}
+        if ids:
+            result = await db.execute(select(model).where(model.id.in_(ids)))
+            sources[entity_type] = {row.id: row for row in result.scalars()}
+
+    return [
+        _verify_one(
+            record,
+            batches.get(record.batch_id),
+            sources.get(record.entity_type, {}).get(int(record.entity_id)),
+            on_chain_roots,
+        )
+        for record in records
+    ]
+
+
+def overall_verdict(results: list[dict]) -> str:
+    found = {r["verdict"] for r in results}
+    return next(v for v in VERDICTS if v in found)
+
+
+async def verify_entity(
+    db: AsyncSession,
+    entity: str,
+    entity_id: int,
+    principal: Principal,
+):
+    entity_type = _entity_type(entity)
+
+    stmt = (
+        select(AuditRecord)
+        .where(AuditRecord.entity_type == entity_type)
+        .where(AuditRecord.entity_id == str(entity_id))
+        .order_by(AuditRecord.id)
+    )
+    visible = _visible_to(principal)
+    if visible is not None:
+        stmt = stmt.where(visible)
+
+    result = await db.execute(stmt)
+    records = result.scalars().all()
+    if not records:
+        raise HTTPException(status_code=404, detail="No audit records for this entity")
+
+    results = await verify_records(db, records)
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "verdict": overall_verdict(results),
+        "records": results,
+    }
+
+
+async def verify_bulk(db: AsyncSession, request, principal: Principal):
+    """
+    Verify up to `limit` records after `after_id`, oldest first, among
+    those visible to the caller.
+    Only records that are not VERIFIED are listed; everything is counted.
+    """
+    limit = min(request.limit, settings.AUDIT_VERIFY_MAX_RECORDS)
+
+    stmt = (
+        select(AuditRecord)
+        .where(AuditRecord.id > request.after_id)
+        .order_by(AuditRecord.id)
+        .limit(limit)
+    )
+    if request.entity:
+        stmt = stmt.where(AuditRecord.entity_type == _entity_type(request.entity))
+    if request.ids:
+        stmt = stmt.where(AuditRecord.entity_id.in_([str(i) for i in request.ids]))
+    if request.batch_id is not None:
+        stmt = stmt.where(AuditRecord.batch_id == request.batch_id)
+
+    visible = _visible_to(principal)
+    if visible is not None:
+        stmt = stmt.where(visible)
+
+    records = (await db.execute(stmt)).scalars().all()
+    results = await verify_records(db, records)
+
+    counts = dict.fromkeys(VERDICTS, 0)
+    for r in results:
+        counts[r["verdict"]] += 1
+
+    return {
+        "checked": len(results),
+        "verdicts": counts,
+        "issues": [r for r in results if r["verdict"] != "VERIFIED"],
+        "next_after_id": records[-1].id if len(records) == limit else None,
+    }
@@ -1,3 +1,4 @@
+import uuid
 from datetime import datetime, timedelta
 from jose import jwt
 from app.core.config import settings
@@ -7,7 +8,8 @@ def create_clinic_invite_token(ngo_id: int, clinic_email: str):
         "ngo_id": ngo_id,
         "clinic_email": clinic_email,
         "type": "clinic_invite",
-        "exp": datetime.utcnow() + timedelta(minutes=30)
+        "exp": datetime.utcnow() + timedelta(minutes=30),
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
@@ -30,6 +32,7 @@ def create_invite_token(
         "role": role,
         "type": "INVITE",
         "exp": datetime.utcnow() + timedelta(minutes=30),
+        "jti": uuid.uuid4().hex,
     }
 
     # Attach correct UID based on role
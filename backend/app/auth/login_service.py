@@ -1,11 +1,11 @@
-from app.core.supabase import supabase
+from app.core.supabase import get_supabase
 
 
 async def login_user(email: str, password: str):
     """
     Logs in user using email + password.
     """
-    response = supabase.auth.signInWithPassword({
+    response = get_supabase().auth.signInWithPassword({
         "email": email,
         "password": password
     })
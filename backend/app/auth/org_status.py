@@ -0,0 +1,62 @@
+import time
+
+from app.core.config import settings
+
+
+class OrgStatusCache:
+    """
+    In-process cache of organization verification status, by login email.
+
+    Login skips the organization joins on a hit. Entries are dropped
+    when an admin reviews the company/NGO or a clinic is activated,
+    and expire after ORG_STATUS_CACHE_TTL as a safety net.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._by_email = {}
+        self._emails_by_org = {}
+
+    def get(self, email: str):
+        entry = self._by_email.get(email)
+        if entry is None:
+            return None
+
+        if entry["expires_at"] < time.monotonic():
+            self._drop(email)
+            return None
+
+        return entry["status"]
+
+    def set(self, email: str, role: str, org_id: int | None, status: bool):
+        self._drop(email)
+        self._by_email[email] = {
+            "org": (role, org_id),
+            "status": bool(status),
+            "expires_at": time.monotonic() + self.ttl,
+        }
+        self._emails_by_org.setdefault((role, org_id), set()).add(email)
+
+    def invalidate(self, role: str, org_id: int):
+        for email in self._emails_by_org.pop((role, org_id), set()):
+            self._by_email.pop(email, None)
+
+    def _drop(self, email: str):
+        entry = self._by_email.pop(email, None)
+        if entry:
+            self._emails_by_org.get(entry["org"], set()).discard(email)
+
+
+org_status_cache = OrgStatusCache(settings.ORG_STATUS_CACHE_TTL)
+
+
+def org_id_for(user) -> int | None:
+    return {
+        "CSR": user.company_id,
+        "NGO": user.ngo_id,
+        "CLINIC": user.clinic_id,
+    }.get(user.role)
+
+
+def invalidate_org_status(role: str, org_id: int):
+    org_status_cache.invalidate(role, org_id)
@@ -27,7 +27,7 @@
 #     except ValueError as e:
 #         raise HTTPException(status_code=401, detail=str(e))
 
-from select import select
+import logging
 from sqlalchemy import select
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
@@ -36,14 +36,18 @@ from app.db.deps import get_db
 from app.auth.service import login_user, set_password, set_password_from_token # Import both services
 from app.clinic.schema import SetPasswordRequest
 from app.clinic.service import accept_clinic_invitation, set_clinic_password
-from app.auth.utils import hash_password
-from app.auth.utils import hash_password
+from app.auth.utils import hash_password_async
 from app.models.user import User
 from app.models.company import Company
 from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.rate_limit import enforce_account_limit
+from app.core.revocation import is_token_revoked, revoke_token
+from app.core.security import decode_access_token, oauth2_scheme
 from app.models.ngo import NGO
 
+logger = logging.getLogger(__name__)
+
 # 1. Define the router ONCE
 router = APIRouter(
     prefix="/auth",
@@ -56,6 +60,10 @@ async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
+    await enforce_account_limit(
+        "login", form_data.username, settings.LOGIN_RATE_LIMIT_ACCOUNT
+    )
+
     try:
         return await login_user(
             db,
@@ -65,6 +73,19 @@ async def login(
     except ValueError as e:
         raise HTTPException(status_code=401, detail=str(e))
 
+
+@router.post("/logout", summary="Revoke the current access token")
+async def logout(
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_db)
+):
+    payload = await decode_access_token(token)
+
+    await revoke_token(db, payload, "LOGOUT")
+    await db.commit()
+
+    return {"message": "Logged out"}
+
 # 3. Add the Set Password endpoint to the SAME router
 @router.post("/set-password")
 async def set_password_endpoint(
@@ -91,45 +112,41 @@ async def set_csr_password(
     db: AsyncSession = Depends(get_db),
 ):
     # 1️⃣ Decode token
-    print("Received token for CSR password setup:", data.token)
     payload = jwt.decode(
         data.token,
         settings.SECRET_KEY,
         algorithms=[settings.ALGORITHM],
     )
-    print("Decoded token payload:", payload)
     email = payload.get("sub")
     role = payload.get("role")
     csr_uid = payload.get("csr_uid")
 
     if role != "CSR" or not csr_uid:
         raise HTTPException(status_code=400, detail="Invalid invitation token")
+
+    if await is_token_revoked(payload.get("jti"), db):
+        raise HTTPException(status_code=400, detail="Invitation already used")
     
-    print("Token is valid. Proceeding with CSR password setup for email:", csr_uid)
     # 2️⃣ Fetch company using csr_uid
     result = await db.execute(
         select(Company).where(Company.csr_uid == csr_uid)
     )
-    print("Company fetch result:", result)
     company = result.scalar_one_or_none()
-    print("Company found for CSR password setup:", company)
 
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
-        print("Company found for CSR password setup:", company.company_name)    
+
     # 3️⃣ Check if user already exists
     result = await db.execute(
         select(User).where(User.company_id == company.id)
     )
-    print("User fetch result:", result)
     user = result.scalar_one_or_none()
 
     # 4️⃣ Hash password
-    hashed_password = hash_password(data.password)
-    print("Password hashed successfully for email:", email)
+    hashed_password = await hash_password_async(data.password)
     # 5️⃣ CREATE or UPDATE user
     if not user:
-        print("No existing user found for company. Creating new CSR user.")
+        logger.info("Creating CSR user", extra={"company_id": company.id})
         user = User(
             email=email,
             role="CSR",
@@ -139,11 +156,12 @@ async def set_csr_password(
         )
         db.add(user)
     else:
-        print("Existing user found for company. Updating password.")
+        logger.info("Resetting CSR user password", extra={"company_id": company.id})
         user.password_hash = hashed_password
         user.password_set = True
 
-    # 6️⃣ Save
+    # 6️⃣ Save (the invitation is single-use)
+    await revoke_token(db, payload, "USED")
     await db.commit()
 
     return {"message": "CSR password set successfully"}
@@ -155,16 +173,12 @@ async def set_ngo_password(
     db: AsyncSession = Depends(get_db),
 ):
     # 1️⃣ Decode token
-    print("Received token for NGO password setup:", data.token)
-
     payload = jwt.decode(
         data.token,
         settings.SECRET_KEY,
         algorithms=[settings.ALGORITHM],
     )
 
-    print("Decoded token payload:", payload)
-
     email = payload.get("sub")
     role = payload.get("role")
     ngo_uid = payload.get("ngo_uid")
@@ -172,19 +186,16 @@ async def set_ngo_password(
     if role != "NGO" or not ngo_uid:
         raise HTTPException(status_code=400, detail="Invalid invitation token")
 
-    print("Token is valid. Proceeding with NGO password setup for UID:", ngo_uid)
+    if await is_token_revoked(payload.get("jti"), db):
+        raise HTTPException(status_code=400, detail="Invitation already used")
 
     # 2️⃣ Fetch NGO using ngo_uid
     result = await db.execute(
         select(NGO).where(NGO.ngo_uid == ngo_uid)
     )
 
-    print("NGO fetch result:", result)
-
     ngo = result.scalar_one_or_none()
 
-    print("NGO found for password setup:", ngo)
-
     if not ngo:
         raise HTTPException(status_code=404, detail="NGO not found")
 
@@ -193,18 +204,14 @@ async def set_ngo_password(
         select(User).where(User.ngo_id == ngo.id)
     )
 
-    print("User fetch result:", result)
-
     user = result.scalar_one_or_none()
 
     # 4️⃣ Hash password
-    hashed_password = hash_password(data.password)
-
-    print("Password hashed successfully for NGO email:", email)
+    hashed_password = await hash_password_async(data.password)
 
     # 5️⃣ CREATE or UPDATE user
     if not user:
-        print("No existing user found for NGO. Creating new NGO user.")
+        logger.info("Creating NGO user", extra={"ngo_id": ngo.id})
         user = User(
             email=email,
             role="NGO",
@@ -214,11 +221,12 @@ async def set_ngo_password(
         )
         db.add(user)
     else:
-        print("Existing user found for NGO. Updating password.")
+        logger.info("Resetting NGO user password", extra={"ngo_id": ngo.id})
         user.password_hash = hashed_password
         user.password_set = True
 
-    # 6️⃣ Save
+    # 6️⃣ Save (the invitation is single-use)
+    await revoke_token(db, payload, "USED")
     await db.commit()
 
     return {"message": "NGO password set successfully"}
@@ -241,6 +249,10 @@ async def forgot_password(
     email: str,
     db: AsyncSession = Depends(get_db),
 ):
+    await enforce_account_limit(
+        "forgot", email, settings.RESET_RATE_LIMIT_ACCOUNT
+    )
+
     result = await db.execute(
         select(User).where(User.email == email)
     )
@@ -257,16 +269,17 @@ async def forgot_password(
         f"?token={token}"
     )
 
-    await send_reset_password_email(
+    send_reset_password_email(
+        db,
         to_email=email,
         reset_link=reset_link,
     )
+    await db.commit()
 
     return {"message": "Password reset link sent to email"}
 
 
 from jose import jwt, JWTError
-from app.auth.utils import hash_password
 
 
 @router.post("/reset-password")
@@ -287,8 +300,15 @@ async def reset_password(
     if payload.get("type") != "RESET_PASSWORD":
         raise HTTPException(status_code=400, detail="Invalid token type")
 
+    if await is_token_revoked(payload.get("jti"), db):
+        raise HTTPException(status_code=400, detail="Reset link already used")
+
     email = payload.get("sub")
 
+    await enforce_account_limit(
+        "reset", email, settings.RESET_RATE_LIMIT_ACCOUNT
+    )
+
     result = await db.execute(
         select(User).where(User.email == email)
     )
@@ -298,9 +318,10 @@ async def reset_password(
         raise HTTPException(status_code=404, detail="User not found")
 
     # 🔑 OVERWRITE PASSWORD
-    user.password_hash = hash_password(new_password)
+    user.password_hash = await hash_password_async(new_password)
     user.password_set = True
 
+    await revoke_token(db, payload, "USED")
     await db.commit()
 
     return {"message": "Password reset successful"}
@@ -1,9 +1,18 @@
-from sqlalchemy import select, or_
+from sqlalchemy import select, or_, case, false
 from app.models.user import User
 from app.models.company import Company
 from app.models.ngo import NGO
 from app.models.clinic import Clinic
-from app.auth.utils import verify_password, create_access_token, hash_password
+from app.auth.utils import create_access_token, hash_password_async, verify_and_rehash_password
+from app.auth.org_status import org_status_cache, org_id_for
+
+# Verification flag of the user's own organization
+ORG_STATUS = case(
+    (User.role == "CSR", Company.is_verified),
+    (User.role == "NGO", NGO.is_verified),
+    (User.role == "CLINIC", Clinic.is_active),
+    else_=false(),
+)
 
 
 async def login_user(db, email: str, password: str):
@@ -13,46 +22,45 @@ async def login_user(db, email: str, password: str):
     - password is set
     """
 
-    # Get user
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    # Get user and organization status in ONE query.
+    # Warm logins know the org status already and skip the joins.
+    cached_status = org_status_cache.get(email)
+
+    if cached_status is None:
+        result = await db.execute(
+            select(User, ORG_STATUS.label("org_status"))
+            .outerjoin(Company, Company.id == User.company_id)
+            .outerjoin(NGO, NGO.id == User.ngo_id)
+            .outerjoin(Clinic, Clinic.id == User.clinic_id)
+            .where(User.email == email)
+        )
+        row = result.first()
+        user, organization_verified = row if row else (None, None)
+    else:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalar_one_or_none()
+        organization_verified = cached_status
 
     if not user:
         raise ValueError("Invalid email or password")
 
-    print("LOGIN ATTEMPT:", email)
-    print("PASSWORD SET:", user.password_set)
-    print("USER ROLE:", user.role)
-
     if not user.password_set:
         raise ValueError("Password not set. Please set password first.")
 
-    if not verify_password(password, user.password_hash):
+    valid, new_hash = await verify_and_rehash_password(
+        password, user.password_hash
+    )
+    if not valid:
         raise ValueError("Invalid email or password")
 
-    # Verify organization based on role
-    organization_verified = False
-
-    if user.role == "CSR" and user.company_id:
-        result = await db.execute(select(Company).where(Company.id == user.company_id))
-        company = result.scalar_one_or_none()
-        if company:
-            organization_verified = company.is_verified
-            print("COMPANY VERIFIED:", organization_verified)
-
-    elif user.role == "NGO" and user.ngo_id:
-        result = await db.execute(select(NGO).where(NGO.id == user.ngo_id))
-        ngo = result.scalar_one_or_none()
-        if ngo:
-            organization_verified = ngo.is_verified
-            print("NGO VERIFIED:", organization_verified)
+    # Transparent upgrade when BCRYPT_ROUNDS changed
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
 
-    elif user.role == "CLINIC" and user.clinic_id:
-        result = await db.execute(select(Clinic).where(Clinic.id == user.clinic_id))
-        clinic = result.scalar_one_or_none()
-        if clinic:
-            organization_verified = clinic.is_active
-            print("CLINIC ACTIVE:", organization_verified)
+    org_status_cache.set(
+        email, user.role, org_id_for(user), organization_verified
+    )
 
     if not organization_verified:
         raise ValueError(f"{user.role} not verified or not active")
@@ -103,7 +111,7 @@ async def set_password(db, email: str, password: str):
     if not organization_exists:
         raise ValueError(f"Organization not found for {user.role}")
 
-    user.password_hash = hash_password(password)
+    user.password_hash = await hash_password_async(password)
     user.password_set = True
 
     await db.commit()
@@ -134,7 +142,6 @@ async def set_password_from_token(
     email = payload.get("sub")
     role = payload.get("role")
     company_id = payload.get("company_id")
-    print("Decoded token payload:", payload)
     if not email or role != expected_role or not company_id:
         raise HTTPException(status_code=400, detail="Invalid invitation token")
 
@@ -1,4 +1,4 @@
-from app.core.supabase import supabase
+from app.core.supabase import get_supabase
 
 
 async def create_csr_user(email: str):
@@ -6,7 +6,7 @@ async def create_csr_user(email: str):
     Creates a CSR user account without password.
     User will set password manually.
     """
-    response = supabase.auth.admin.create_user({
+    response = get_supabase().auth.admin.create_user({
         "email": email,
         "email_confirm": True
     })
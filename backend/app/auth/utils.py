@@ -1,9 +1,26 @@
+import asyncio
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from passlib.context import CryptContext
 from datetime import datetime, timedelta
 from jose import jwt
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Hashes below BCRYPT_ROUNDS are flagged for rehash on next login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+)
+
+# bcrypt releases the GIL, so hashing runs in a small dedicated pool
+# instead of blocking the event loop. The pool size bounds how many
+# hashes run at once; extra requests queue here, not on the loop.
+password_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
 
 
 def hash_password(password: str) -> str:
@@ -16,12 +33,40 @@ def verify_password(password: str, hashed: str) -> bool:
     return pwd_context.verify(password, hashed)
 
 
+async def _run_in_password_executor(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(password_executor, func, *args)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash password without blocking the event loop."""
+    return await _run_in_password_executor(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Verify password without blocking the event loop."""
+    return await _run_in_password_executor(verify_password, password, hashed)
+
+
+async def verify_and_rehash_password(password: str, hashed: str):
+    """
+    Verify password and return a new hash if the stored one
+    uses outdated cost parameters.
+
+    Returns:
+        (valid, new_hash) - new_hash is None when no rehash is needed
+    """
+    return await _run_in_password_executor(
+        pwd_context.verify_and_update, password, hashed
+    )
+
+
 def create_access_token(data: dict) -> str:
     """Generate JWT token."""
     expire = datetime.utcnow() + timedelta(
         minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
     )
-    data.update({"exp": expire})
+    data.update({"exp": expire, "jti": uuid.uuid4().hex})
     return jwt.encode(data, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
@@ -35,6 +80,7 @@ def create_reset_password_token(email: str):
         "sub": email,
         "type": "RESET_PASSWORD",
         "exp": datetime.utcnow() + timedelta(minutes=30),
+        "jti": uuid.uuid4().hex,
     }
     return jwt.encode(
         payload,
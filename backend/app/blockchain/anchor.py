@@ -0,0 +1,286 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Integer, cast, func, select, update
+
+from app.blockchain.client import BlockchainUnavailable, chain_available
+from app.blockchain.merkle import build_levels, inclusion_proof
+from app.core.config import settings
+from app.models.audit_record import AuditBatch, AuditRecord
+from app.models.donation_allocations import DonationAllocations
+
+logger = logging.getLogger(__name__)
+
+# pg advisory lock taken by the worker that drives the chain this tick
+ANCHOR_LOCK_KEY = 0x41554449
+
+
+async def seal_batch(db, force: bool = False) -> AuditBatch | None:
+    """
+    Group unbatched records into a Merkle batch.
+
+    A batch is sealed once AUDIT_BATCH_SIZE records are waiting, or the
+    oldest waiting record is AUDIT_BATCH_INTERVAL seconds old.
+    """
+    pending = await db.execute(
+        select(func.count(), func.min(AuditRecord.recorded_at))
+        .where(AuditRecord.batch_id.is_(None))
+    )
+    count, oldest = pending.one()
+    if not count:
+        return None
+
+    due = datetime.now(timezone.utc) - timedelta(seconds=settings.AUDIT_BATCH_INTERVAL)
+    if not force and count < settings.AUDIT_BATCH_SIZE and oldest > due:
+        return None
+
+    result = await db.execute(
+        select(AuditRecord)
+        .where(AuditRecord.batch_id.is_(None))
+        .order_by(AuditRecord.id)
+        .limit(settings.AUDIT_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    records = result.scalars().all()
+    if not records:
+        return None
+
+    levels = build_levels([bytes.fromhex(r.record_hash) for r in records])
+
+    batch = AuditBatch(
+        merkle_root=levels[-1][0].hex(),
+        record_count=len(records),
+        status="PENDING",
+    )
+    db.add(batch)
+    await db.flush()
+
+    for index, record in enumerate(records):
+        record.batch_id = batch.id
+        record.leaf_index = index
+        record.proof = inclusion_proof(levels, index)
+
+    await db.commit()
+    return batch
+
+
+async def submit_pending_batches(db):
+    """
+    Send anchoring transactions for sealed batches without waiting for
+    them to be mined. Receipts are picked up by track_submitted_batches.
+
+    With the v2 contract up to AUDIT_ROOTS_PER_TX roots share one
+    transaction; the v1 contract takes one root per transaction.
+    """
+    from app.blockchain.audit_chain import submit_merkle_roots
+
+    result = await db.execute(
+        select(AuditBatch)
+        .where(AuditBatch.status == "PENDING")
+        .order_by(AuditBatch.id)
+    )
+    batches = result.scalars().all()
+
+    per_tx = settings.AUDIT_ROOTS_PER_TX if settings.AUDIT_CONTRACT_VERSION >= 2 else 1
+    groups = [batches[i:i + per_tx] for i in range(0, len(batches), per_tx)]
+
+    for group in groups:
+        for batch in group:
+            batch.attempts += 1
+
+        try:
+            tx_hash, nonce, gas_price = await run_in_threadpool(
+                submit_merkle_roots, [batch.merkle_root for batch in group]
+            )
+        except BlockchainUnavailable:
+            # node is down, not the batch's fault: don't spend an attempt
+            await db.rollback()
+            break
+        except Exception as exc:
+            # retried on the next tick until attempts run out
+            for batch in group:
+                batch.last_error = str(exc)[:500]
+                if batch.attempts >= settings.AUDIT_MAX_SUBMIT_ATTEMPTS:
+                    batch.status = "FAILED"
+            await db.commit()
+            logger.warning("Submitting audit batches failed: %s", exc)
+            break
+
+        submitted_at = datetime.now(timezone.utc)
+        for batch in group:
+            batch.status = "SUBMITTED"
+            batch.tx_hash = tx_hash
+            batch.tx_hashes = [tx_hash]
+            batch.nonce = nonce
+            batch.gas_price = gas_price
+            batch.submitted_at = submitted_at
+        await db.commit()
+
+
+async def replace_stuck_transactions(db, batches: list[AuditBatch]):
+    """
+    Re-send unmined anchoring transactions at their original nonce with a
+    higher gas price. The earlier send may still be mined, so the batch
+    stays SUBMITTED and every hash sent at the nonce keeps being tracked:
+    whichever one is mined anchors the batch, and the shared nonce
+    guarantees only one of them can be.
+    """
+    from app.blockchain.audit_chain import submit_merkle_roots
+
+    groups = {}
+    for batch in sorted(batches, key=lambda b: b.id):
+        groups.setdefault(batch.tx_hash, []).append(batch)
+
+    for group in groups.values():
+        head = group[0]
+        gas_price = None
+        if head.gas_price:
+            gas_price = head.gas_price * (100 + settings.AUDIT_GAS_BUMP_PERCENT) // 100
+
+        try:
+            tx_hash, _, gas_price = await run_in_threadpool(
+                submit_merkle_roots,
+                [batch.merkle_root for batch in group],
+                head.nonce,
+                gas_price,
+            )
+        except BlockchainUnavailable:
+            break
+        except Exception as exc:
+            # the earlier send is still tracked; try again next tick
+            for batch in group:
+                batch.last_error = str(exc)[:500]
+            logger.warning("Replacing audit anchor transaction failed: %s", exc)
+            continue
+
+        submitted_at = datetime.now(timezone.utc)
+        for batch in group:
+            batch.attempts += 1
+            batch.tx_hash = tx_hash
+            batch.tx_hashes = [*(batch.tx_hashes or []), tx_hash]
+            batch.gas_price = gas_price
+            batch.submitted_at = submitted_at
+            batch.last_error = "Receipt not found before timeout, replaced"
+
+
+async def backfill_allocation_tx(db, batch: AuditBatch):
+    """
+    Copy the anchoring transaction onto the allocations audited in this batch.
+    """
+    await db.execute(
+        update(DonationAllocations)
+        .where(
+            DonationAllocations.id.in_(
+                select(cast(AuditRecord.entity_id, Integer))
+                .where(AuditRecord.batch_id == batch.id)
+                .where(AuditRecord.entity_type == "DONATION_ALLOCATION")
+            )
+        )
+        .values(blockchain_tx=batch.tx_hash)
+    )
+
+
+async def track_submitted_batches(db):
+    """
+    Poll receipts for every hash of every submitted batch in one pass.
+    Mined batches become ANCHORED and reverted ones are resubmitted.
+    Unmined ones past AUDIT_RECEIPT_TIMEOUT are replaced at the same
+    nonce; only when that nonce was used by some other transaction does
+    the batch go back to PENDING for a fresh one.
+    """
+    from app.blockchain.audit_chain import get_confirmed_nonce, get_receipts, nonce_manager
+
+    result = await db.execute(
+        select(AuditBatch).where(AuditBatch.status == "SUBMITTED")
+    )
+    batches = result.scalars().all()
+    if not batches:
+        return
+
+    # read before the receipts: a nonce below this was used by a
+    # transaction mined before any receipt lookup below
+    confirmed_nonce = await run_in_threadpool(get_confirmed_nonce)
+    receipts = await run_in_threadpool(
+        get_receipts, [h for b in batches for h in (b.tx_hashes or [b.tx_hash])]
+    )
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=settings.AUDIT_RECEIPT_TIMEOUT)
+    stuck = []
+
+    for batch in batches:
+        mined = [h for h in (batch.tx_hashes or [batch.tx_hash]) if h in receipts]
+
+        if not mined:
+            if batch.nonce < confirmed_nonce:
+                # nonce taken by another transaction: none of ours can be mined
+                batch.status = "PENDING"
+                batch.tx_hashes = None
+                batch.last_error = "Nonce used by another transaction"
+                nonce_manager.reset()
+            elif batch.submitted_at < stale:
+                stuck.append(batch)
+            continue
+
+        batch.tx_hash = mined[0]
+        receipt = receipts[batch.tx_hash]
+
+        if not receipt["status"]:
+            batch.status = "PENDING"
+            batch.tx_hashes = None
+            batch.last_error = "Transaction reverted"
+            continue
+
+        batch.status = "ANCHORED"
+        batch.block_number = receipt["block_number"]
+        batch.anchored_at = now
+        await backfill_allocation_tx(db, batch)
+
+    await db.commit()
+
+    if stuck:
+        await replace_stuck_transactions(db, stuck)
+        await db.commit()
+
+
+async def try_lock_chain(lock_db) -> bool:
+    """
+    Take the anchorer's transaction-scoped advisory lock without waiting.
+    It is held until `lock_db`'s transaction ends, so that session must
+    not commit while the lock is needed.
+    """
+    result = await lock_db.execute(
+        select(func.pg_try_advisory_xact_lock(ANCHOR_LOCK_KEY))
+    )
+    return bool(result.scalar())
+
+
+async def run_audit_anchorer(session_factory, interval_seconds: int):
+    """
+    Background loop started on application startup.
+
+    Every worker runs it. Sealing is safe side by side (SKIP LOCKED);
+    sending and tracking are not, as workers would resend the same
+    PENDING batches from separate nonce counters, so only the worker
+    holding the advisory lock does them on a given tick.
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                while await seal_batch(db):
+                    pass
+
+                if chain_available():
+                    async with session_factory() as lock_db:
+                        if await try_lock_chain(lock_db):
+                            from app.blockchain.audit_chain import nonce_manager
+
+                            # another worker may have sent since our last tick
+                            nonce_manager.reset()
+                            await submit_pending_batches(db)
+                            await track_submitted_batches(db)
+        except Exception:
+            logger.exception("Audit anchorer failed")
+
+        await asyncio.sleep(interval_seconds)
@@ -1,24 +1,26 @@
 import json
 import hashlib
-from web3 import Web3
-from app.core.config import settings
+import threading
+from pathlib import Path
+from app.blockchain.audit_v2 import AUDIT_V2_ABI, ACTION_NAMES, normalize_hash
+from app.blockchain.client import chain_call
 
-w3 = Web3(Web3.HTTPProvider(settings.GANACHE_URL))
+# web3 and the node connection live in app.blockchain.client and are only
+# created on first use; nothing here touches the network at import time.
 
-contract = w3.eth.contract(
-    address=settings.AUDIT_CONTRACT_ADDRESS,
-    # abi=settings.AUDIT_CONTRACT_ABI,
-)
+AUDIT_ABI = json.loads((Path(__file__).parent / "contract.json").read_text())
 
 def generate_hash(data: dict) -> str:
     payload = json.dumps(data, sort_keys=True).encode()
     return hashlib.sha256(payload).hexdigest()
 
 
-def write_to_blockchain(action: str, payload: dict):
+@chain_call
+def write_to_blockchain(client, action: str, payload: dict):
     record_hash = generate_hash(payload)
+    w3 = client.w3
 
-    tx = contract.functions.logAction(
+    tx = client.contract.functions.logAction(
         action,
         record_hash
     ).transact({
@@ -30,6 +32,171 @@ def write_to_blockchain(action: str, payload: dict):
 
     return {
         "record_hash": record_hash,
-        "tx_hash": receipt.transactionHash.hex(),
+        "tx_hash": w3.to_hex(receipt.transactionHash),
         "block_number": receipt.blockNumber,
     }
+
+
+
+class NonceManager:
+    """
+    Hands out nonces locally so several transactions can be in flight
+    without asking the node each time. Reset after a rejected send.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._next = None
+
+    def next(self, w3, address: str) -> int:
+        with self._lock:
+            if self._next is None:
+                self._next = w3.eth.get_transaction_count(address, "pending")
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def reset(self):
+        with self._lock:
+            self._next = None
+
+
+nonce_manager = NonceManager()
+
+
+@chain_call
+def submit_merkle_roots(
+    client,
+    merkle_roots: list[str],
+    nonce: int | None = None,
+    gas_price: int | None = None,
+) -> tuple[str, int, int]:
+    """
+    Send the anchoring transaction without waiting for it to be mined.
+    Returns (tx_hash, nonce, gas_price).
+
+    v2 contract: every root goes into a single logBatch call.
+    v1 contract: one root per call through logAction, with a dedicated
+    action type.
+
+    Passing `nonce` replaces a transaction still in the mempool; its
+    `gas_price` must then be higher than the one being replaced.
+    """
+    sender = client.w3.eth.accounts[0]
+    replacing = nonce is not None
+    if not replacing:
+        nonce = nonce_manager.next(client.w3, sender)
+    gas_price = max(gas_price or 0, client.w3.eth.gas_price)
+
+    try:
+        if client.audit_v2 is not None:
+            tx_hash = client.audit_v2.log_batch(
+                merkle_roots,
+                ["MERKLE_ROOT"] * len(merkle_roots),
+                sender,
+                nonce,
+                gas_price,
+            )
+        else:
+            if len(merkle_roots) != 1:
+                raise ValueError("The v1 audit contract anchors one root per transaction")
+
+            tx_hash = client.w3.to_hex(client.contract.functions.logAction(
+                "MERKLE_ROOT",
+                merkle_roots[0]
+            ).transact({
+                "from": sender,
+                "nonce": nonce,
+                "gas": 3000000,
+                "gasPrice": gas_price,
+            }))
+    except Exception:
+        if not replacing:
+            nonce_manager.reset()
+        raise
+
+    return tx_hash, nonce, gas_price
+
+
+@chain_call
+def get_confirmed_nonce(client) -> int:
+    """
+    Nonce of the sender's next transaction counting mined ones only:
+    every lower nonce has been used by a mined transaction.
+    """
+    return client.w3.eth.get_transaction_count(client.w3.eth.accounts[0], "latest")
+
+
+@chain_call
+def get_receipts(client, tx_hashes: list[str]) -> dict:
+    """
+    One pass over every outstanding transaction.
+    Returns {tx_hash: {"status", "block_number"}} for mined ones only.
+    """
+    from web3.exceptions import TransactionNotFound
+
+    receipts = {}
+    for tx_hash in set(tx_hashes):
+        try:
+            receipt = client.w3.eth.get_transaction_receipt(tx_hash)
+        except TransactionNotFound:
+            continue
+
+        receipts[tx_hash] = {
+            "status": receipt.status,
+            "block_number": receipt.blockNumber,
+        }
+
+    return receipts
+
+
+def _event_topic(w3, abi: list, name: str) -> str:
+    event = next(e for e in abi if e.get("type") == "event" and e["name"] == name)
+    signature = f"{name}({','.join(i['type'] for i in event['inputs'])})"
+    return w3.to_hex(w3.keccak(text=signature))
+
+
+@chain_call
+def get_block_number(client) -> int:
+    return client.w3.eth.block_number
+
+
+@chain_call
+def get_audit_logs(client, from_block: int, to_block: int) -> list[dict]:
+    """
+    Every AuditRecorded event in a block range, from one eth_getLogs call.
+    v1 and v2 events are normalised to the same shape.
+    """
+    v2 = client.audit_v2 is not None
+    if v2:
+        active, abi = client.audit_v2.contract, AUDIT_V2_ABI
+    else:
+        active, abi = client.contract, AUDIT_ABI
+
+    logs = client.w3.eth.get_logs({
+        "address": active.address,
+        "fromBlock": from_block,
+        "toBlock": to_block,
+        "topics": [_event_topic(client.w3, abi, "AuditRecorded")],
+    })
+
+    event = active.events.AuditRecorded()
+    events = []
+    for log in logs:
+        args = event.process_log(log)["args"]
+
+        if v2:
+            action = ACTION_NAMES.get(args["actionCode"], str(args["actionCode"]))
+        else:
+            action = args["actionType"]
+
+        events.append({
+            "block_number": log["blockNumber"],
+            "log_index": log["logIndex"],
+            "tx_hash": client.w3.to_hex(log["transactionHash"]),
+            "action": action,
+            "record_hash": normalize_hash(args["recordHash"]),
+            "chain_timestamp": args["timestamp"],
+        })
+
+    return events
@@ -0,0 +1,121 @@
+import json
+from pathlib import Path
+
+SOLC_VERSION = "0.8.19"
+CONTRACT_SOURCE = Path(__file__).resolve().parents[2] / "contract" / "AuditLogV2.sol"
+ABI_PATH = Path(__file__).parent / "audit_log_v2.json"
+
+# generated from CONTRACT_SOURCE by script/deploy_audit_v2.py --abi-only
+AUDIT_V2_ABI = json.loads(ABI_PATH.read_text())
+
+# uint8 action codes used on chain by AuditLogV2.
+# Append only: existing codes must never be renumbered.
+ACTION_CODES = {
+    "MERKLE_ROOT": 0,
+    "DONATION_ACCEPTED": 1,
+    "DONATION_ALLOCATED": 2,
+    "DONATION_RECEIVED": 3,
+    "NGO_ALLOCATION": 4,
+}
+ACTION_NAMES = {code: name for name, code in ACTION_CODES.items()}
+
+
+def compile_audit_v2() -> tuple[list, str]:
+    """
+    Compile contract/AuditLogV2.sol, returning (abi, bytecode).
+    Needs py-solc-x (a dev dependency); the pinned solc is installed on
+    first use.
+    """
+    from solcx import compile_standard, get_installed_solc_versions, install_solc
+
+    if not any(str(v) == SOLC_VERSION for v in get_installed_solc_versions()):
+        install_solc(SOLC_VERSION)
+
+    compiled = compile_standard(
+        {
+            "language": "Solidity",
+            "sources": {
+                CONTRACT_SOURCE.name: {"content": CONTRACT_SOURCE.read_text()}
+            },
+            "settings": {
+                "optimizer": {"enabled": True, "runs": 200},
+                "outputSelection": {
+                    "*": {"*": ["abi", "evm.bytecode"]}
+                },
+            },
+        },
+        solc_version=SOLC_VERSION,
+    )
+
+    output = compiled["contracts"][CONTRACT_SOURCE.name]["AuditLogV2"]
+    return output["abi"], output["evm"]["bytecode"]["object"]
+
+
+def to_bytes32(hex_hash: str) -> bytes:
+    value = bytes.fromhex(hex_hash.removeprefix("0x"))
+    if len(value) != 32:
+        raise ValueError("Audit hashes must be 32 bytes")
+    return value
+
+
+def normalize_hash(value: bytes | str) -> str:
+    """
+    Audit hashes are stored as bare lowercase hex, as produced by
+    hashlib and the Merkle builder. Chain values (bytes32, or a string
+    with or without 0x) are brought to that form before comparing.
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).hex()
+    return value.removeprefix("0x").lower()
+
+
+class AuditLogV2Client:
+    """
+    Thin wrapper around the AuditLogV2 contract.
+    Sends do not wait for mining; callers track receipts themselves.
+    """
+
+    def __init__(self, w3, address: str, abi=None):
+        self.w3 = w3
+        self.contract = w3.eth.contract(address=address, abi=abi or AUDIT_V2_ABI)
+
+    def log_batch(
+        self,
+        hashes: list[str],
+        actions: list[str],
+        sender: str,
+        nonce: int | None = None,
+        gas_price: int | None = None,
+    ) -> str:
+        if len(hashes) != len(actions):
+            raise ValueError("hashes and actions must have the same length")
+
+        tx_params = {"from": sender}
+        if nonce is not None:
+            tx_params["nonce"] = nonce
+        if gas_price is not None:
+            tx_params["gasPrice"] = gas_price
+
+        tx = self.contract.functions.logBatch(
+            [to_bytes32(h) for h in hashes],
+            [ACTION_CODES[a] for a in actions],
+        ).transact(tx_params)
+
+        return self.w3.to_hex(tx)
+
+    def estimate_batch_gas(self, hashes: list[str], actions: list[str], sender: str) -> int:
+        return self.contract.functions.logBatch(
+            [to_bytes32(h) for h in hashes],
+            [ACTION_CODES[a] for a in actions],
+        ).estimate_gas({"from": sender})
+
+    def total_records(self) -> int:
+        return self.contract.functions.totalRecords().call()
+
+    def get_log(self, index: int) -> dict:
+        record_hash, action_code, timestamp = self.contract.functions.getLog(index).call()
+        return {
+            "record_hash": normalize_hash(record_hash),
+            "action_code": action_code,
+            "timestamp": timestamp,
+        }
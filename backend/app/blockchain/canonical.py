@@ -0,0 +1,55 @@
+import json
+from datetime import date, datetime
+
+
+def _encode_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+# One encoder instance, reused: no per-call setup.
+_encoder = json.JSONEncoder(
+    sort_keys=True,
+    separators=(",", ":"),
+    default=_encode_default,
+)
+
+
+def canonical_json(value) -> bytes:
+    """
+    Deterministic JSON: sorted keys, no whitespace, ASCII only.
+    The same logical value always hashes to the same bytes.
+    """
+    return _encoder.encode(value).encode()
+
+
+# ----------------------------------------
+# Entity snapshots
+# ----------------------------------------
+# Only fields that never change after creation go into a snapshot, so a
+# snapshot taken at audit time can be rebuilt from the row later.
+
+def donation_snapshot(donation) -> dict:
+    return {
+        "id": donation.id,
+        "company_id": donation.company_id,
+        "item_name": donation.item_name,
+        "quantity": donation.quantity,
+        "purpose": donation.purpose,
+    }
+
+
+def allocation_snapshot(allocation) -> dict:
+    return {
+        "id": allocation.id,
+        "donation_id": allocation.donation_id,
+        "clinic_requirement_id": allocation.clinic_requirement_id,
+        "allocated_quantity": allocation.allocated_quantity,
+    }
+
+
+SNAPSHOT_BUILDERS = {
+    "DONATION": donation_snapshot,
+    "DONATION_ALLOCATION": allocation_snapshot,
+}
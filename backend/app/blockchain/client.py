@@ -0,0 +1,203 @@
+import functools
+import logging
+import threading
+import time
+
+from app.core.config import settings
+from app.core.metrics import span
+
+logger = logging.getLogger(__name__)
+
+
+class BlockchainUnavailable(Exception):
+    """
+    Raised instead of touching the node when the chain is disabled,
+    not configured, or the circuit breaker is open.
+    """
+
+
+# ----------------------------------------
+# Circuit breaker
+# ----------------------------------------
+
+class CircuitBreaker:
+    """
+    CLOSED: calls go through.
+    OPEN: calls fail fast for `reset_timeout` seconds after
+    `failure_threshold` consecutive failures.
+    HALF_OPEN: one probe call is let through; success closes the
+    breaker, failure opens it again.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return "CLOSED"
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return "HALF_OPEN"
+        return "OPEN"
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == "CLOSED":
+                return True
+            if state == "HALF_OPEN" and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning(
+                        "Blockchain circuit opened after %d failures", self._failures
+                    )
+                self._opened_at = time.monotonic()
+            self._probing = False
+
+    def call(self, fn, *args, **kwargs):
+        if not self.allow():
+            raise BlockchainUnavailable("Blockchain node unavailable (circuit open)")
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            self.record_failure()
+            raise
+
+        self.record_success()
+        return result
+
+
+breaker = CircuitBreaker(
+    settings.BLOCKCHAIN_BREAKER_THRESHOLD,
+    settings.BLOCKCHAIN_BREAKER_RESET_SECONDS,
+)
+
+
+# ----------------------------------------
+# Client
+# ----------------------------------------
+
+class BlockchainClient:
+    """
+    One Web3 instance per process, over a pooled HTTP session.
+    Built on first use so importing the app never imports web3 or
+    dials the node.
+    """
+
+    def __init__(self, rpc_url: str, contract_address: str):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from web3 import Web3
+
+        from app.blockchain.audit_chain import AUDIT_ABI
+        from app.blockchain.audit_v2 import AuditLogV2Client
+
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.BLOCKCHAIN_POOL_SIZE,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
+        self.w3 = Web3(Web3.HTTPProvider(
+            rpc_url,
+            request_kwargs={"timeout": settings.BLOCKCHAIN_RPC_TIMEOUT},
+            session=session,
+        ))
+        self.contract = self.w3.eth.contract(address=contract_address, abi=AUDIT_ABI)
+        self.audit_v2 = (
+            AuditLogV2Client(self.w3, contract_address)
+            if settings.AUDIT_CONTRACT_VERSION >= 2
+            else None
+        )
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> BlockchainClient:
+    global _client
+
+    if not settings.BLOCKCHAIN_ENABLED:
+        raise BlockchainUnavailable("Blockchain is disabled")
+    if not settings.GANACHE_URL or not settings.AUDIT_CONTRACT_ADDRESS:
+        raise BlockchainUnavailable("Blockchain RPC URL or contract address is not configured")
+
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = BlockchainClient(
+                    settings.GANACHE_URL,
+                    settings.CHECKSUM_AUDIT_CONTRACT_ADDRESS,
+                )
+    return _client
+
+
+def chain_call(fn):
+    """
+    Run `fn(client, ...)` with the shared client, through the breaker.
+    """
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with span("blockchain", fn.__name__):
+            return breaker.call(fn, get_client(), *args, **kwargs)
+    return wrapper
+
+
+def chain_available() -> bool:
+    """
+    Cheap pre-check for background loops: no network call.
+    """
+    return (
+        settings.BLOCKCHAIN_ENABLED
+        and bool(settings.GANACHE_URL)
+        and bool(settings.AUDIT_CONTRACT_ADDRESS)
+        and breaker.state != "OPEN"
+    )
+
+
+def health_check() -> dict:
+    """
+    Probe the node. Counts towards the breaker like any other call.
+    """
+    status = {
+        "enabled": settings.BLOCKCHAIN_ENABLED,
+        "initialized": _client is not None,
+        "connected": False,
+        "block_number": None,
+        "error": None,
+    }
+
+    try:
+        status["block_number"] = chain_call(lambda client: client.w3.eth.block_number)()
+        status["connected"] = True
+    except Exception as exc:
+        status["error"] = str(exc)[:200]
+
+    status["breaker"] = breaker.state
+    return status
@@ -1,8 +1,10 @@
+import logging
 import subprocess
 import time
 import socket
 import shutil
 
+logger = logging.getLogger(__name__)
 
 GANACHE_PORTS = [7545, 8545]
 
@@ -22,15 +24,15 @@ def detect_ganache_url():
 def start_ganache():
     existing = detect_ganache_url()
     if existing:
-        print(f"✅ Ganache already running at {existing}")
+        logger.info("Ganache already running at %s", existing)
         return existing
 
     ganache_cmd = shutil.which("ganache")
     if not ganache_cmd:
-        print("⚠️ Ganache not installed")
+        logger.warning("Ganache not installed")
         return None
 
-    print("🚀 Starting Ganache...")
+    logger.info("Starting Ganache")
     subprocess.Popen(
         [ganache_cmd, "--deterministic", "--accounts", "10"],
         stdout=subprocess.DEVNULL,
@@ -0,0 +1,70 @@
+import asyncio
+import logging
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.dialects.postgresql import insert
+
+from app.blockchain.client import chain_available
+from app.core.config import settings
+from app.models.chain_audit_event import ChainAuditEvent, ChainSyncCursor
+
+logger = logging.getLogger(__name__)
+
+CURSOR_NAME = "audit_events"
+
+
+async def sync_audit_events(session_factory) -> int:
+    """
+    Mirror new AuditRecorded events into chain_audit_events.
+
+    Reads eth_getLogs in ranges of AUDIT_INDEXER_BLOCK_RANGE blocks,
+    stopping AUDIT_INDEXER_CONFIRMATIONS blocks behind the head. Each
+    range and its cursor move are committed together, so a crash never
+    skips or double-counts a range.
+    """
+    from app.blockchain.audit_chain import get_audit_logs, get_block_number
+
+    head = await run_in_threadpool(get_block_number)
+    safe_head = head - settings.AUDIT_INDEXER_CONFIRMATIONS
+
+    indexed = 0
+    async with session_factory() as db:
+        cursor = await db.get(ChainSyncCursor, CURSOR_NAME)
+        if cursor is None:
+            cursor = ChainSyncCursor(
+                name=CURSOR_NAME,
+                last_block=settings.AUDIT_CONTRACT_DEPLOY_BLOCK - 1,
+            )
+            db.add(cursor)
+
+        while cursor.last_block < safe_head:
+            from_block = cursor.last_block + 1
+            to_block = min(from_block + settings.AUDIT_INDEXER_BLOCK_RANGE - 1, safe_head)
+
+            events = await run_in_threadpool(get_audit_logs, from_block, to_block)
+            if events:
+                await db.execute(
+                    insert(ChainAuditEvent)
+                    .values(events)
+                    .on_conflict_do_nothing(constraint="uq_chain_audit_event_log")
+                )
+
+            cursor.last_block = to_block
+            await db.commit()
+            indexed += len(events)
+
+    return indexed
+
+
+async def run_audit_indexer(session_factory, interval_seconds: int):
+    """
+    Background loop started on application startup.
+    """
+    while True:
+        try:
+            if chain_available():
+                await sync_audit_events(session_factory)
+        except Exception:
+            logger.exception("Audit indexer failed")
+
+        await asyncio.sleep(interval_seconds)
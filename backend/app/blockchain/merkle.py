@@ -0,0 +1,70 @@
+import hashlib
+
+# Leaves and inner nodes are hashed with different prefixes so a leaf can
+# never be passed off as an inner node (second-preimage protection).
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+
+
+def leaf_hash(data: bytes) -> bytes:
+    return hashlib.sha256(LEAF_PREFIX + data).digest()
+
+
+def node_hash(left: bytes, right: bytes) -> bytes:
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def build_levels(leaves: list[bytes]) -> list[list[bytes]]:
+    """
+    Build every level of the tree, leaves first, root last.
+    An unpaired node is promoted to the next level unchanged.
+    """
+    if not leaves:
+        raise ValueError("Cannot build a Merkle tree without leaves")
+
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        parent = [
+            node_hash(level[i], level[i + 1])
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            parent.append(level[-1])
+        levels.append(parent)
+
+    return levels
+
+
+def merkle_root(leaves: list[bytes]) -> bytes:
+    return build_levels(leaves)[-1][0]
+
+
+def inclusion_proof(levels: list[list[bytes]], index: int) -> list[dict]:
+    """
+    Sibling hashes from the leaf up to the root.
+    `side` says on which side the sibling is concatenated.
+    """
+    proof = []
+    for level in levels[:-1]:
+        sibling = index ^ 1
+        if sibling < len(level):
+            proof.append({
+                "hash": level[sibling].hex(),
+                "side": "left" if sibling < index else "right",
+            })
+        index //= 2
+
+    return proof
+
+
+def verify_proof(leaf: bytes, proof: list[dict], root: bytes) -> bool:
+    node = leaf
+    for step in proof:
+        sibling = bytes.fromhex(step["hash"])
+        if step["side"] == "left":
+            node = node_hash(sibling, node)
+        else:
+            node = node_hash(node, sibling)
+
+    return node == root
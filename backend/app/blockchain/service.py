@@ -1,67 +1,62 @@
-# import json
-# import hashlib
-# from web3 import Web3
-# from app.core.config import settings
-
-# w3 = Web3(Web3.HTTPProvider(settings.GANACHE_URL))
-# BLOCKCHAIN_ENABLED = w3.is_connected()
-
-# contract = None
-
-# if BLOCKCHAIN_ENABLED:
-#     with open("contracts/AuditLogs.json", "r") as f:
-#         contract_data = json.load(f)
-
-#     abi = contract_data["abi"]
-
-#     contract = w3.eth.contract(
-#         address=settings.AUDIT_CONTRACT_ADDRESS,
-#         abi=abi,
-#     )
-
-
-# def generate_hash(payload: dict) -> str:
-#     return hashlib.sha256(
-#         json.dumps(payload, sort_keys=True).encode()
-#     ).hexdigest()
-
-
-# def log_to_blockchain(action: str, payload: dict):
-#     record_hash = generate_hash(payload)
-
-#     if not BLOCKCHAIN_ENABLED or contract is None:
-#         return {
-#             "record_hash": record_hash,
-#             "tx_hash": None,
-#             "block_number": None,
-#         }
-
-#     tx = contract.functions.logAction(
-#         action,
-#         record_hash
-#     ).transact({
-#         "from": w3.eth.accounts[0],
-#         "gas": 3_000_000,
-#     })
-
-#     receipt = w3.eth.wait_for_transaction_receipt(tx)
-
-#     return {
-#         "record_hash": record_hash,
-#         "tx_hash": receipt.transactionHash.hex(),
-#         "block_number": receipt.blockNumber,
-#     }
+from datetime import datetime, timezone
+
+from app.blockchain.canonical import canonical_json, SNAPSHOT_BUILDERS
+from app.blockchain.merkle import leaf_hash
+from app.models.audit_record import AuditRecord
+
+
+def audit_leaf(action: str, entity_type: str, entity_id: str, payload: dict, recorded_at: datetime) -> bytes:
+    return leaf_hash(canonical_json({
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": str(entity_id),
+        "payload": payload,
+        "recorded_at": recorded_at.isoformat(),
+    }))
+
+
+def record_audit_event(
+    db,
+    action: str,
+    entity_type: str,
+    entity,
+    extra: dict | None = None,
+) -> AuditRecord:
+    """
+    Append an audit record in the caller's transaction.
 
-from app.core.config import settings
+    The payload holds an immutable snapshot of `entity` (see
+    app.blockchain.canonical) plus `extra`, so it can be checked
+    against the row later.
 
-def log_to_blockchain(action: str, payload: dict):
+    Nothing touches the chain here: the anchorer picks unbatched records
+    up later and anchors their Merkle root.
+    """
+    entity_id = entity.id
+    payload = {
+        "snapshot": SNAPSHOT_BUILDERS[entity_type](entity),
+        **(extra or {}),
+    }
+    recorded_at = datetime.now(timezone.utc)
+    record = AuditRecord(
+        action=action,
+        entity_type=entity_type,
+        entity_id=str(entity_id),
+        payload=canonical_json(payload).decode(),
+        record_hash=audit_leaf(action, entity_type, entity_id, payload, recorded_at).hex(),
+        recorded_at=recorded_at,
+    )
+    db.add(record)
+    return record
+
+
+def audit_receipt(record: AuditRecord) -> dict:
     """
-    Blockchain disabled stub.
-    Keeps interface intact without executing blockchain code.
+    What request handlers return to the client: the record hash now,
+    the proof and transaction once the batch is anchored.
     """
-    if not settings.BLOCKCHAIN_ENABLED:
-        return {
-            "record_hash": None,
-            "tx_hash": None,
-            "block_number": None,
-        }
+    return {
+        "record_hash": record.record_hash,
+        "audit_id": record.id,
+        "status": "QUEUED",
+    }
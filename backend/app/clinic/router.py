@@ -1,5 +1,6 @@
 # app/clinic/router.py
-from fastapi import APIRouter, Depends, HTTPException
+import logging
+from fastapi import APIRouter, Depends, HTTPException, Request
 from app.db.deps import get_db
 from app.core.security import require_role
 from app.clinic.service import confirm_receipt
@@ -12,8 +13,13 @@ from app.services.storage_service import get_signed_file_url
 from app.models.ocr_extracted_data import OCRExtractedData
 from app.models.clinic_feedback import ClinicFeedback
 from app.models.donation import Donation
+from app.core.cache import cached_json, tenant_tag
+from app.core.idempotency import idempotent_json
+from app.services.rollup_service import get_dashboard_kpis, refresh_dashboard_rollups, CLINIC
 # from med_fusion_project.backend.app.blockchain.audit_chain import write_to_blockchain
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/clinic", tags=["Clinic"])
 
 
@@ -39,11 +45,17 @@ async def get_pending_allocations(
     response_model=ConfirmReceiptResponse
 )
 async def confirm_allocation_receipt(
+    request: Request,
     allocation_id: int,
     db: AsyncSession = Depends(get_db),
     clinic_user: dict = Depends(require_role("CLINIC"))
 ):
-    return await confirm_receipt(db, clinic_user, allocation_id)
+    return await idempotent_json(
+        request,
+        db,
+        clinic_user,
+        lambda: confirm_receipt(db, clinic_user, allocation_id),
+    )
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -51,19 +63,22 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security import require_role
 from app.clinic.service import get_clinic_allocation_history
 from app.clinic.schema import ClinicAllocationHistory
+from app.core.pagination import Page, PageParams
 
 
 
 
 @router.get(
     "/allocations",
-    response_model=list[ClinicAllocationHistory]
+    response_model=Page[ClinicAllocationHistory],
+    response_model_exclude_unset=True,
 )
 async def clinic_allocations(
+    page: PageParams = Depends(),
     db: AsyncSession = Depends(get_db),
     clinic_user: dict = Depends(require_role("CLINIC"))
 ):
-    return await get_clinic_allocation_history(db, clinic_user)
+    return await get_clinic_allocation_history(db, clinic_user, page)
 
 
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
@@ -80,15 +95,10 @@ from app.services.storage_service import (
 )
 
 from app.services.ocr_service import (
-    ocr_image,
+    run_ocr,
     parse_assets,
 )
 
-from pdf2image import convert_from_bytes
-from PIL import Image
-import io
-
-router = APIRouter(prefix="/clinic", tags=["Clinic"])
 
 
 # =========================================================
@@ -124,23 +134,14 @@ async def upload_register(
     db.add(upload)
     await db.flush()  # get upload.id
 
-    # 4️⃣ Convert file → PIL Image
-    if file.filename.lower().endswith(".pdf"):
-        images = convert_from_bytes(file_bytes)
-        image = images[0]  # MVP: first page
-    else:
-        image = Image.open(io.BytesIO(file_bytes))
-
-    # 5️⃣ OCR (DEBUG ENABLED)
-    extracted_text = ocr_image(image)
+    # 4️⃣ + 5️⃣ Convert file → image and OCR it (MVP: first page), off the event loop
+    extracted_text = await run_ocr(file_bytes, file.filename)
 
-    print("===== OCR RAW TEXT START =====")
-    print(extracted_text)
-    print("===== OCR RAW TEXT END =====")
+    logger.debug("OCR raw text", extra={"upload_id": upload.id, "text": extracted_text})
 
     # 6️⃣ Parse OCR text
     assets = parse_assets(extracted_text)
-    print("PARSED ASSETS:", assets)
+    logger.info("Register parsed", extra={"upload_id": upload.id, "assets": len(assets)})
 
     # 7️⃣ Save extracted data
     for item in assets:
@@ -488,6 +489,7 @@ async def confirm_requirements(
 #     req.blockchain_tx = audit["tx_hash"]
 #     req.blockchain_hash = audit["record_hash"]
 
+    await refresh_dashboard_rollups(db, clinic_ids=[data.clinic_id])
     await db.commit()
 
     return {
@@ -499,30 +501,21 @@ async def confirm_requirements(
 
 @router.get("/dashboard")
 async def clinic_dashboard(
-    clinic_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db),
+    clinic_user: dict = Depends(require_role("CLINIC")),
 ):
-    result = await db.execute(
-        select(ClinicRequirements).where(
-            ClinicRequirements.clinic_id == clinic_id
-        )
-    )
-    rows = result.scalars().all()
+    clinic_id = clinic_user["clinic_id"]
 
-    total = len(rows)
-    confirmed = len([r for r in rows if r.status == "CONFIRMED"])
-    allocated = len([r for r in rows if r.status == "ALLOCATED"])
-    emergency = len([r for r in rows if r.priority == "EMERGENCY"])
-
-    return {
-        "clinic_id": clinic_id,
-        "kpis": {
-            "total_requirements": total,
-            "confirmed": confirmed,
-            "allocated": allocated,
-            "emergency_cases": emergency,
+    async def build():
+        return {
+            "clinic_id": clinic_id,
+            "kpis": await get_dashboard_kpis(db, CLINIC, clinic_id),
         }
-    }
+
+    return await cached_json(
+        request, clinic_user, [tenant_tag(CLINIC, clinic_id)], build
+    )
 
 
 @router.post("/feedback")
@@ -600,13 +593,17 @@ async def confirm_donation(
     Clinic confirms receipt of a forwarded donation
     """
 
+    # FORWARDED → RECEIVED in one statement; a repeated confirm finds nothing
     result = await db.execute(
-        select(Donation).where(
+        update(Donation)
+        .where(
             Donation.id == data.donation_id,
             Donation.status == "FORWARDED",
         )
+        .values(status="RECEIVED")
+        .returning(Donation.id, Donation.status)
     )
-    donation = result.scalar_one_or_none()
+    donation = result.one_or_none()
 
     if not donation:
         raise HTTPException(
@@ -614,8 +611,6 @@ async def confirm_donation(
             detail="Donation not found or not forwarded",
         )
 
-    donation.status = "RECEIVED"
-
     await db.commit()
 
     return {
@@ -1,5 +1,4 @@
-from ast import List
-from realtime import List
+from typing import List
 from pydantic import BaseModel
 
 
@@ -16,16 +15,17 @@ from pydantic import BaseModel
 
 
 class ClinicAllocationHistory(BaseModel):
-    allocation_id: int
-    item_name: str
-    quantity: int
-    purpose: str
+    # all optional: clients may project a subset with `fields=`
+    allocation_id: int | None = None
+    item_name: str | None = None
+    quantity: int | None = None
+    purpose: str | None = None
 
-    ngo_name: str
+    ngo_name: str | None = None
 
-    allocated_at: datetime
-    received: bool
-    received_at: datetime | None
+    allocated_at: datetime | None = None
+    received: bool | None = None
+    received_at: datetime | None = None
 
     class Config:
         from_attributes = True
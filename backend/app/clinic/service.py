@@ -1,14 +1,19 @@
+import logging
 import token
-from fastapi.concurrency import run_in_threadpool
 from jose import jwt, JWTError
 from sqlalchemy import select
 from app.models.clinic_invitation import ClinicInvitation
 from app.models.user import User
 from app.models.clinic import Clinic
-from app.auth.utils import hash_password
+from app.auth.utils import hash_password_async
+from app.auth.org_status import invalidate_org_status
 from app.core.config import settings
-from app.blockchain.service import log_to_blockchain
+from app.core.revocation import is_token_revoked, revoke_token
+from app.blockchain.service import record_audit_event, audit_receipt
 from app.models.donation import Donation
+from app.services.rollup_service import refresh_dashboard_rollups
+
+logger = logging.getLogger(__name__)
 
 async def accept_clinic_invitation(
     db,
@@ -38,7 +43,7 @@ async def accept_clinic_invitation(
     # Create clinic user
     user = User(
         email=payload["clinic_email"],
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
         role="CLINIC",
         password_set=True
     )
@@ -63,7 +68,6 @@ def verify_clinic_invite_token(token: str) -> dict:
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        print("Payload in verify function:", payload)
         if payload.get("type") != "clinic_invite":
             raise HTTPException(status_code=400, detail="Invalid token type")
 
@@ -81,8 +85,10 @@ async def set_clinic_password(db, token: str, password: str):
     
     token_payload = verify_clinic_invite_token(token)
 
+    if await is_token_revoked(token_payload.get("jti"), db):
+        raise HTTPException(status_code=400, detail="Invitation already used")
+
     clinic_email = token_payload["clinic_email"]
-    print("CLINIC EMAIL:", clinic_email)
     result = await db.execute(
     select(Clinic.id).where(Clinic.official_email == clinic_email)
 )
@@ -93,13 +99,11 @@ async def set_clinic_password(db, token: str, password: str):
         raise HTTPException(status_code=404, detail="Clinic not found")
 
     clinic_id = row[0]
-    print("CLINIC ID:", clinic_id)
     # 1️⃣ Fetch clinic from DB
     result = await db.execute(
         select(Clinic).where(Clinic.official_email == clinic_email)
     )
     clinic = result.first()
-    print("CLINIC FETCHED:", clinic)
 
     if not clinic:
         raise ValueError("Clinic not found")
@@ -114,10 +118,10 @@ async def set_clinic_password(db, token: str, password: str):
         raise ValueError("Clinic user already exists")
 
     # 3️⃣ Create clinic user WITH clinic_id
-    print("clinic.id:", clinic_id)
+    logger.info("Creating clinic user", extra={"clinic_id": clinic_id})
     user = User(
         email=clinic_email,
-        password_hash=hash_password(password),
+        password_hash=await hash_password_async(password),
         password_set=True,
         role="CLINIC",
         clinic_id=clinic_id   # 🔥 THIS WAS MISSING
@@ -127,7 +131,9 @@ async def set_clinic_password(db, token: str, password: str):
     clinic[0].is_active = True
     db.add(clinic[0])
     db.add(user)
+    await revoke_token(db, token_payload, "USED")
     await db.commit()
+    invalidate_org_status("CLINIC", clinic_id)
 
     return {
         "message": "Clinic account activated successfully",
@@ -136,7 +142,7 @@ async def set_clinic_password(db, token: str, password: str):
 
 from datetime import datetime
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.donation_allocation import DonationAllocation
@@ -154,51 +160,67 @@ async def confirm_receipt(
 
     clinic_id = clinic_user["clinic_id"]
 
-    # 1️⃣ Fetch allocation + clinic relation
+    # 1️⃣ Mark as received in one statement, only if it belongs to this
+    #    clinic and isn't received yet: a concurrent or retried confirm
+    #    matches nothing
     result = await db.execute(
-        select(DonationAllocation, ClinicRequirement)
-        .join(
-            ClinicRequirement,
-            DonationAllocation.clinic_requirement_id == ClinicRequirement.id
-        )
+        update(DonationAllocation)
         .where(DonationAllocation.id == allocation_id)
+        .where(DonationAllocation.received.is_not(True))
+        .where(
+            DonationAllocation.clinic_requirement_id.in_(
+                select(ClinicRequirement.id)
+                .where(ClinicRequirement.clinic_id == clinic_id)
+            )
+        )
+        .values(received=True, received_at=datetime.utcnow())
+        .returning(DonationAllocation)
     )
-
-    row = result.first()
-    if not row:
-        raise HTTPException(404, "Allocation not found")
-
-    allocation, requirement = row
-
-    donation = await db.get(Donation, allocation.donation_id)
-    if not donation:
-        raise HTTPException(status_code=404, detail="Donation not found")
-    
-    # 2️⃣ Ownership check
-    if requirement.clinic_id != clinic_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="This allocation does not belong to your clinic"
+    allocation = result.scalar_one_or_none()
+
+    if not allocation:
+        # 2️⃣ Nothing updated: work out why
+        result = await db.execute(
+            select(DonationAllocation, ClinicRequirement)
+            .join(
+                ClinicRequirement,
+                DonationAllocation.clinic_requirement_id == ClinicRequirement.id
+            )
+            .where(DonationAllocation.id == allocation_id)
         )
-
-    # 3️⃣ Prevent double confirmation
-    if allocation.received:
+        row = result.first()
+        if not row:
+            raise HTTPException(404, "Allocation not found")
+
+        # Ownership check
+        if row[1].clinic_id != clinic_id:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="This allocation does not belong to your clinic"
+            )
+
+        # Prevent double confirmation
         raise HTTPException(
             status_code=400,
             detail="Donation already confirmed as received"
         )
 
-    # 4️⃣ Mark as received
-    allocation.received = True
-    allocation.received_at = datetime.utcnow()
+    donation = await db.get(Donation, allocation.donation_id)
+    if not donation:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Donation not found")
 
-    await db.commit()
-    audit = await run_in_threadpool(
-        log_to_blockchain,
+    await refresh_dashboard_rollups(db, company_ids=[donation.company_id])
+    record = record_audit_event(
+        db,
         "DONATION_RECEIVED",
-        str(donation.id)
+        "DONATION",
+        donation,
+        {"allocation_id": allocation.id, "received_at": allocation.received_at},
     )
-    print(audit)
+    # committed by idempotent_json, together with the stored response
+    await db.flush()
+    audit = audit_receipt(record)
     return {"audit": audit ,"message": "Donation receipt confirmed successfully"
             }
 
@@ -210,29 +232,36 @@ from app.models.donation_allocation import DonationAllocation
 from app.models.clinic_requirment import ClinicRequirement
 from app.models.donation import Donation
 from app.models.ngo import NGO
+from app.core.pagination import PageParams, paginate, project
+
+
+CLINIC_ALLOCATION_FIELDS = {
+    "allocation_id": DonationAllocation.id,
+    "item_name": Donation.item_name,
+    "quantity": Donation.quantity,
+    "purpose": Donation.purpose,
+    "ngo_name": NGO.ngo_name,
+    "allocated_at": DonationAllocation.allocated_at,
+    "received": DonationAllocation.received,
+    "received_at": DonationAllocation.received_at,
+}
 
 
 async def get_clinic_allocation_history(
     db: AsyncSession,
-    clinic_user: dict
+    clinic_user: dict,
+    page: PageParams,
 ):
     """
-    Fetch all donation allocations for logged-in clinic
+    Fetch one page of donation allocations for logged-in clinic
     """
 
     clinic_id = clinic_user["clinic_id"]
 
-    result = await db.execute(
-        select(
-            DonationAllocation.id,
-            Donation.item_name,
-            Donation.quantity,
-            Donation.purpose,
-            NGO.ngo_name,
-            DonationAllocation.allocated_at,
-            DonationAllocation.received,
-            DonationAllocation.received_at,
-        )
+    return await paginate(
+        db,
+        select(*project(CLINIC_ALLOCATION_FIELDS, page.fields))
+        .select_from(DonationAllocation)
         .join(
             ClinicRequirement,
             DonationAllocation.clinic_requirement_id == ClinicRequirement.id
@@ -245,22 +274,7 @@ async def get_clinic_allocation_history(
             NGO,
             ClinicRequirement.ngo_id == NGO.id
         )
-        .where(ClinicRequirement.clinic_id == clinic_id)
-        .order_by(DonationAllocation.allocated_at.desc())
+        .where(ClinicRequirement.clinic_id == clinic_id),
+        (DonationAllocation.allocated_at, DonationAllocation.id),
+        page,
     )
-
-    rows = result.all()
-
-    return [
-        {
-            "allocation_id": r.id,
-            "item_name": r.item_name,
-            "quantity": r.quantity,
-            "purpose": r.purpose,
-            "ngo_name": r.ngo_name,
-            "allocated_at": r.allocated_at,
-            "received": r.received,
-            "received_at": r.received_at,
-        }
-        for r in rows
-    ]
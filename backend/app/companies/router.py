@@ -1,11 +1,10 @@
-from select import select
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.deps import get_db
 from app.companies.schema import CompanyRegister
 from app.companies.service import register_company
-from app.models.donation import Donation
-from app.models.donation_allocation import DonationAllocation
+from app.core.security import require_role
+from app.services.rollup_service import get_dashboard_kpis, CSR
 
 router = APIRouter(prefix="/companies", tags=["Companies"])
 
@@ -38,26 +37,12 @@ async def register_company_endpoint(
 
 @router.get("/dashboard")
 async def csr_dashboard(
-    company_id: int,
     db: AsyncSession = Depends(get_db),
+    user: dict = Depends(require_role("CSR")),
 ):
-    donations = await db.execute(
-        select(Donation).where(Donation.company_id == company_id)
-    )
-    donation_rows = donations.scalars().all()
-
-    allocations = await db.execute(
-        select(DonationAllocation)
-    )
-    allocation_rows = allocations.scalars().all()
+    company_id = user["company_id"]
 
     return {
         "company_id": company_id,
-        "kpis": {
-            "total_donations": len(donation_rows),
-            "total_allocations": len(allocation_rows),
-            "clinics_supported": len(
-                set(a.clinic_requirement_id for a in allocation_rows)
-            ),
-        }
+        "kpis": await get_dashboard_kpis(db, CSR, company_id),
     }
@@ -0,0 +1,166 @@
+import hashlib
+import time
+from collections import OrderedDict
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import dumps
+
+
+class ResponseCache:
+    """
+    In-process cache of rendered JSON responses.
+
+    Entries expire after a short TTL and carry tags (tenant scopes)
+    so write paths can drop everything a change affects.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        if entry["expires_at"] < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+
+        return entry
+
+    def set(self, key: str, body: bytes, tags, ttl: int):
+        entry = {
+            "body": body,
+            "etag": '"%s"' % hashlib.sha256(body).hexdigest(),
+            "tags": frozenset(tags),
+            "expires_at": time.monotonic() + ttl,
+        }
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+        return entry
+
+    def invalidate(self, tags):
+        tags = set(tags)
+        if not tags:
+            return
+
+        for key in [
+            k for k, e in self._entries.items() if e["tags"] & tags
+        ]:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+
+response_cache = ResponseCache()
+
+
+def cache_key(request: Request, principal: dict | None) -> str:
+    """
+    Build a cache key from the route, the caller's role and tenant ids,
+    and the query string.
+    """
+    principal = principal or {}
+    return "|".join(
+        str(part)
+        for part in (
+            request.url.path,
+            principal.get("role"),
+            principal.get("company_id"),
+            principal.get("ngo_id"),
+            principal.get("clinic_id"),
+            request.url.query,
+        )
+    )
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+
+    if header.strip() == "*":
+        return True
+
+    return etag in (tag.strip() for tag in header.split(","))
+
+
+async def cached_json(
+    request: Request,
+    principal: dict | None,
+    tags,
+    build,
+    ttl: int | None = None,
+) -> Response:
+    """
+    Serve a JSON response from the cache, or build and cache it.
+
+    `build` is an async callable returning the response content.
+    Responses carry a strong ETag and a matching If-None-Match
+    gets 304 Not Modified.
+    """
+    key = cache_key(request, principal)
+    entry = response_cache.get(key)
+
+    if entry is None:
+        content = await build()
+        body = dumps(content)
+        entry = response_cache.set(
+            key,
+            body,
+            tags,
+            settings.RESPONSE_CACHE_TTL if ttl is None else ttl,
+        )
+
+    headers = {
+        "ETag": entry["etag"],
+        "Cache-Control": "private, no-cache",
+    }
+
+    if etag_matches(request, entry["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    return Response(
+        content=entry["body"],
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+# ---------------------------------------------------------
+# Write-path invalidation
+# Tags are collected on the session and dropped from the cache
+# only once the transaction commits.
+# ---------------------------------------------------------
+
+def tenant_tag(tenant_type: str, tenant_id=None) -> str:
+    return f"{tenant_type}:{tenant_id}"
+
+
+DONATIONS_AVAILABLE_TAG = "DONATIONS:AVAILABLE"
+
+
+def invalidate_on_commit(db, *tags):
+    db.info.setdefault("cache_tags", set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session):
+    tags = session.info.pop("cache_tags", None)
+    if tags:
+        response_cache.invalidate(tags)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_rollback(session, previous_transaction):
+    session.info.pop("cache_tags", None)
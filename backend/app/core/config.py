@@ -1,5 +1,4 @@
 from pydantic_settings import BaseSettings
-from web3 import Web3
 
 
 
@@ -12,6 +11,23 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "super-secret-key"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
+    JWT_BACKEND: str = "auto"  # auto (PyJWT if installed) / jose
+    TOKEN_CACHE_SIZE: int = 4096
+    REVOCATION_SYNC_INTERVAL: int = 30  # seconds
+    REVOCATION_FILTER_BITS: int = 1 << 20
+    REVOCATION_FILTER_HASHES: int = 7
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    ORG_STATUS_CACHE_TTL: int = 300  # seconds
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: str = "memory"  # memory / redis
+    RATE_LIMIT_REDIS_URL: str | None = None
+    RATE_LIMIT_TRUST_PROXY: bool = False
+    RATE_LIMIT_PERIOD: int = 60  # seconds
+    LOGIN_RATE_LIMIT_IP: int = 30
+    LOGIN_RATE_LIMIT_ACCOUNT: int = 5
+    RESET_RATE_LIMIT_IP: int = 10
+    RESET_RATE_LIMIT_ACCOUNT: int = 3
     BREVO_SMTP_SERVER: str
     BREVO_SMTP_PORT: int
     BREVO_SMTP_LOGIN: str
@@ -21,12 +37,51 @@ class Settings(BaseSettings):
     EMAIL_FROM_NAME: str
     EMAIL_FROM_ADDRESS: str
     FRONTEND_URL: str
-    EMAIL_TIMEOUT: int = 600  # seconds
+    EMAIL_TIMEOUT: int = 30  # seconds, per SMTP call in the dispatcher
+    EMAIL_TRANSPORT: str = "smtp"  # smtp / memory
+    EMAIL_SMTP_SECURITY: str = "auto"  # auto (ssl on 465, else starttls) / ssl / starttls / none
+    EMAIL_POOL_SIZE: int = 2
+    EMAIL_CONNECTION_IDLE_TIMEOUT: int = 60  # seconds
+    EMAIL_BATCH_SIZE: int = 50
+    EMAIL_POLL_INTERVAL: int = 5  # seconds
+    EMAIL_MAX_ATTEMPTS: int = 8
+    EMAIL_RETRY_BASE_SECONDS: int = 30
+    EMAIL_RETRY_MAX_SECONDS: int = 3600
+    CLINIC_BULK_MAX_ROWS: int = 1000
+    IDEMPOTENCY_KEY_TTL: int = 86400  # seconds a stored response can be replayed
+    IDEMPOTENCY_PURGE_INTERVAL: int = 3600  # seconds
+    ALLOCATION_VECTORIZE_FROM: int = 256  # rows per asset before the planner uses NumPy
+    OCR_WORKERS: int = 1  # OCR processes; 0 runs OCR in this worker's thread pool
+    DASHBOARD_RECONCILE_INTERVAL: int = 900  # seconds
+    RESPONSE_CACHE_TTL: int = 5  # seconds
     BLOCKCHAIN_ENABLED: bool = False
+    AUDIT_BATCH_SIZE: int = 256
+    AUDIT_BATCH_INTERVAL: int = 60  # seconds before a partial batch is sealed
+    AUDIT_ANCHOR_POLL_INTERVAL: int = 5  # seconds
+    AUDIT_RECEIPT_TIMEOUT: int = 300  # seconds before an unmined anchor is resubmitted
+    AUDIT_MAX_SUBMIT_ATTEMPTS: int = 10
+    AUDIT_GAS_BUMP_PERCENT: int = 20  # replacement gas price increase; nodes require at least 10
     GANACHE_URL: str | None = None
+    BLOCKCHAIN_RPC_TIMEOUT: int = 10  # seconds, per JSON-RPC request
+    BLOCKCHAIN_POOL_SIZE: int = 4
+    BLOCKCHAIN_BREAKER_THRESHOLD: int = 5  # consecutive failures before failing fast
+    BLOCKCHAIN_BREAKER_RESET_SECONDS: int = 30
     AUDIT_CONTRACT_ADDRESS: str | None = None
+    AUDIT_CONTRACT_VERSION: int = 1  # 2 = AuditLogV2 with logBatch
+    AUDIT_ROOTS_PER_TX: int = 32
+    AUDIT_CONTRACT_DEPLOY_BLOCK: int = 0
+    AUDIT_INDEXER_BLOCK_RANGE: int = 2000
+    AUDIT_INDEXER_CONFIRMATIONS: int = 2
+    AUDIT_INDEXER_INTERVAL: int = 15  # seconds
+    AUDIT_VERIFY_MAX_RECORDS: int = 5000
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json or text
+    LOG_SLOW_REQUEST_MS: int = 1000  # requests slower than this are logged as warnings
+    SQL_ECHO: bool = False
+    METRICS_ENABLED: bool = True
     @property
     def CHECKSUM_AUDIT_CONTRACT_ADDRESS(self) -> str:
+        from web3 import Web3
         return Web3.to_checksum_address(self.AUDIT_CONTRACT_ADDRESS)
 
 
@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+
+from fastapi import HTTPException, Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.core.responses import FastJSONResponse
+from app.models.idempotency_key import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+
+
+def idempotency_scope(principal: dict) -> str:
+    """
+    Keys are per caller, so two tenants can never replay each other's
+    responses.
+    """
+    return "|".join(
+        str(principal.get(part))
+        for part in ("role", "sub", "company_id", "ngo_id", "clinic_id")
+    )
+
+
+async def request_fingerprint(request: Request) -> str:
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(request.url.path.encode())
+    digest.update(request.url.query.encode())
+    digest.update(await request.body())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _response_adapter(response_model) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def _apply_response_model(request: Request, content):
+    """
+    The returned Response bypasses FastAPI's response_model handling,
+    so the route's model is applied here: fields outside the model are
+    dropped, exactly as for a plain return.
+    """
+    route = request.scope.get("route")
+    response_model = getattr(route, "response_model", None)
+    if response_model is None or isinstance(content, Response):
+        return content
+
+    adapter = _response_adapter(response_model)
+    return adapter.dump_python(
+        adapter.validate_python(content, from_attributes=True),
+        mode="json",
+        by_alias=route.response_model_by_alias,
+        exclude_unset=route.response_model_exclude_unset,
+        exclude_none=route.response_model_exclude_none,
+    )
+
+
+async def idempotent_json(
+    request: Request,
+    db,
+    principal: dict,
+    build,
+) -> Response:
+    """
+    Run a write endpoint at most once per Idempotency-Key.
+
+    The key is claimed with an INSERT in the handler's own transaction,
+    and marked COMPLETED with the response in that same transaction, so
+    the write, the claim and the stored response commit (or roll back)
+    as one: a concurrent retry blocks on the key until the first attempt
+    finishes, then replays its stored response. Errors roll back and
+    release the key. Requests without the header run as usual.
+
+    `build` is an async callable returning the response content; it
+    writes but must not commit, the commit happens here. The content is
+    shaped by the route's response_model before it is stored.
+    """
+    key = request.headers.get(IDEMPOTENCY_HEADER)
+    if key is None:
+        content = await build()
+        await db.commit()
+        return content
+
+    if not principal:
+        raise ValueError("idempotent_json needs the authenticated caller to scope keys")
+
+    key = key.strip()
+    if not key or len(key) > 255:
+        raise HTTPException(status_code=400, detail="Invalid Idempotency-Key header")
+
+    scope = idempotency_scope(principal)
+    fingerprint = await request_fingerprint(request)
+    now = datetime.now(timezone.utc)
+
+    # 🔑 claim the key; an expired row for the same key is taken over
+    claim = insert(IdempotencyKey).values(
+        scope=scope,
+        key=key,
+        request_hash=fingerprint,
+        status="IN_PROGRESS",
+        expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL),
+    )
+    claimed = await db.execute(
+        claim.on_conflict_do_update(
+            index_elements=[IdempotencyKey.scope, IdempotencyKey.key],
+            set_={
+                "request_hash": claim.excluded.request_hash,
+                "status": "IN_PROGRESS",
+                "response_status": None,
+                "response_body": None,
+                "created_at": now,
+                "expires_at": claim.excluded.expires_at,
+            },
+            where=IdempotencyKey.expires_at <= now,
+        ).returning(IdempotencyKey.key)
+    )
+
+    if claimed.scalar_one_or_none() is None:
+        stored = await db.get(IdempotencyKey, (scope, key))
+        # the stored row is all we need; end the transaction
+        await db.commit()
+
+        if stored.request_hash != fingerprint:
+            raise HTTPException(
+                status_code=422,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        if stored.status != "COMPLETED":
+            raise HTTPException(
+                status_code=409,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+
+        return Response(
+            content=stored.response_body,
+            status_code=stored.response_status,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    try:
+        content = await build()
+
+        content = _apply_response_model(request, content)
+        response = content if isinstance(content, Response) else FastJSONResponse(content)
+
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(
+                status="COMPLETED",
+                response_status=response.status_code,
+                response_body=response.body.decode(),
+            )
+        )
+        await db.commit()
+    except Exception:
+        # nothing committed: the claim goes away with the rest
+        await db.rollback()
+        raise
+
+    return response
+
+
+async def purge_expired_idempotency_keys(session_factory) -> int:
+    async with session_factory() as db:
+        result = await db.execute(
+            delete(IdempotencyKey)
+            .where(IdempotencyKey.expires_at <= datetime.now(timezone.utc))
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def run_idempotency_purge(session_factory, interval_seconds: int):
+    """
+    Background loop started on application startup.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await purge_expired_idempotency_keys(session_factory)
+        except Exception:
+            logger.exception("Idempotency key purge failed")
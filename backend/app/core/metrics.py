@@ -0,0 +1,313 @@
+import functools
+import inspect
+import logging
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.logging_config import request_id_var
+
+logger = logging.getLogger(__name__)
+
+
+# ----------------------------------------
+# Metric types
+# ----------------------------------------
+# Per-process, like the in-memory rate limiter: with several workers
+# each one serves its own /metrics and Prometheus scrapes them all.
+
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, values, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(n, "") for n in self.label_names)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_series(key, value))
+        return lines
+
+    def _render_series(self, key, value) -> list[str]:
+        return [f"{self.name}{_labels(self.label_names, key)} {value}"]
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    """
+    Cumulative buckets, sum and count per label set, rendered in the
+    Prometheus text format.
+    """
+
+    type = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(key)
+            if series is None:
+                # per-bucket counts, +Inf last, then sum
+                series = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def _render_series(self, key, series) -> list[str]:
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+            cumulative += count
+            le = f'le="{bound}"'
+            lines.append(f"{self.name}_bucket{_labels(self.label_names, key, le)} {cumulative}")
+        lines.append(f"{self.name}_sum{_labels(self.label_names, key)} {series[-1]}")
+        lines.append(f"{self.name}_count{_labels(self.label_names, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+HTTP_REQUEST_DURATION = registry.register(Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ("method", "route", "status"),
+))
+HTTP_REQUESTS_IN_FLIGHT = registry.register(Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+))
+SPAN_DURATION = registry.register(Histogram(
+    "span_duration_seconds",
+    "Duration of storage, OCR, SMTP and blockchain calls",
+    ("kind", "name", "outcome"),
+))
+DB_STATEMENT_DURATION = registry.register(Histogram(
+    "db_statement_duration_seconds",
+    "SQL statement execution time",
+    ("operation",),
+))
+DB_STATEMENT_ERRORS = registry.register(Counter(
+    "db_statement_errors_total",
+    "SQL statements that raised",
+    ("operation",),
+))
+
+
+def render_latest() -> str:
+    return registry.render()
+
+
+# ----------------------------------------
+# Spans
+# ----------------------------------------
+
+def observe_span(kind: str, name: str, seconds: float, outcome: str = "ok"):
+    """
+    Record a span measured elsewhere (e.g. OCR stages timed in a worker
+    process).
+    """
+    SPAN_DURATION.observe(seconds, kind=kind, name=name, outcome=outcome)
+    logger.debug(
+        "span",
+        extra={"span_kind": kind, "span_name": name, "outcome": outcome,
+               "duration_ms": round(seconds * 1000, 2)},
+    )
+
+
+@contextmanager
+def span(kind: str, name: str):
+    started = time.perf_counter()
+    outcome = "ok"
+    try:
+        yield
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        observe_span(kind, name, time.perf_counter() - started, outcome)
+
+
+def traced(kind: str, name: str | None = None):
+    """
+    Decorator form of `span` for sync and async functions.
+    """
+    def decorator(fn):
+        span_name = name or fn.__name__
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with span(kind, span_name):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(kind, span_name):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+# ----------------------------------------
+# Database statements
+# ----------------------------------------
+
+def _operation(statement: str) -> str:
+    head = statement.lstrip().split(None, 1)
+    return head[0].upper() if head else "UNKNOWN"
+
+
+def instrument_engine(engine):
+    """
+    Time every statement on the engine's cursor events. The async engine
+    runs them on its sync core, so the listeners go there.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_started"].pop()
+        DB_STATEMENT_DURATION.observe(
+            time.perf_counter() - started, operation=_operation(statement)
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        stack = context.connection.info.get("query_started") if context.connection else None
+        if stack:
+            stack.pop()
+        DB_STATEMENT_ERRORS.inc(operation=_operation(context.statement or ""))
+
+
+# ----------------------------------------
+# ASGI middleware
+# ----------------------------------------
+
+class MetricsMiddleware:
+    """
+    Times every HTTP request, labelled by route template rather than raw
+    path so /clinic/requirements/12 and /13 share a series. Also assigns
+    the request id (X-Request-ID in, echoed out) used by the log lines.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        request_id = None
+        for header, value in scope.get("headers", []):
+            if header == b"x-request-id":
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            HTTP_REQUEST_DURATION.observe(
+                elapsed, method=scope["method"], route=route_path, status=status_code
+            )
+
+            if elapsed * 1000 >= settings.LOG_SLOW_REQUEST_MS:
+                logger.warning(
+                    "slow request",
+                    extra={"method": scope["method"], "route": route_path,
+                           "status": status_code, "duration_ms": round(elapsed * 1000, 1)},
+                )
+            request_id_var.reset(token)
@@ -0,0 +1,136 @@
+import base64
+import json
+from datetime import datetime
+from typing import Generic, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class PageParams:
+    """
+    Query parameters shared by all paginated endpoints.
+    """
+
+    def __init__(
+        self,
+        cursor: str | None = Query(None, description="Opaque cursor from the previous page"),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        fields: str | None = Query(None, description="Comma-separated list of fields to return"),
+    ):
+        self.cursor = cursor
+        self.limit = limit
+        self.fields = fields
+
+
+# ---------------------------------------------------------
+# Cursors
+# A cursor is the sort key of the last row on a page,
+# e.g. (created_at, id), encoded as url-safe base64 JSON.
+# ---------------------------------------------------------
+
+def encode_cursor(values) -> str:
+    raw = json.dumps([
+        v.isoformat() if isinstance(v, datetime) else v
+        for v in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_columns) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+
+        if len(values) != len(sort_columns):
+            raise ValueError("cursor length mismatch")
+
+        return [
+            datetime.fromisoformat(v)
+            if column.type.python_type is datetime else v
+            for column, v in zip(sort_columns, values)
+        ]
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# ---------------------------------------------------------
+# Field projection
+# ---------------------------------------------------------
+
+def project(columns: dict, fields: str | None) -> list:
+    """
+    Pick the labeled columns requested through `fields=`.
+    All columns are returned when no projection is given.
+    """
+    if not fields:
+        return [column.label(name) for name, column in columns.items()]
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in columns]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}",
+        )
+
+    return [columns[name].label(name) for name in dict.fromkeys(requested)]
+
+
+# ---------------------------------------------------------
+# Keyset pagination
+# ---------------------------------------------------------
+
+async def paginate(
+    db: AsyncSession,
+    stmt,
+    sort_columns,
+    params: PageParams,
+) -> dict:
+    """
+    Run `stmt` as one page, newest first, keyed on `sort_columns`.
+
+    The sort columns are selected under hidden labels so the next
+    cursor can be built even when they are projected away.
+    """
+    limit = min(params.limit, MAX_PAGE_SIZE)
+    keys = [f"_cursor_{i}" for i in range(len(sort_columns))]
+
+    stmt = stmt.add_columns(
+        *(column.label(key) for column, key in zip(sort_columns, keys))
+    )
+
+    if params.cursor:
+        values = decode_cursor(params.cursor, sort_columns)
+        stmt = stmt.where(tuple_(*sort_columns) < tuple_(*values))
+
+    stmt = stmt.order_by(None).order_by(
+        *(column.desc() for column in sort_columns)
+    ).limit(limit + 1)
+
+    result = await db.execute(stmt)
+    names = list(result.keys())[:-len(keys)]
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][len(names):])
+
+    # the hidden cursor columns come last; zip stops before them
+    return {
+        "items": [dict(zip(names, row)) for row in rows],
+        "next_cursor": next_cursor,
+    }
@@ -0,0 +1,206 @@
+import json
+import math
+import time
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+
+# ----------------------------------------
+# Counter backends
+# ----------------------------------------
+
+class InMemoryRateLimitBackend:
+    """
+    Per-process counters. Limits are per worker, not per deployment.
+    """
+
+    def __init__(self):
+        self._counters = {}
+        self._last_sweep = 0.0
+
+    async def incr(self, key: str, ttl: int) -> int:
+        now = time.monotonic()
+        self._sweep(now)
+
+        count, expires_at = self._counters.get(key, (0, 0.0))
+        if expires_at <= now:
+            count = 0
+
+        count += 1
+        self._counters[key] = (count, now + ttl)
+        return count
+
+    async def get(self, key: str) -> int:
+        count, expires_at = self._counters.get(key, (0, 0.0))
+        if expires_at <= time.monotonic():
+            return 0
+        return count
+
+    def _sweep(self, now: float):
+        # drop expired windows at most once a second
+        if now - self._last_sweep < 1:
+            return
+        self._last_sweep = now
+
+        expired = [k for k, (_, exp) in self._counters.items() if exp <= now]
+        for key in expired:
+            del self._counters[key]
+
+
+class SharedRateLimitBackend:
+    """
+    Counters kept in a shared store so every worker sees the same limits.
+
+    `client` is any asyncio client exposing Redis-style `incr`,
+    `expire` and `get` (redis.asyncio, or a local stand-in in tests).
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+
+    async def incr(self, key: str, ttl: int) -> int:
+        key = self.prefix + key
+        count = await self.client.incr(key)
+        if count == 1:
+            await self.client.expire(key, ttl)
+        return int(count)
+
+    async def get(self, key: str) -> int:
+        value = await self.client.get(self.prefix + key)
+        return int(value or 0)
+
+
+def _build_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        import redis.asyncio as redis
+
+        return SharedRateLimitBackend(
+            redis.from_url(settings.RATE_LIMIT_REDIS_URL)
+        )
+
+    return InMemoryRateLimitBackend()
+
+
+# ----------------------------------------
+# Sliding window limiter
+# ----------------------------------------
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window counter: the previous fixed window is weighted by how
+    much of it still overlaps the sliding window. Two counters per key,
+    no per-request timestamps.
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    async def hit(self, key: str, limit: int, period: int) -> int | None:
+        """
+        Record one attempt. Returns None when allowed, otherwise the
+        number of seconds the caller should wait.
+        """
+        now = time.time()
+        window = int(now // period)
+        elapsed = now - window * period
+
+        current = await self.backend.incr(f"{key}:{window}", period * 2)
+        previous = await self.backend.get(f"{key}:{window - 1}")
+
+        weighted = previous * (period - elapsed) / period + current
+        if weighted <= limit:
+            return None
+
+        return max(1, math.ceil(period - elapsed))
+
+
+limiter = SlidingWindowLimiter(_build_backend())
+
+
+# (limit, period) per client IP, applied by the middleware
+IP_RULES = {
+    "/auth/login": (settings.LOGIN_RATE_LIMIT_IP, settings.RATE_LIMIT_PERIOD),
+    "/auth/forgot-password": (settings.RESET_RATE_LIMIT_IP, settings.RATE_LIMIT_PERIOD),
+    "/auth/reset-password": (settings.RESET_RATE_LIMIT_IP, settings.RATE_LIMIT_PERIOD),
+}
+
+
+def too_many_requests(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, try again later",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+async def enforce_account_limit(scope: str, account: str, limit: int):
+    """
+    Per-account check, called by handlers before any bcrypt or SMTP work.
+    """
+    if not settings.RATE_LIMIT_ENABLED or not account:
+        return
+
+    retry_after = await limiter.hit(
+        f"{scope}:account:{account.strip().lower()}",
+        limit,
+        settings.RATE_LIMIT_PERIOD,
+    )
+    if retry_after is not None:
+        raise too_many_requests(retry_after)
+
+
+# ----------------------------------------
+# ASGI middleware
+# ----------------------------------------
+
+def client_ip(scope) -> str:
+    if settings.RATE_LIMIT_TRUST_PROXY:
+        for name, value in scope.get("headers", []):
+            if name == b"x-forwarded-for":
+                return value.decode().split(",")[0].strip()
+
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+class RateLimitMiddleware:
+    """
+    Rejects over-limit auth traffic by client IP before the request body
+    is read or a handler runs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.RATE_LIMIT_ENABLED:
+            return await self.app(scope, receive, send)
+
+        rule = IP_RULES.get(scope["path"])
+        if rule is None or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+
+        limit, period = rule
+        retry_after = await limiter.hit(
+            f"{scope['path']}:ip:{client_ip(scope)}", limit, period
+        )
+        if retry_after is None:
+            return await self.app(scope, receive, send)
+
+        body = json.dumps(
+            {"detail": "Too many attempts, try again later"}
+        ).encode()
+
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(retry_after).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,76 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from enum import Enum
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.engine import Row, RowMapping
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used instead
+    orjson = None
+
+
+def _encode_default(value):
+    """
+    Types neither encoder handles natively. Rows, mappings and ORM
+    objects are encoded field by field, no jsonable_encoder pass.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, RowMapping):
+        return dict(value)
+    if isinstance(value, Row):
+        return value._asdict()
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "_sa_instance_state"):
+        return {
+            attr.key: getattr(value, attr.key)
+            for attr in inspect(value).mapper.column_attrs
+        }
+    # stdlib fallback only: orjson does these natively
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, UUID):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_stdlib_encoder = json.JSONEncoder(
+    separators=(",", ":"),
+    ensure_ascii=False,
+    default=_encode_default,
+)
+
+
+def dumps(content) -> bytes:
+    """
+    Serialize a response body: orjson when installed, else stdlib json.
+    """
+    if orjson is not None:
+        return orjson.dumps(
+            content,
+            default=_encode_default,
+            option=orjson.OPT_NON_STR_KEYS,
+        )
+    return _stdlib_encoder.encode(content).encode()
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class of the app (see main.py). Bodies the app
+    builds itself (cached and idempotent responses) use `dumps` directly
+    and never go through jsonable_encoder.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
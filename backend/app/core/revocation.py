@@ -0,0 +1,158 @@
+import asyncio
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, func, select
+
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings.
+    "Not present" answers are exact; "present" may be a false positive.
+    """
+
+    def __init__(self, size_bits: int, hash_count: int):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.bits = bytearray((size_bits + 7) // 8)
+
+    def _positions(self, value: str):
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size_bits for i in range(self.hash_count)]
+
+    def add(self, value: str):
+        for pos in self._positions(value):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self.bits[pos >> 3] & (1 << (pos & 7))
+            for pos in self._positions(value)
+        )
+
+
+def _new_filter() -> BloomFilter:
+    return BloomFilter(
+        settings.REVOCATION_FILTER_BITS,
+        settings.REVOCATION_FILTER_HASHES,
+    )
+
+
+revocation_filter = _new_filter()
+
+# jti -> exp of tokens revoked by this process, re-applied on every
+# rebuild so a revocation committed after a sync snapshot is not lost
+_local_revocations = {}
+
+
+def _expires_at(payload: dict) -> datetime:
+    return datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+
+
+def _lock_key(jti: str) -> int:
+    digest = hashlib.blake2b(jti.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+async def is_token_revoked(jti: str | None, db=None) -> bool:
+    """
+    Check a token id against the denylist.
+
+    Without `db` (the per-request access token check) tokens missing
+    from the in-process filter are accepted without a DB hit; only
+    filter hits (revoked or false positive) are confirmed in the
+    database. The filter lags other workers by up to a sync interval.
+
+    With `db` (single-use tokens, revoked in the same transaction) the
+    database is always asked, under a transaction-scoped advisory lock
+    on the jti: a concurrent use of the same token waits for this
+    transaction and then finds its row.
+    """
+    if not jti:
+        return False
+
+    stmt = select(RevokedToken.id).where(RevokedToken.jti == jti)
+
+    if db is not None:
+        await db.execute(select(func.pg_advisory_xact_lock(_lock_key(jti))))
+        return (await db.execute(stmt)).first() is not None
+
+    if jti not in revocation_filter:
+        return False
+
+    async with AsyncSessionLocal() as session:
+        return (await session.execute(stmt)).first() is not None
+
+
+async def revoke_token(db, payload: dict, reason: str):
+    """
+    Add a token to the denylist as part of the caller's transaction.
+    The local filter is updated immediately; other workers pick the
+    row up on their next sync.
+    """
+    jti = payload.get("jti")
+    if not jti:
+        return
+
+    db.add(
+        RevokedToken(
+            jti=jti,
+            token_type=payload.get("type") or "ACCESS",
+            reason=reason,
+            expires_at=_expires_at(payload),
+        )
+    )
+    revocation_filter.add(jti)
+    _local_revocations[jti] = payload["exp"]
+
+
+async def sync_revocations(session_factory=AsyncSessionLocal):
+    """
+    Rebuild the filter from unexpired denylist rows and prune the rest.
+    """
+    global revocation_filter
+
+    async with session_factory() as db:
+        now = datetime.now(timezone.utc)
+
+        await db.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= now)
+        )
+        await db.commit()
+
+        result = await db.execute(select(RevokedToken.jti))
+
+        fresh = _new_filter()
+        for jti in result.scalars():
+            fresh.add(jti)
+
+    for jti, exp in list(_local_revocations.items()):
+        if exp <= now.timestamp():
+            _local_revocations.pop(jti, None)
+        else:
+            fresh.add(jti)
+
+    revocation_filter = fresh
+
+
+async def run_revocation_sync(session_factory, interval_seconds: int):
+    """
+    Background loop started on application startup, after the
+    initial sync.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+
+        try:
+            await sync_revocations(session_factory)
+        except Exception:
+            logger.exception("Token revocation sync failed")
@@ -0,0 +1,116 @@
+from importlib import import_module
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+
+# Every module exposing a `router`, in registration order.
+# New routers are added here, not in main.py.
+ROUTER_MODULES = (
+    "app.auth.router",
+    "app.companies.router",
+    "app.donations.router",
+    "app.ngo.router",
+    "app.clinic.router",
+    "app.admin.router",
+    "app.exports.router",
+    "app.audit.router",
+    "app.metrics.router",
+)
+
+
+class RouteConflictError(RuntimeError):
+    """
+    Two handlers registered for the same method and path: only the first
+    would ever be reached.
+    """
+
+
+def registered_routes(app: FastAPI):
+    """
+    Every route in match order. Newer FastAPI versions keep included
+    routers nested instead of copying their routes into app.routes.
+    """
+    for route in app.routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            yield from included.routes
+        else:
+            yield route
+
+
+def _endpoint_name(route: APIRoute) -> str:
+    return f"{route.endpoint.__module__}.{route.endpoint.__name__}"
+
+
+def find_route_conflicts(routes) -> list[str]:
+    """
+    Same method and path registered twice, or a static path registered
+    after a parameterised one that already matches it.
+    """
+    seen = {}
+    parameterised = []
+    conflicts = []
+
+    for route in routes:
+        if not isinstance(route, APIRoute):
+            continue
+
+        for method in route.methods:
+            key = (method, route.path)
+            if key in seen:
+                conflicts.append(
+                    f"{method} {route.path}: {_endpoint_name(route)} "
+                    f"is shadowed by {_endpoint_name(seen[key])}"
+                )
+                continue
+            seen[key] = route
+
+            if "{" not in route.path:
+                for earlier in parameterised:
+                    if method in earlier.methods and earlier.path_regex.match(route.path):
+                        conflicts.append(
+                            f"{method} {route.path}: {_endpoint_name(route)} "
+                            f"is shadowed by {earlier.path} ({_endpoint_name(earlier)})"
+                        )
+                        break
+
+        if "{" in route.path:
+            parameterised.append(route)
+
+    return conflicts
+
+
+def include_routers(app: FastAPI, modules=ROUTER_MODULES) -> None:
+    """
+    Import each router module, mount its router, and refuse to start if
+    any method/path pair ends up registered twice.
+    """
+    for module in modules:
+        app.include_router(import_module(module).router)
+
+    conflicts = find_route_conflicts(registered_routes(app))
+    if conflicts:
+        raise RouteConflictError(
+            "Duplicate routes:\n  " + "\n  ".join(conflicts)
+        )
+
+
+def routing_table(app: FastAPI) -> list[dict]:
+    """
+    Final routing table in match order.
+    """
+    table = []
+    for route in registered_routes(app):
+        if isinstance(route, APIRoute):
+            table.append({
+                "methods": sorted(route.methods),
+                "path": route.path,
+                "endpoint": _endpoint_name(route),
+            })
+        else:
+            table.append({
+                "methods": sorted(getattr(route, "methods", None) or []),
+                "path": getattr(route, "path", ""),
+                "endpoint": type(route).__name__,
+            })
+    return table
@@ -1,38 +1,156 @@
+import hashlib
+import time
+from collections import OrderedDict
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from app.core.config import settings
+from app.core.revocation import is_token_revoked
+from app.schemas.auth import Principal
+
+# PyJWT verifies HS256 noticeably faster than python-jose.
+# It is optional: without it we fall back to jose.
+try:
+    import jwt as pyjwt
+except ImportError:
+    pyjwt = None
 
 # This tells FastAPI where the token comes from
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
-def require_role(required_role: str):
-    """
-    Dependency to enforce role-based access using JWT.
-    """
+class TokenError(Exception):
+    pass
 
-    async def wrapper(token: str = Depends(oauth2_scheme)):
+
+def _use_pyjwt() -> bool:
+    if settings.JWT_BACKEND == "jose":
+        return False
+    return pyjwt is not None
+
+
+def _decode(token: str) -> dict:
+    if _use_pyjwt():
         try:
-            payload = jwt.decode(
+            return pyjwt.decode(
                 token,
                 settings.SECRET_KEY,
-                algorithms=[settings.ALGORITHM]
+                algorithms=[settings.ALGORITHM],
             )
+        except pyjwt.PyJWTError as exc:
+            raise TokenError(str(exc)) from exc
+
+    try:
+        return jwt.decode(
+            token,
+            settings.SECRET_KEY,
+            algorithms=[settings.ALGORITHM],
+        )
+    except JWTError as exc:
+        raise TokenError(str(exc)) from exc
+
+
+class ClaimsCache:
+    """
+    Bounded LRU of verified JWT claims, keyed by token digest.
+    An entry is only served until the token's own `exp`.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, digest: bytes):
+        entry = self._entries.get(digest)
+        if entry is None:
+            return None
+
+        claims, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._entries.pop(digest, None)
+            return None
+
+        self._entries.move_to_end(digest)
+        return claims
+
+    def set(self, digest: bytes, claims: dict):
+        self._entries[digest] = (claims, claims.get("exp"))
+        self._entries.move_to_end(digest)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
 
-            role = payload.get("role") or payload.get("CLINIC")
-            if role != required_role:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Access denied"
-                )
+claims_cache = ClaimsCache(settings.TOKEN_CACHE_SIZE)
 
-            return payload
 
-        except JWTError:
+def decode_token(token: str) -> dict:
+    """
+    Verify a JWT and return its claims.
+    Repeat calls with the same token are served from the cache.
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+
+    claims = claims_cache.get(digest)
+    if claims is None:
+        claims = _decode(token)
+        claims_cache.set(digest, claims)
+
+    return claims
+
+
+async def decode_access_token(token: str) -> dict:
+    try:
+        claims = decode_token(token)
+    except TokenError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+
+    # invite / reset tokens carry a `type` and are not access tokens
+    if claims.get("type"):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token"
+        )
+
+    if await is_token_revoked(claims.get("jti")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+
+    return claims
+
+
+async def get_current_principal(
+    token: str = Depends(oauth2_scheme),
+) -> Principal:
+    """
+    Dependency returning the typed caller identity for any role.
+    """
+    return Principal(**await decode_access_token(token))
+
+
+def require_role(required_role: str):
+    """
+    Dependency to enforce role-based access using JWT.
+    """
+
+    async def wrapper(token: str = Depends(oauth2_scheme)):
+        payload = await decode_access_token(token)
+
+        if payload.get("role") != required_role:
             raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token"
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
             )
 
+        return dict(payload)
+
     return wrapper
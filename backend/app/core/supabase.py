@@ -1,7 +1,17 @@
-from supabase import create_client
+from functools import lru_cache
+
 from app.core.config import settings
 
-supabase = create_client(
-    settings.SUPABASE_URL,
-    settings.SUPABASE_SERVICE_KEY  
-)
+
+@lru_cache(maxsize=1)
+def get_supabase():
+    """
+    Shared Supabase client, created on first use so the SDK is only
+    imported by workers that actually call it.
+    """
+    from supabase import create_client
+
+    return create_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_SERVICE_KEY
+    )
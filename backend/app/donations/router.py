@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.deps import get_db
 from app.core.security import require_role
-from app.donations.schema import DonationCreate
+from app.donations.schema import DonationCreate, DonationHistoryItem
 from app.donations.service import create_donation
 from app.donations.service import get_csr_donation_history
 from app.donations.service import get_csr_dashboard_analytics
+from app.core.cache import cached_json, tenant_tag
+from app.core.pagination import Page, PageParams
+from app.services.rollup_service import CSR
 
 router = APIRouter(
     prefix="/donations",
@@ -35,39 +38,37 @@ async def create_donation_endpoint(
 
 @router.get(
     "/history",
-    summary="CSR donation history"
+    summary="CSR donation history",
+    response_model=Page[DonationHistoryItem],
+    response_model_exclude_unset=True,
 )
 async def donation_history(
+    page: PageParams = Depends(),
     db: AsyncSession = Depends(get_db),
     user: dict = Depends(require_role("CSR"))
 ):
-    donations = await get_csr_donation_history(
+    return await get_csr_donation_history(
         db=db,
-        company_id=user["company_id"]
+        company_id=user["company_id"],
+        page=page,
     )
 
-    return [
-        {
-            "donation_id": d.id,
-            "item_name": d.item_name,
-            "quantity": d.quantity,
-            "purpose": d.purpose,
-            "status": d.status,
-            "created_at": d.created_at
-        }
-        for d in donations
-    ]
-
 
 @router.get(
     "/analytics",
     summary="CSR dashboard analytics"
 )
 async def csr_dashboard_analytics(
+    request: Request,
     db: AsyncSession = Depends(get_db),
     user: dict = Depends(require_role("CSR"))
 ):
-    return await get_csr_dashboard_analytics(
-        db=db,
-        company_id=user["company_id"]
+    return await cached_json(
+        request,
+        user,
+        [tenant_tag(CSR, user["company_id"])],
+        lambda: get_csr_dashboard_analytics(
+            db=db,
+            company_id=user["company_id"]
+        ),
     )
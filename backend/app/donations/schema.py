@@ -1,3 +1,4 @@
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Optional
 
@@ -26,3 +27,16 @@ class DonationCreate(BaseModel):
         example=True,
         description="Confirms donation aligns with declared CSR policy"
     )
+
+
+class DonationHistoryItem(BaseModel):
+    # all optional: clients may project a subset with `fields=`
+    donation_id: int | None = None
+    item_name: str | None = None
+    quantity: int | None = None
+    purpose: str | None = None
+    status: str | None = None
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
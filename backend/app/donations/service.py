@@ -9,8 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.donation import Donation
 from sqlalchemy import func
 
-from app.blockchain.service import log_to_blockchain
-from app.blockchain.audit_chain import write_to_blockchain
+from app.core.cache import invalidate_on_commit, DONATIONS_AVAILABLE_TAG
+from app.services.rollup_service import refresh_dashboard_rollups
+from app.core.pagination import PageParams, paginate, project
 
 
 
@@ -49,6 +50,8 @@ async def create_donation(
     # donation.blockchain_tx = audit["tx_hash"]
     # donation.blockchain_hash = audit["record_hash"]
 
+    await refresh_dashboard_rollups(db, company_ids=[company_id])
+    invalidate_on_commit(db, DONATIONS_AVAILABLE_TAG)
     await db.commit()
     await db.refresh(donation)
 #     audit= await log_to_blockchain(
@@ -67,22 +70,33 @@ async def create_donation(
 
 
 
+DONATION_HISTORY_FIELDS = {
+    "donation_id": Donation.id,
+    "item_name": Donation.item_name,
+    "quantity": Donation.quantity,
+    "purpose": Donation.purpose,
+    "status": Donation.status,
+    "created_at": Donation.created_at,
+}
+
+
 async def get_csr_donation_history(
     db: AsyncSession,
-    company_id: int
+    company_id: int,
+    page: PageParams,
 ):
     """
-    Fetch all donations created by the CSR's company.
+    Fetch one page of donations created by the CSR's company.
     """
 
-    result = await db.execute(
-        select(Donation)
-        .where(Donation.company_id == company_id)
-        .order_by(Donation.created_at.desc())
+    return await paginate(
+        db,
+        select(*project(DONATION_HISTORY_FIELDS, page.fields))
+        .where(Donation.company_id == company_id),
+        (Donation.created_at, Donation.id),
+        page,
     )
 
-    return result.scalars().all()
-
 
 
 
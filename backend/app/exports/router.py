@@ -0,0 +1,70 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+
+from app.core.security import require_role
+from app.exports.service import export_response
+from app.models.clinic import Clinic
+from app.models.clinic_requirments import ClinicRequirements
+from app.models.donation import Donation
+from app.models.donation_allocation import DonationAllocation
+
+router = APIRouter(prefix="/exports", tags=["Exports"])
+
+FORMAT_QUERY = Query("csv", alias="format", pattern="^(csv|ndjson)$")
+
+
+@router.get("/donations", summary="Export the CSR donation ledger")
+async def export_donations(
+    export_format: str = FORMAT_QUERY,
+    gzip: bool = False,
+    user: dict = Depends(require_role("CSR")),
+):
+    stmt = (
+        select(*Donation.__table__.columns)
+        .where(Donation.company_id == user["company_id"])
+        .order_by(Donation.id)
+    )
+    return export_response(stmt, "donations", export_format, gzip)
+
+
+@router.get("/allocations", summary="Export allocations of the CSR's donations")
+async def export_allocations(
+    export_format: str = FORMAT_QUERY,
+    gzip: bool = False,
+    user: dict = Depends(require_role("CSR")),
+):
+    stmt = (
+        select(
+            DonationAllocation.id.label("allocation_id"),
+            DonationAllocation.alloc_uid,
+            DonationAllocation.donation_id,
+            Donation.item_name,
+            Donation.quantity,
+            DonationAllocation.clinic_requirement_id,
+            DonationAllocation.allocated_at,
+            DonationAllocation.received,
+            DonationAllocation.received_at,
+        )
+        .join(Donation, DonationAllocation.donation_id == Donation.id)
+        .where(Donation.company_id == user["company_id"])
+        .order_by(DonationAllocation.id)
+    )
+    return export_response(stmt, "allocations", export_format, gzip)
+
+
+@router.get("/requirements", summary="Export clinic requirements of the NGO")
+async def export_requirements(
+    export_format: str = FORMAT_QUERY,
+    gzip: bool = False,
+    ngo: dict = Depends(require_role("NGO")),
+):
+    stmt = (
+        select(
+            *ClinicRequirements.__table__.columns,
+            Clinic.clinic_name,
+        )
+        .join(Clinic, Clinic.id == ClinicRequirements.clinic_id)
+        .where(Clinic.ngo_id == ngo["ngo_id"])
+        .order_by(ClinicRequirements.id)
+    )
+    return export_response(stmt, "requirements", export_format, gzip)
@@ -0,0 +1,115 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi.responses import StreamingResponse
+
+from app.db.database import AsyncSessionLocal
+
+# rows fetched per server-side cursor round trip
+EXPORT_BATCH_SIZE = 1000
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+async def stream_partitions(stmt):
+    """
+    Yield result rows in batches through a server-side cursor.
+
+    The export owns its session: the request-scoped one from get_db
+    is closed before a StreamingResponse body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        async for partition in result.mappings().partitions():
+            yield partition
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+async def csv_chunks(stmt, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    writer.writerow(columns)
+    yield buffer.getvalue().encode()
+
+    async for partition in stream_partitions(stmt):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            [
+                v.isoformat() if isinstance(v, (datetime, date)) else v
+                for v in (row[c] for c in columns)
+            ]
+            for row in partition
+        )
+        yield buffer.getvalue().encode()
+
+
+async def ndjson_chunks(stmt, columns):
+    async for partition in stream_partitions(stmt):
+        yield "".join(
+            json.dumps(
+                {c: row[c] for c in columns},
+                default=_json_default,
+            ) + "\n"
+            for row in partition
+        ).encode()
+
+
+async def gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def export_response(
+    stmt,
+    filename: str,
+    export_format: str = "csv",
+    gzip: bool = False,
+) -> StreamingResponse:
+    """
+    Stream the rows of `stmt` as CSV or NDJSON.
+    Memory use is bounded by EXPORT_BATCH_SIZE, not by the table size.
+    """
+    columns = [c.key for c in stmt.selected_columns]
+
+    if export_format == "ndjson":
+        chunks = ndjson_chunks(stmt, columns)
+    else:
+        chunks = csv_chunks(stmt, columns)
+
+    filename = f"{filename}.{export_format}"
+    media_type = MEDIA_TYPES[export_format]
+
+    if gzip:
+        chunks = gzip_chunks(chunks)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+        },
+    )
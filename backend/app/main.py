@@ -1,15 +1,16 @@
+import asyncio
+import logging
 from fastapi import FastAPI
-from app.auth.router import router as auth_router
-from app.companies.router import router as company_router
-from app.donations.router import router as donation_router
-from app.ngo.router import router as ngo_router
-from app.clinic.router import router as clinic_router
-from app.admin.router import router as admin_router
+from app.core.logging_config import configure_logging
 from app.db.database import engine, AsyncSessionLocal
 from app.db.base import Base
 from app.db.startup import seed_trusted_companies, seed_trusted_ngos
 from app.blockchain.ganache_runner import start_ganache
 from app.core.config import settings
+from app.core.rate_limit import RateLimitMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.routes import include_routers
+from app.core.responses import FastJSONResponse
 
 
 # Import all models so SQLAlchemy knows about them for table creation
@@ -24,8 +25,36 @@ from app.models.clinic_invitation import ClinicInvitation
 from app.models.clinic_requirment import ClinicRequirement
 from app.models.password_set_jwt import PasswordSetupToken
 from app.models.admin_audit_log import AdminAuditLog
+from app.models.dashboard_kpi import DashboardKPI
+from app.models.revoked_token import RevokedToken
+from app.models.email_outbox import EmailOutbox
+from app.models.audit_record import AuditRecord, AuditBatch
+from app.models.chain_audit_event import ChainAuditEvent, ChainSyncCursor
+from app.models.idempotency_key import IdempotencyKey
+from app.blockchain.anchor import run_audit_anchorer
+from app.blockchain.indexer import run_audit_indexer
+from app.notifications.dispatcher import run_email_dispatcher
+from app.notifications.transport import email_transport
+from app.services.ocr_service import shutdown_ocr_pool
+from app.core.revocation import sync_revocations, run_revocation_sync
+from app.core.idempotency import run_idempotency_purge
+from app.services.rollup_service import run_rollup_reconciler
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+app = FastAPI(title="CSR HealthTrace", default_response_class=FastJSONResponse)
+app.add_middleware(RateLimitMiddleware)
+# outermost, so rate-limited responses are timed too
+app.add_middleware(MetricsMiddleware)
+
+# background loops started on startup, cancelled on shutdown
+background_tasks: list[asyncio.Task] = []
+
+
+def start_background(coro):
+    background_tasks.append(asyncio.create_task(coro))
 
-app = FastAPI(title="CSR HealthTrace")
 
 @app.on_event("startup")
 async def startup():
@@ -37,20 +66,63 @@ async def startup():
 
     async with AsyncSessionLocal() as db:
         await seed_trusted_ngos(db)
+
+    start_background(
+        run_rollup_reconciler(
+            AsyncSessionLocal,
+            settings.DASHBOARD_RECONCILE_INTERVAL,
+        )
+    )
+
+    # load the denylist before serving, then keep it in sync
+    await sync_revocations(AsyncSessionLocal)
+    start_background(
+        run_revocation_sync(
+            AsyncSessionLocal,
+            settings.REVOCATION_SYNC_INTERVAL,
+        )
+    )
+
+    start_background(run_email_dispatcher(AsyncSessionLocal))
+    start_background(
+        run_idempotency_purge(
+            AsyncSessionLocal,
+            settings.IDEMPOTENCY_PURGE_INTERVAL,
+        )
+    )
+    start_background(
+        run_audit_anchorer(
+            AsyncSessionLocal,
+            settings.AUDIT_ANCHOR_POLL_INTERVAL,
+        )
+    )
+    if settings.BLOCKCHAIN_ENABLED:
+        start_background(
+            run_audit_indexer(
+                AsyncSessionLocal,
+                settings.AUDIT_INDEXER_INTERVAL,
+            )
+        )
     # start_ganache()
     # url = start_ganache()
     # if url:
     #     settings.GANACHE_URL = url
-    #     print(f"🔗 Blockchain RPC: {url}")
+    #     logger.info("Blockchain RPC: %s", url)
     # else:
-    #     print("⚠️ Blockchain disabled")
-
-app.include_router(auth_router)
-app.include_router(company_router)
-app.include_router(donation_router)
-app.include_router(ngo_router)
-app.include_router(clinic_router)
-app.include_router(admin_router)
+    #     logger.warning("Blockchain disabled")
+
+@app.on_event("shutdown")
+async def shutdown():
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    background_tasks.clear()
+
+    await email_transport.close()
+    shutdown_ocr_pool()
+
+# fails fast on duplicate method/path pairs; see app/core/routes.py
+include_routers(app)
 
 from fastapi.staticfiles import StaticFiles
 
@@ -0,0 +1,55 @@
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, ForeignKey, JSON
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class AuditBatch(Base):
+    """
+    A group of audit records whose Merkle root is anchored on chain
+    in a single transaction.
+    """
+    __tablename__ = "audit_batches"
+
+    id = Column(Integer, primary_key=True)
+
+    merkle_root = Column(String, nullable=False)
+    record_count = Column(Integer, nullable=False)
+
+    status = Column(String, nullable=False, default="PENDING")
+    # PENDING / SUBMITTED / ANCHORED / FAILED
+
+    tx_hash = Column(String, nullable=True, index=True)  # latest send
+    tx_hashes = Column(JSON, nullable=True)  # every send at this nonce, replacements included
+    nonce = Column(Integer, nullable=True)
+    gas_price = Column(BigInteger, nullable=True)  # wei, of the latest send
+    block_number = Column(Integer, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    submitted_at = Column(DateTime(timezone=True), nullable=True)
+    anchored_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class AuditRecord(Base):
+    """
+    Append-only audit log. Rows are never updated except to attach
+    them to a batch along with their inclusion proof.
+    """
+    __tablename__ = "audit_records"
+
+    id = Column(Integer, primary_key=True)
+
+    action = Column(String, nullable=False)
+    # DONATION_ACCEPTED / DONATION_ALLOCATED / DONATION_RECEIVED ...
+
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(String, nullable=False, index=True)
+
+    payload = Column(Text, nullable=False)  # canonical JSON
+    record_hash = Column(String, nullable=False, index=True)
+    recorded_at = Column(DateTime(timezone=True), nullable=False)
+
+    batch_id = Column(Integer, ForeignKey("audit_batches.id"), nullable=True, index=True)
+    leaf_index = Column(Integer, nullable=True)
+    proof = Column(JSON, nullable=True)
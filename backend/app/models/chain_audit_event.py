@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class ChainAuditEvent(Base):
+    """
+    Local mirror of AuditRecorded events read from the audit contract.
+    """
+    __tablename__ = "chain_audit_events"
+
+    id = Column(Integer, primary_key=True)
+
+    block_number = Column(BigInteger, nullable=False, index=True)
+    log_index = Column(Integer, nullable=False)
+    tx_hash = Column(String, nullable=False)
+
+    action = Column(String, nullable=False)
+    record_hash = Column(String, nullable=False, index=True)
+    chain_timestamp = Column(BigInteger, nullable=False)
+
+    indexed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("tx_hash", "log_index", name="uq_chain_audit_event_log"),
+    )
+
+
+class ChainSyncCursor(Base):
+    """
+    Last block each chain indexer has fully processed.
+    """
+    __tablename__ = "chain_sync_cursors"
+
+    name = Column(String, primary_key=True)
+    last_block = Column(BigInteger, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -1,5 +1,5 @@
 from sqlalchemy import Column, Integer, String, DateTime
-from supabase_auth import datetime
+from datetime import datetime
 from app.db.base import Base
 
 class ClinicFeedback(Base):
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class DashboardKPI(Base):
+    """
+    Materialized dashboard counter.
+    One row per (tenant, metric), kept current by the services that
+    change dashboard state and corrected by the reconciliation job.
+    """
+    __tablename__ = "dashboard_kpis"
+
+    id = Column(Integer, primary_key=True)
+
+    tenant_type = Column(String, nullable=False)
+    # CLINIC / NGO / CSR / PLATFORM
+
+    tenant_id = Column(Integer, nullable=False)
+    # 0 for PLATFORM
+
+    metric = Column(String, nullable=False)
+    value = Column(Integer, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+
+    __table_args__ = (
+        UniqueConstraint("tenant_type", "tenant_id", "metric"),
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class EmailOutbox(Base):
+    """
+    Transactional outbox for outgoing mail.
+    Rows are written in the same transaction as the change that
+    triggers the email and delivered by the background dispatcher.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+
+    to_email = Column(String, nullable=False)
+    subject = Column(String, nullable=False)
+    body = Column(Text, nullable=False)
+    body_html = Column(Text, nullable=True)
+
+    status = Column(String, nullable=False, default="PENDING")
+    # PENDING / SENT / FAILED
+
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String, nullable=True)
+
+    next_attempt_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_email_outbox_due", "status", "next_attempt_at"),
+    )
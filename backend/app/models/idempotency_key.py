@@ -0,0 +1,27 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Stored outcome of a write request sent with an Idempotency-Key header,
+    replayed when the client retries with the same key.
+    Rows are kept until expires_at.
+    """
+    __tablename__ = "idempotency_keys"
+
+    # caller (role + tenant ids) and the client-chosen key
+    scope = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+
+    request_hash = Column(String, nullable=False)
+
+    status = Column(String, nullable=False, default="IN_PROGRESS")
+    # IN_PROGRESS / COMPLETED
+
+    response_status = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
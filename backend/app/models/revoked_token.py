@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+from app.db.base import Base
+
+
+class RevokedToken(Base):
+    """
+    Denylist of JWT ids (jti).
+    Rows are kept until the token would have expired anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    id = Column(Integer, primary_key=True)
+    jti = Column(String, unique=True, index=True, nullable=False)
+
+    token_type = Column(String, nullable=False)
+    # ACCESS / RESET_PASSWORD / INVITE / clinic_invite
+
+    reason = Column(String, nullable=True)
+    # LOGOUT / USED
+
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    revoked_at = Column(DateTime(timezone=True), server_default=func.now())
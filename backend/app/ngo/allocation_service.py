@@ -0,0 +1,230 @@
+from collections import defaultdict
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, select
+
+from app.blockchain.service import record_audit_event
+from app.core.config import settings
+from app.models.clinic import Clinic
+from app.models.clinic_requirments import ClinicRequirements
+from app.models.donation import Donation
+from app.models.donation_allocations import DonationAllocations
+from app.services.allocation_engine import (
+    Demand,
+    Supply,
+    normalize_asset_name,
+    solve_allocation,
+)
+from app.services.rollup_service import refresh_dashboard_rollups
+
+
+async def _load_supplies(db, ngo_id: int, donation_ids=None, lock: bool = False):
+    """
+    Accepted donations of this NGO with the stock not yet allocated,
+    oldest first. {donation_id: (Donation, remaining)}
+    """
+    query = (
+        select(Donation)
+        .where(Donation.ngo_id == ngo_id)
+        .where(Donation.status == "ACCEPTED")
+        .order_by(Donation.created_at, Donation.id)
+    )
+    if donation_ids is not None:
+        query = query.where(Donation.id.in_(donation_ids))
+    if lock:
+        query = query.with_for_update()
+
+    donations = (await db.execute(query)).scalars().all()
+    if not donations:
+        return {}
+
+    rows = await db.execute(
+        select(
+            DonationAllocations.donation_id,
+            func.sum(DonationAllocations.allocated_quantity),
+        )
+        .where(DonationAllocations.donation_id.in_([d.id for d in donations]))
+        .group_by(DonationAllocations.donation_id)
+    )
+    used = dict(rows.all())
+
+    return {
+        d.id: (d, d.quantity - (used.get(d.id) or 0))
+        for d in donations
+    }
+
+
+async def _load_demands(db, ngo_id: int, requirement_ids=None, lock: bool = False):
+    """
+    Confirmed, still open requirements of clinics onboarded by this NGO.
+    {requirement_id: ClinicRequirements}
+    """
+    query = (
+        select(ClinicRequirements)
+        .join(Clinic, Clinic.id == ClinicRequirements.clinic_id)
+        .where(Clinic.ngo_id == ngo_id)
+        .where(ClinicRequirements.status == "CONFIRMED")
+        .where(ClinicRequirements.confirmed_quantity > 0)
+        .order_by(ClinicRequirements.id)
+    )
+    if requirement_ids is not None:
+        query = query.where(ClinicRequirements.id.in_(requirement_ids))
+    if lock:
+        query = query.with_for_update(of=ClinicRequirements)
+
+    return {req.id: req for req in (await db.execute(query)).scalars().all()}
+
+
+async def plan_allocations(db, ngo_id: int) -> dict:
+    """
+    Proposed allocation of every accepted donation against every open
+    requirement of the NGO. Nothing is written.
+    """
+    supplies = await _load_supplies(db, ngo_id)
+    demands = await _load_demands(db, ngo_id)
+
+    plan = solve_allocation(
+        [
+            Supply(donation.id, normalize_asset_name(donation.item_name), remaining)
+            for donation, remaining in supplies.values()
+        ],
+        [
+            Demand(
+                requirement_id=req.id,
+                clinic_id=req.clinic_id,
+                asset=normalize_asset_name(req.asset_name),
+                quantity=req.confirmed_quantity,
+                priority=req.priority,
+                created_at=req.created_at,
+            )
+            for req in demands.values()
+        ],
+        vectorize_from=settings.ALLOCATION_VECTORIZE_FROM,
+    )
+
+    # what is left on each side after the plan, per asset
+    unmet = defaultdict(int)
+    for req in demands.values():
+        unmet[normalize_asset_name(req.asset_name)] += req.confirmed_quantity
+    surplus = defaultdict(int)
+    for donation, remaining in supplies.values():
+        surplus[normalize_asset_name(donation.item_name)] += max(remaining, 0)
+    for item in plan:
+        unmet[item.asset] -= item.quantity
+        surplus[item.asset] -= item.quantity
+
+    return {
+        "allocations": [
+            {
+                "donation_id": item.donation_id,
+                "clinic_requirement_id": item.requirement_id,
+                "clinic_id": item.clinic_id,
+                "asset": item.asset,
+                "quantity": item.quantity,
+                "priority": demands[item.requirement_id].priority,
+            }
+            for item in plan
+        ],
+        "unmet": {asset: qty for asset, qty in unmet.items() if qty > 0},
+        "surplus": {asset: qty for asset, qty in surplus.items() if qty > 0},
+        "summary": {
+            "donations": len(supplies),
+            "requirements": len(demands),
+            "allocations": len(plan),
+            "allocated_quantity": sum(item.quantity for item in plan),
+        },
+    }
+
+
+async def apply_allocation_plan(db, ngo_id: int, items) -> dict:
+    """
+    Write a (possibly edited) plan in one transaction.
+
+    Donations and requirements are locked and re-checked first; if
+    anything moved since the plan was made, nothing is written and the
+    conflicts are returned with a 409.
+    """
+    donation_ids = sorted({item.donation_id for item in items})
+    requirement_ids = sorted({item.clinic_requirement_id for item in items})
+
+    # 🔒 lock in id order so concurrent applies can't deadlock
+    demands = await _load_demands(db, ngo_id, requirement_ids, lock=True)
+    supplies = await _load_supplies(db, ngo_id, donation_ids, lock=True)
+
+    stock = {donation_id: remaining for donation_id, (_, remaining) in supplies.items()}
+    need = {req_id: req.confirmed_quantity for req_id, req in demands.items()}
+    conflicts = []
+
+    for item in items:
+        if item.donation_id not in supplies:
+            conflicts.append({**item.model_dump(), "reason": "Donation not accepted by this NGO or already allocated"})
+            continue
+        if item.clinic_requirement_id not in demands:
+            conflicts.append({**item.model_dump(), "reason": "Requirement is not open for this NGO"})
+            continue
+
+        donation, _ = supplies[item.donation_id]
+        req = demands[item.clinic_requirement_id]
+        if normalize_asset_name(donation.item_name) != normalize_asset_name(req.asset_name):
+            conflicts.append({**item.model_dump(), "reason": "Donation item does not match the requirement"})
+            continue
+        if item.quantity > stock[item.donation_id]:
+            conflicts.append({**item.model_dump(), "reason": "Not enough donated stock left"})
+            continue
+        if item.quantity > need[item.clinic_requirement_id]:
+            conflicts.append({**item.model_dump(), "reason": "More than the requirement still needs"})
+            continue
+
+        stock[item.donation_id] -= item.quantity
+        need[item.clinic_requirement_id] -= item.quantity
+
+    if conflicts:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={"message": "Allocation plan is out of date", "conflicts": conflicts},
+        )
+
+    allocations = [
+        DonationAllocations(
+            donation_id=item.donation_id,
+            clinic_requirement_id=item.clinic_requirement_id,
+            allocated_quantity=item.quantity,
+        )
+        for item in items
+    ]
+    db.add_all(allocations)
+
+    for req_id, left in need.items():
+        req = demands[req_id]
+        req.confirmed_quantity = left
+        if left <= 0:
+            req.status = "ALLOCATED"
+
+    for donation_id, left in stock.items():
+        if left <= 0:
+            supplies[donation_id][0].status = "ALLOCATED"
+
+    # audit rows are anchored in the background
+    await db.flush()
+    for allocation in allocations:
+        record = record_audit_event(
+            db,
+            "NGO_ALLOCATION",
+            "DONATION_ALLOCATION",
+            allocation,
+        )
+        allocation.blockchain_hash = record.record_hash
+
+    await refresh_dashboard_rollups(
+        db,
+        clinic_ids={req.clinic_id for req in demands.values()},
+        company_ids={donation.company_id for donation, _ in supplies.values()},
+    )
+    # committed by idempotent_json, together with the stored response
+
+    return {
+        "message": "Allocation plan applied",
+        "allocation_ids": [allocation.id for allocation in allocations],
+        "allocated_quantity": sum(item.quantity for item in items),
+    }
@@ -1,16 +1,21 @@
+import csv
+import io
 from collections import defaultdict
-from fastapi import APIRouter, Depends, Form, HTTPException, UploadFile,File
+from pydantic import ValidationError
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, UploadFile,File
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import and_, case, or_, select, update
 from app.db.deps import get_db
-from app.ngo.schema import AllocateDonationRequest, NGORegister, ClinicCreate
+from app.ngo.schema import AllocateDonationRequest, ApplyAllocationPlanRequest, NGODashboardData, NGORegister, ClinicCreate
 from app.ngo.service import accept_csr_donation
 from app.core.security import require_role
 from app.ngo.service import check_ngo_acceptance_eligibility
 from app.ngo.accept_service import accept_donation_safely
-from app.ngo.service import register_clinic
+from app.ngo.allocation_service import plan_allocations, apply_allocation_plan
+from app.ngo.service import register_clinic, register_clinics_bulk
 from app.models.clinic_requirment import ClinicRequirement
 from app.models.ngo import NGO
+from app.models.clinic import Clinic
 from app.core.security import require_role
 from app.ngo.schema import ClinicNeedCreate
 from app.ngo.service import create_clinic_need , get_current_ngo, get_available_donations , get_accepted_donations, get_clinic_requirements, allocate_donation,register_ngo
@@ -22,6 +27,12 @@ from app.models.clinic_requirments import ClinicRequirements
 from app.models.donation_allocations import DonationAllocations
 from app.models.clinic_uploads import ClinicUpload
 from app.services.storage_service import get_signed_file_url
+from app.core.cache import cached_json, invalidate_on_commit, tenant_tag, DONATIONS_AVAILABLE_TAG
+from app.core.pagination import PageParams
+from app.core.idempotency import idempotent_json
+from app.core.config import settings
+from app.blockchain.service import record_audit_event
+from app.services.rollup_service import get_dashboard_kpis, refresh_dashboard_rollups, NGO as NGO_TENANT
 # from med_fusion_project.backend.app.blockchain.audit_chain import write_to_blockchain
 
 router = APIRouter(
@@ -106,6 +117,77 @@ async def register_clinic_endpoint(
     return await register_clinic(db, ngo_obj, data.official_email, data.clinic_name,data.facility_id, data.facility_id_type, data.doctor_registration_number, data.pincode)
 
 
+async def _read_clinic_rows(request: Request) -> list[dict]:
+    """
+    Accepts a JSON list (or {"clinics": [...]}), a text/csv body,
+    or a multipart upload with a CSV `file`.
+    """
+    content_type = request.headers.get("content-type", "")
+
+    if content_type.startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=400, detail="CSV file is required")
+        raw = await upload.read()
+        return list(csv.DictReader(io.StringIO(raw.decode("utf-8-sig"))))
+
+    if content_type.startswith("text/csv"):
+        raw = await request.body()
+        return list(csv.DictReader(io.StringIO(raw.decode("utf-8-sig"))))
+
+    try:
+        payload = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be JSON or CSV")
+
+    if isinstance(payload, dict):
+        payload = payload.get("clinics")
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Expected a list of clinics")
+
+    return payload
+
+
+@router.post("/clinics/bulk", summary="Register many clinics and queue their invitations")
+async def register_clinics_bulk_endpoint(
+    request: Request,
+    db=Depends(get_db),
+    ngo_obj: NGO = Depends(get_current_ngo),
+):
+    rows = await _read_clinic_rows(request)
+
+    if len(rows) > settings.CLINIC_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.CLINIC_BULK_MAX_ROWS} clinics per upload"
+        )
+
+    clinics, rejected = [], []
+    for index, row in enumerate(rows, start=1):
+        if isinstance(row, dict):
+            # empty CSV cells mean "not provided"
+            row = {
+                key.strip(): value.strip() if isinstance(value, str) else value
+                for key, value in row.items()
+                if key and value not in ("", None)
+            }
+        try:
+            clinics.append(ClinicCreate.model_validate(row).model_dump())
+        except ValidationError as e:
+            rejected.append({
+                "row": index,
+                "errors": [
+                    {"field": ".".join(map(str, err["loc"])), "message": err["msg"]}
+                    for err in e.errors()
+                ],
+            })
+
+    result = await register_clinics_bulk(db, ngo_obj, clinics)
+    result["rejected"] = rejected
+    return result
+
+
 
 # @router.post("/clinic-needs")
 # async def create_need(
@@ -131,68 +213,101 @@ async def accept_donation_endpoint(
 
 @router.get("/donations/available")
 async def list_available_donations(
+    request: Request,
+    page: PageParams = Depends(),
     db: AsyncSession = Depends(get_db),
     ngo = Depends(require_role("NGO"))
 ):
-    return await get_available_donations(db)
+    return await cached_json(
+        request,
+        ngo,
+        [DONATIONS_AVAILABLE_TAG],
+        lambda: get_available_donations(db, page),
+    )
 
-@router.get("/dashboard/data")
+@router.get("/dashboard/data", response_model=NGODashboardData)
 async def ngo_dashboard_data(
     db: AsyncSession = Depends(get_db),
     ngo = Depends(require_role("NGO"))
 ):
     return {
-        "accepted_donations": await get_accepted_donations(db, ngo),
-        "clinic_requirements": await get_clinic_requirements(db, ngo),
+        "accepted_donations": await get_accepted_donations(db, ngo["ngo_id"]),
+        "clinic_requirements": await get_clinic_requirements(db, ngo["ngo_id"]),
     }
 
 @router.post("/donations/allocate")
 async def allocate_donation_endpoint(
+    request: Request,
     payload: AllocationCreate,
     db: AsyncSession = Depends(get_db),
     ngo = Depends(require_role("NGO"))
 ):
-    return await allocate_donation(
+    return await idempotent_json(
+        request,
         db,
         ngo,
-        payload.donation_id,
-        payload.clinic_requirement_id
-
+        lambda: allocate_donation(
+            db,
+            ngo,
+            payload.donation_id,
+            payload.clinic_requirement_id
+        ),
     )
 
-@router.post("/donations/allocate")
-async def allocate_donation(
+@router.post("/donations/allocate/quantities")
+async def allocate_donation_quantities(
+    request: Request,
     data: AllocateDonationRequest,
     db: AsyncSession = Depends(get_db),
+    ngo = Depends(require_role("NGO"))
 ):
     """
-    NGO allocates donation against clinic requirements
+    NGO allocates donation quantities against clinic requirements
     """
+    return await idempotent_json(
+        request, db, ngo, lambda: _allocate_quantities(db, ngo["ngo_id"], data)
+    )
+
+
+async def _allocate_quantities(db: AsyncSession, ngo_id: int, data: AllocateDonationRequest):
+    clinic_ids = set()
+    allocations = []
+    skipped = []
 
     for item in data.allocations:
+        # decrement only if enough is still open, in one statement:
+        # concurrent allocations can't take the same units twice
+        remaining = ClinicRequirements.confirmed_quantity - item.allocate_quantity
         result = await db.execute(
-            select(ClinicRequirements).where(
+            update(ClinicRequirements)
+            .where(
                 ClinicRequirements.id == item.clinic_requirement_id,
+                ClinicRequirements.clinic_id.in_(
+                    select(Clinic.id).where(Clinic.ngo_id == ngo_id)
+                ),
                 ClinicRequirements.status == "CONFIRMED",
+                ClinicRequirements.confirmed_quantity >= item.allocate_quantity,
+            )
+            .values(
+                confirmed_quantity=remaining,
+                # mark allocated if fulfilled
+                status=case((remaining <= 0, "ALLOCATED"), else_=ClinicRequirements.status),
             )
+            .returning(ClinicRequirements.id, ClinicRequirements.clinic_id)
         )
-        req = result.scalar_one_or_none()
+        req = result.one_or_none()
         if not req:
+            skipped.append(item.clinic_requirement_id)
             continue
 
-        # allocate
-        req.confirmed_quantity -= item.allocate_quantity
-
-        # mark allocated if fulfilled
-        if req.confirmed_quantity <= 0:
-            req.status = "ALLOCATED"
-
         allocation = DonationAllocations(
             donation_id=data.donation_id,
             clinic_requirement_id=req.id,
             allocated_quantity=item.allocate_quantity,
         )
         db.add(allocation)
+        allocations.append(allocation)
+        clinic_ids.add(req.clinic_id)
 #     audit = write_to_blockchain(
 #     action="NGO_ALLOCATION",
 #     payload={
@@ -204,29 +319,92 @@ async def allocate_donation(
 #     allocation.blockchain_tx = audit["tx_hash"]
 #     allocation.blockchain_hash = audit["record_hash"]
 
-    await db.commit()
+    # audit rows are anchored in the background; blockchain_tx is
+    # backfilled once the batch is mined
+    await db.flush()
+    for allocation in allocations:
+        record = record_audit_event(
+            db,
+            "NGO_ALLOCATION",
+            "DONATION_ALLOCATION",
+            allocation,
+        )
+        allocation.blockchain_hash = record.record_hash
+
+    await refresh_dashboard_rollups(db, clinic_ids=clinic_ids)
+    # committed by idempotent_json, together with the stored response
 
     return {
         "message": "Donation allocated successfully",
         "status": "ALLOCATION_COMPLETED",
+        "skipped_requirement_ids": skipped,
     }
+
+@router.get("/allocations/plan", summary="Proposed allocation of accepted donations to open clinic requirements")
+async def allocation_plan_endpoint(
+    db: AsyncSession = Depends(get_db),
+    ngo = Depends(require_role("NGO"))
+):
+    return await plan_allocations(db, ngo["ngo_id"])
+
+
+@router.post("/allocations/apply", summary="Apply an allocation plan in one transaction")
+async def apply_allocation_plan_endpoint(
+    request: Request,
+    data: ApplyAllocationPlanRequest,
+    db: AsyncSession = Depends(get_db),
+    ngo = Depends(require_role("NGO"))
+):
+    return await idempotent_json(
+        request,
+        db,
+        ngo,
+        lambda: apply_allocation_plan(db, ngo["ngo_id"], data.allocations),
+    )
+
+
 from app.ngo.schema import ForwardDonationRequest
 
 @router.post("/donations/forward")
 async def forward_donation_to_clinic(
+    request: Request,
     data: ForwardDonationRequest,
     db: AsyncSession = Depends(get_db),
+    ngo = Depends(require_role("NGO"))
 ):
-    donation = await db.get(Donation, data.donation_id)
+    return await idempotent_json(
+        request, db, ngo, lambda: _forward_donation(db, ngo["ngo_id"], data)
+    )
 
-    if not donation:
-        raise HTTPException(status_code=404, detail="Donation not found")
 
-    if donation.status != "AUTHORIZED":
+async def _forward_donation(db: AsyncSession, ngo_id: int, data: ForwardDonationRequest):
+    clinic = await db.get(Clinic, data.clinic_id)
+    if clinic is None or clinic.ngo_id != ngo_id:
+        raise HTTPException(status_code=404, detail="Clinic not found")
+
+    # accepted by this NGO, or still unclaimed → FORWARDED in one
+    # statement; a second forward finds nothing
+    result = await db.execute(
+        update(Donation)
+        .where(Donation.id == data.donation_id)
+        .where(
+            or_(
+                and_(Donation.status == "ACCEPTED", Donation.ngo_id == ngo_id),
+                and_(Donation.status == "AUTHORIZED", Donation.ngo_id.is_(None)),
+            )
+        )
+        .values(status="FORWARDED", ngo_id=ngo_id)
+        .returning(Donation)
+    )
+    donation = result.scalar_one_or_none()
+
+    if not donation:
+        existing = await db.get(Donation, data.donation_id)
+        if existing is None or existing.ngo_id not in (None, ngo_id):
+            raise HTTPException(status_code=404, detail="Donation not found")
         raise HTTPException(status_code=400, detail="Donation already used")
 
-    donation.clinic_id = data.clinic_id
-    donation.status = "FORWARDED"
+    invalidate_on_commit(db, DONATIONS_AVAILABLE_TAG)
 #     await db.execute(
 #     update(ClinicRequirements)
 #     .where(
@@ -241,7 +419,12 @@ async def forward_donation_to_clinic(
         .values(status="ALLOCATED")
     )
 
-    await db.commit()
+    await refresh_dashboard_rollups(
+        db,
+        clinic_ids=[data.clinic_id],
+        company_ids=[donation.company_id],
+    )
+    # committed by idempotent_json, together with the stored response
 
     return {
         "message": "Donation forwarded to clinic successfully",
@@ -283,11 +466,8 @@ async def ngo_view_confirmed_requirements(
         "clinics": [],
     })
 
-    print("Debugging bucket and file paths:")
-
     for req, bucket, path in rows:
         key = req.asset_name.lower()
-        print(f"Processing requirement: {req.id}, bucket: {bucket}, path: {path}")
 
         proof_url = None
         if bucket and path:
@@ -311,22 +491,15 @@ async def ngo_view_confirmed_requirements(
 
 @router.get("/dashboard")
 async def ngo_dashboard(
+    request: Request,
     db: AsyncSession = Depends(get_db),
+    ngo = Depends(require_role("NGO"))
 ):
-    result = await db.execute(
-        select(ClinicRequirements)
-    )
-    rows = result.scalars().all()
-
-    confirmed = len([r for r in rows if r.status == "CONFIRMED"])
-    allocated = len([r for r in rows if r.status == "ALLOCATED"])
-    emergency = len([r for r in rows if r.priority == "EMERGENCY"])
-
-    return {
-        "kpis": {
-            "confirmed_needs": confirmed,
-            "allocated_needs": allocated,
-            "emergency_cases": emergency,
-            "pending_allocations": confirmed - allocated,
+    async def build():
+        return {
+            "kpis": await get_dashboard_kpis(db, NGO_TENANT, ngo["ngo_id"])
         }
-    }
+
+    return await cached_json(
+        request, ngo, [tenant_tag(NGO_TENANT, ngo["ngo_id"])], build
+    )
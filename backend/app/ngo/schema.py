@@ -41,6 +41,39 @@ class DonationAllocationResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class AcceptedDonationResponse(BaseModel):
+    id: int
+    company_id: int
+    item_name: str
+    quantity: int
+    purpose: str
+    status: str
+    authorized_at: datetime | None = None
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class ClinicRequirementResponse(BaseModel):
+    id: int
+    clinic_id: int
+    item_name: str
+    quantity: int
+    purpose: str
+    priority: int
+    status: str | None = None
+    created_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
+
+
+class NGODashboardData(BaseModel):
+    accepted_donations: List[AcceptedDonationResponse]
+    clinic_requirements: List[ClinicRequirementResponse]
+
+
 class AllocationCreate(BaseModel):
     donation_id: int
     clinic_requirement_id: int
@@ -56,6 +89,16 @@ class AllocateDonationRequest(BaseModel):
     allocations: List[AllocationItem]
 
 
+class AllocationPlanItem(BaseModel):
+    donation_id: int
+    clinic_requirement_id: int
+    quantity: int = Field(..., gt=0)
+
+
+class ApplyAllocationPlanRequest(BaseModel):
+    allocations: List[AllocationPlanItem] = Field(..., min_length=1)
+
+
 class ForwardDonationRequest(BaseModel):
     donation_id: int
     clinic_id: int
@@ -1,5 +1,4 @@
-from fastapi.concurrency import run_in_threadpool
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.trusted_ngo import TrustedNGO
 from app.models.ngo import NGO
@@ -9,9 +8,12 @@ from app.models.ngo import NGO
 from app.models.donation import Donation
 from app.models.company import Company
 from app.models.donation_allocation import DonationAllocation
-from app.blockchain.service import log_to_blockchain
+from app.blockchain.service import record_audit_event, audit_receipt
 from app.core.id_generator import generate_uid
 from app.services.storage_service import upload_org_document
+from app.services.rollup_service import refresh_dashboard_rollups
+from app.core.cache import invalidate_on_commit, DONATIONS_AVAILABLE_TAG
+from app.core.pagination import PageParams, paginate, project
 
 
 
@@ -182,13 +184,86 @@ async def check_ngo_acceptance_eligibility(
 
 import uuid
 from datetime import datetime, timedelta
+from sqlalchemy import func, insert
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.clinic import Clinic
 from app.models.clinic_invitation import ClinicInvitation
 from app.auth.invitation_token import create_clinic_invite_token
-from app.notifications.email_service import send_clinic_invitation_email
+from app.notifications.outbox import enqueue_bulk
 from app.core.config import settings
 
 
+CLINIC_INVITE_TTL = timedelta(minutes=30)
+
+
+async def existing_clinic_emails(db: AsyncSession, emails) -> set[str]:
+    """
+    Lower-cased official emails, among `emails`, that already belong to a clinic.
+    """
+    emails = {email.strip().lower() for email in emails}
+    if not emails:
+        return set()
+
+    result = await db.execute(
+        select(func.lower(Clinic.official_email))
+        .where(func.lower(Clinic.official_email).in_(emails))
+    )
+    return set(result.scalars())
+
+
+async def create_clinics_with_invitations(db: AsyncSession, ngo, clinics: list[dict]):
+    """
+    Insert clinics and their invitations in two bulk statements and queue
+    the invitation emails. Runs inside the caller's transaction.
+    """
+    now = datetime.utcnow()
+    invitations = []
+    recipients = []
+
+    for clinic in clinics:
+        clinic_email = clinic["official_email"]
+        reference_id = f"INV-CLINIC-{now.year}-{uuid.uuid4().hex[:6].upper()}"
+        token = create_clinic_invite_token(
+            ngo_id=ngo.id,
+            clinic_email=clinic_email
+        )
+
+        invitations.append({
+            "reference_id": reference_id,
+            "ngo_id": ngo.id,
+            "clinic_email": clinic_email,
+            "token": token,
+            "expires_at": now + CLINIC_INVITE_TTL,
+        })
+        recipients.append((clinic_email, {
+            "clinic_name": clinic["clinic_name"],
+            "ngo_name": ngo.ngo_name,
+            "csr1_number": ngo.csr_1_number,
+            "invite_link": f"{settings.FRONTEND_URL}/static/set-clinic-password.html?token={token}",
+            "reference_id": reference_id,
+        }))
+
+    await db.execute(
+        insert(Clinic),
+        [
+            {**clinic, "ngo_id": ngo.id, "is_active": False}
+            for clinic in clinics
+        ],
+    )
+    await db.execute(insert(ClinicInvitation), invitations)
+
+    enqueue_bulk(db, "clinic_invitation", recipients)
+
+    return [
+        {
+            "official_email": invitation["clinic_email"],
+            "invitation_reference": invitation["reference_id"],
+        }
+        for invitation in invitations
+    ]
+
+
 async def register_clinic(
     db: AsyncSession,
     ngo,
@@ -203,70 +278,65 @@ async def register_clinic(
     Register clinic and send secure invitation email.
     NGO must be verified.
     """
-    existing = await db.execute(
-        select(Clinic).where(Clinic.official_email == clinic_email)
-    )
-    # if existing.scalar_one_or_none():
-    #     raise HTTPException(
-    #         status_code=400,
-    #         detail="Clinic already registered"
-    #     )
-
-    # 2️⃣ CREATE clinic row (THIS WAS MISSING)
-    clinic = Clinic(
-        clinic_name=clinic_name,
-        official_email=clinic_email,
-        ngo_id=ngo.id,
-        facility_id=facility_id,
-        facility_id_type=facility_id_type,
-        doctor_registration_number=doctor_registration_number,
-        pincode=pincode,
-        is_active=False
-    )
-    db.add(clinic)
-    await db.commit()
-    await db.refresh(clinic)
-
-    reference_id = f"INV-CLINIC-{datetime.utcnow().year}-{uuid.uuid4().hex[:6].upper()}"
-
-    token = create_clinic_invite_token(
-        ngo_id=ngo.id,
-        clinic_email=clinic_email
-    )
-
-    invitation = ClinicInvitation(
-        reference_id=reference_id,
-        ngo_id=ngo.id,
-        clinic_email=clinic_email,
-        token=token,
-        expires_at=datetime.utcnow() + timedelta(minutes=30)
-    )
+    if await existing_clinic_emails(db, [clinic_email]):
+        raise HTTPException(
+            status_code=400,
+            detail="Clinic already registered"
+        )
 
-    db.add(invitation)
+    created = await create_clinics_with_invitations(db, ngo, [{
+        "clinic_name": clinic_name,
+        "official_email": clinic_email,
+        "facility_id": facility_id,
+        "facility_id_type": facility_id_type,
+        "doctor_registration_number": doctor_registration_number,
+        "pincode": pincode,
+    }])
     await db.commit()
 
-    if clinic.ngo_id != ngo.id:
-     raise HTTPException(
-        status_code=403,
-        detail="Clinic does not belong to this NGO"
-    )
+    return {
+        "message": "Clinic invitation sent successfully",
+        "invitation_reference": created[0]["invitation_reference"]
+    }
 
-    print("TOken:", token)
-    invite_link = f"{settings.FRONTEND_URL}/static/set-clinic-password.html?token={token}"
 
-    await send_clinic_invitation_email(
-        to_email=clinic_email,
-        clinic_name=clinic_name,
-        ngo_name=ngo.ngo_name,
-        csr1_number=ngo.csr_1_number,
-        invite_link=invite_link,
-        reference_id=reference_id
-    )
-    
+async def register_clinics_bulk(db: AsyncSession, ngo, clinics: list[dict]):
+    """
+    Register many clinics in one transaction.
+    Rows whose email is repeated in the upload or already registered
+    are skipped and reported back.
+    """
+    skipped = []
+    unique = {}
+
+    for clinic in clinics:
+        key = clinic["official_email"].strip().lower()
+        if key in unique:
+            skipped.append({"official_email": clinic["official_email"], "reason": "Duplicate in upload"})
+        else:
+            unique[key] = clinic
+
+    existing = await existing_clinic_emails(db, unique.keys())
+    for key in existing:
+        skipped.append({"official_email": unique.pop(key)["official_email"], "reason": "Clinic already registered"})
+
+    created = []
+    if unique:
+        created = await create_clinics_with_invitations(db, ngo, list(unique.values()))
+
+        try:
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail="Some clinics were registered concurrently, retry the upload"
+            )
 
     return {
-        "message": "Clinic invitation sent successfully",
-        "invitation_reference": reference_id
+        "created": len(created),
+        "invitations": created,
+        "skipped": skipped,
     }
 
 from sqlalchemy import select
@@ -367,24 +437,29 @@ async def accept_csr_donation(db, payload, donation_id: int):
     """
     
     ngo_id = payload.get("ngo_id")
-    donation = await db.get(Donation, donation_id)
 
-    if not donation:
-        raise HTTPException(404, "Donation not found")
+    # claim the donation in one statement so two NGOs can't both accept it
+    result = await db.execute(
+        update(Donation)
+        .where(Donation.id == donation_id)
+        .where(Donation.status == "AUTHORIZED")
+        .values(status="ACCEPTED", ngo_id=ngo_id)
+        .returning(Donation)
+    )
+    donation = result.scalar_one_or_none()
 
-    if donation.status != "AUTHORIZED":
+    if not donation:
+        if await db.get(Donation, donation_id) is None:
+            raise HTTPException(404, "Donation not found")
         raise HTTPException(400, "Donation already processed")
 
-    donation.status = "ACCEPTED"
-    donation.ngo_id = ngo_id
-
-    await db.commit()
-    await db.refresh(donation)
-    audit = await run_in_threadpool(
-        log_to_blockchain,
-        "DONATION_CREATED",
-        str(donation.id)
+    await refresh_dashboard_rollups(db, company_ids=[donation.company_id])
+    invalidate_on_commit(db, DONATIONS_AVAILABLE_TAG)
+    record = record_audit_event(
+        db, "DONATION_ACCEPTED", "DONATION", donation, {"ngo_id": ngo_id}
     )
+    await db.commit()
+    audit = audit_receipt(record)
 
 
     return {
@@ -400,60 +475,78 @@ async def accept_csr_donation(db, payload, donation_id: int):
 from sqlalchemy import select
 from app.models.donation import Donation
 
-async def get_available_donations(db: AsyncSession):
+AVAILABLE_DONATION_FIELDS = {
+    column.name: column for column in Donation.__table__.columns
+}
+
+
+async def get_available_donations(db: AsyncSession, page: PageParams):
     """
-    Return donations that are not yet accepted by any NGO
+    Return one page of donations that are not yet accepted by any NGO
     """
-    result = await db.execute(
-        select(Donation)
+    return await paginate(
+        db,
+        select(*project(AVAILABLE_DONATION_FIELDS, page.fields))
         .where(Donation.ngo_id.is_(None))
-        .where(Donation.status == "AUTHORIZED")
-        .order_by(Donation.created_at.desc())
+        .where(Donation.status == "AUTHORIZED"),
+        (Donation.created_at, Donation.id),
+        page,
     )
 
-    return result.scalars().all()
-
-async def get_accepted_donations(db, ngo):
+async def get_accepted_donations(db, ngo_id: int):
     result = await db.execute(
         select(Donation)
-        .where(Donation.ngo_id == ngo)
+        .where(Donation.ngo_id == ngo_id)
         .where(Donation.status == "ACCEPTED")
     )
     return result.scalars().all()
 
-async def get_clinic_requirements(db, ngo):
+async def get_clinic_requirements(db, ngo_id: int):
     result = await db.execute(
         select(ClinicRequirement)
-        .where(ClinicRequirement.ngo_id == ngo)
+        .where(ClinicRequirement.ngo_id == ngo_id)
         .order_by(ClinicRequirement.priority.desc())
     )
     return result.scalars().all()
 
 
 async def allocate_donation(db, payload, donation_id, clinic_requirement_id):
-    donation = await db.get(Donation, donation_id)
-    requirement = await db.get(ClinicRequirement, clinic_requirement_id)
     ngo_id = payload.get("ngo_id")
-    if not donation or donation.status != "ACCEPTED":
-        raise HTTPException(400, "Donation not eligible")
-    print("NGO:", ngo_id)
-    if requirement.ngo_id != ngo_id:
+    requirement = await db.get(ClinicRequirement, clinic_requirement_id)
+    if not requirement or requirement.ngo_id != ngo_id:
         raise HTTPException(403, "Invalid clinic requirement")
 
+    # ACCEPTED → ALLOCATED in one statement: of two concurrent
+    # allocations of the same donation only one matches
+    result = await db.execute(
+        update(Donation)
+        .where(Donation.id == donation_id)
+        .where(Donation.ngo_id == ngo_id)
+        .where(Donation.status == "ACCEPTED")
+        .values(status="ALLOCATED")
+        .returning(Donation)
+    )
+    donation = result.scalar_one_or_none()
+    if not donation:
+        raise HTTPException(400, "Donation not eligible")
+
     allocation = DonationAllocation(
         donation_id=donation.id,
         clinic_requirement_id=requirement.id
     )
 
-    donation.status = "ALLOCATED"
-
     db.add(allocation)
-    await db.commit()
-    await db.refresh(allocation)
-    audit = await run_in_threadpool(
-        log_to_blockchain,
+    await refresh_dashboard_rollups(db, company_ids=[donation.company_id])
+    record = record_audit_event(
+        db,
         "DONATION_ALLOCATED",
-        str(donation.id)
+        "DONATION",
+        donation,
+        {"clinic_requirement_id": requirement.id},
     )
+    # committed by idempotent_json, together with the stored response
+    await db.flush()
+    await db.refresh(allocation)
+    audit = audit_receipt(record)
 
     return { "allocation": allocation, "audit": audit }
\ No newline at end of file
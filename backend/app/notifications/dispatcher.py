@@ -0,0 +1,103 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models.email_outbox import EmailOutbox
+from app.notifications.outbox import outbox_wakeup
+from app.notifications.transport import build_message, email_transport
+
+logger = logging.getLogger(__name__)
+
+
+def _schedule_retry(row: EmailOutbox, exc: Exception, now: datetime):
+    row.attempts += 1
+    row.last_error = str(exc)[:500]
+
+    if row.attempts >= settings.EMAIL_MAX_ATTEMPTS:
+        row.status = "FAILED"
+        return
+
+    delay = min(
+        settings.EMAIL_RETRY_BASE_SECONDS * 2 ** (row.attempts - 1),
+        settings.EMAIL_RETRY_MAX_SECONDS,
+    )
+    row.next_attempt_at = now + timedelta(seconds=delay)
+
+
+async def dispatch_batch(session_factory, transport) -> int:
+    """
+    Deliver one batch of due messages. Rows are locked with
+    SKIP LOCKED so several workers can run a dispatcher side by side.
+    """
+    async with session_factory() as db:
+        now = datetime.now(timezone.utc)
+
+        result = await db.execute(
+            select(EmailOutbox)
+            .where(
+                EmailOutbox.status == "PENDING",
+                EmailOutbox.next_attempt_at <= now,
+            )
+            .order_by(EmailOutbox.id)
+            .limit(settings.EMAIL_BATCH_SIZE)
+            .with_for_update(skip_locked=True)
+        )
+        rows = result.scalars().all()
+        if not rows:
+            return 0
+
+        outcomes = await asyncio.gather(
+            *(
+                transport.send(
+                    build_message(row.to_email, row.subject, row.body, row.body_html)
+                )
+                for row in rows
+            ),
+            return_exceptions=True,
+        )
+
+        for row, outcome in zip(rows, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(
+                    "Email send failed: %s", outcome,
+                    extra={"email_id": row.id, "attempt": row.attempts + 1},
+                )
+                _schedule_retry(row, outcome, now)
+            else:
+                row.status = "SENT"
+                row.attempts += 1
+                row.sent_at = datetime.now(timezone.utc)
+
+        await db.commit()
+        return len(rows)
+
+
+async def run_email_dispatcher(session_factory, transport=None):
+    """
+    Background loop started on application startup.
+    Drains the outbox, then sleeps until woken by a commit or the
+    poll interval elapses.
+    """
+    transport = transport or email_transport
+
+    while True:
+        outbox_wakeup.clear()
+
+        try:
+            sent = await dispatch_batch(session_factory, transport)
+        except Exception:
+            logger.exception("Email dispatcher failed")
+            sent = 0
+
+        if sent >= settings.EMAIL_BATCH_SIZE:
+            continue
+
+        try:
+            await asyncio.wait_for(
+                outbox_wakeup.wait(), settings.EMAIL_POLL_INTERVAL
+            )
+        except asyncio.TimeoutError:
+            pass
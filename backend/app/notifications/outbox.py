@@ -0,0 +1,64 @@
+import asyncio
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.email_outbox import EmailOutbox
+from app.notifications.templating import render_email
+
+# Set after a commit that enqueued mail, so the dispatcher does not
+# wait for its next poll.
+outbox_wakeup = asyncio.Event()
+
+
+def enqueue_email(
+    db,
+    to_email: str,
+    subject: str,
+    body: str,
+    body_html: str | None = None,
+) -> EmailOutbox:
+    """
+    Queue an email as part of the caller's transaction.
+    Nothing is sent unless the transaction commits.
+    """
+    message = EmailOutbox(
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        body_html=body_html,
+        status="PENDING",
+        attempts=0,
+    )
+    db.add(message)
+    db.info["outbox_pending"] = True
+    return message
+
+
+def enqueue_template(db, to_email: str, template_name: str, **context) -> EmailOutbox:
+    rendered = render_email(template_name, **context)
+    return enqueue_email(
+        db, to_email, rendered.subject, rendered.text, rendered.html
+    )
+
+
+def enqueue_bulk(db, template_name: str, recipients) -> list[EmailOutbox]:
+    """
+    Render one template for many recipients and queue them in one pass.
+    `recipients` is an iterable of (to_email, context) pairs.
+    """
+    return [
+        enqueue_template(db, to_email, template_name, **context)
+        for to_email, context in recipients
+    ]
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    if session.info.pop("outbox_pending", False):
+        outbox_wakeup.set()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_wakeup(session, previous_transaction):
+    session.info.pop("outbox_pending", None)
@@ -0,0 +1,72 @@
+import html
+from dataclasses import dataclass
+from pathlib import Path
+from string import Template
+
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    subject: str
+    text: str
+    html: str
+
+
+class EmailTemplate:
+    """
+    A text + HTML email pair, read and compiled once at import.
+    HTML placeholders are escaped, text placeholders are not.
+    """
+
+    def __init__(self, name: str, subject: str, layout: str):
+        self.name = name
+        self.subject = Template(subject)
+        self.text = Template((TEMPLATE_DIR / f"{name}.txt").read_text())
+
+        content = (TEMPLATE_DIR / f"{name}.html").read_text()
+        self.html = Template(layout.replace("$content", content))
+
+    def render(self, **context) -> RenderedEmail:
+        escaped = {
+            key: html.escape(str(value), quote=True)
+            for key, value in context.items()
+        }
+        return RenderedEmail(
+            subject=self.subject.substitute(context),
+            text=self.text.substitute(context),
+            html=self.html.substitute(escaped),
+        )
+
+
+_LAYOUT = (TEMPLATE_DIR / "_layout.html").read_text()
+
+TEMPLATES = {
+    template.name: template
+    for template in (
+        EmailTemplate(
+            "clinic_invitation",
+            "Invitation to join CSR HealthTrace as a Registered Clinic",
+            _LAYOUT,
+        ),
+        EmailTemplate(
+            "csr_password_setup",
+            "Set your password – CSR HealthTrace",
+            _LAYOUT,
+        ),
+        EmailTemplate(
+            "ngo_password_setup",
+            "Set your password – CSR HealthTrace (NGO)",
+            _LAYOUT,
+        ),
+        EmailTemplate(
+            "reset_password",
+            "Reset your password",
+            _LAYOUT,
+        ),
+    )
+}
+
+
+def render_email(template_name: str, **context) -> RenderedEmail:
+    return TEMPLATES[template_name].render(**context)
@@ -0,0 +1,179 @@
+import asyncio
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+from app.core.config import settings
+from app.core.metrics import span, traced
+
+
+def build_message(
+    to_email: str,
+    subject: str,
+    text: str,
+    html: str | None = None,
+) -> EmailMessage:
+    """
+    The one place outgoing messages are assembled.
+    With `html` the message is multipart/alternative.
+    """
+    msg = EmailMessage()
+    msg["From"] = f"{settings.EMAIL_FROM_NAME} <{settings.EMAIL_FROM_ADDRESS}>"
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg.set_content(text)
+
+    if html:
+        msg.add_alternative(html, subtype="html")
+
+    return msg
+
+
+# ----------------------------------------
+# SMTP transport (connection pool)
+# ----------------------------------------
+
+class SMTPTransport:
+    """
+    Keeps up to `size` authenticated SMTP connections open and reuses
+    them across messages. smtplib is blocking, so every network call
+    runs on a dedicated executor, never on the event loop.
+
+    security: "ssl" (implicit TLS), "starttls" or "none".
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        login: str | None,
+        password: str | None,
+        security: str = "starttls",
+        size: int = 2,
+        idle_timeout: int = 60,
+        timeout: int = 30,
+    ):
+        self.host = host
+        self.port = port
+        self.login = login
+        self.password = password
+        self.security = security
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = []
+        self._slots = asyncio.Semaphore(size)
+        self._executor = ThreadPoolExecutor(
+            max_workers=size, thread_name_prefix="smtp"
+        )
+
+    @traced("smtp", "connect")
+    def _connect(self):
+        if self.security == "ssl":
+            conn = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            conn = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == "starttls":
+                conn.starttls()
+
+        if self.login:
+            conn.login(self.login, self.password)
+        return conn
+
+    @staticmethod
+    def _quit(conn):
+        try:
+            conn.quit()
+        except Exception:
+            conn.close()
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def _acquire(self):
+        while self._idle:
+            conn, last_used = self._idle.pop()
+            if time.monotonic() - last_used < self.idle_timeout:
+                return conn
+            self._executor.submit(self._quit, conn)
+
+        return await self._run(self._connect)
+
+    def _release(self, conn):
+        self._idle.append((conn, time.monotonic()))
+
+    async def send(self, message: EmailMessage):
+        async with self._slots:
+            with span("smtp", "send"):
+                await self._send(message)
+
+    async def _send(self, message: EmailMessage):
+        conn = await self._acquire()
+        try:
+            try:
+                await self._run(conn.send_message, message)
+            except smtplib.SMTPServerDisconnected:
+                # pooled connection went stale: reconnect once
+                self._executor.submit(self._quit, conn)
+                conn = await self._run(self._connect)
+                await self._run(conn.send_message, message)
+
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # the server rejected this message, the session is still usable
+            self._release(conn)
+            raise
+        except Exception:
+            self._executor.submit(self._quit, conn)
+            raise
+
+        self._release(conn)
+
+    async def close(self):
+        while self._idle:
+            conn, _ = self._idle.pop()
+            await self._run(self._quit, conn)
+
+
+# ----------------------------------------
+# In-memory transport
+# ----------------------------------------
+
+class MemoryTransport:
+    """
+    Keeps sent messages in a list. For local runs and tests.
+    """
+
+    def __init__(self):
+        self.outbox = []
+
+    async def send(self, message: EmailMessage):
+        self.outbox.append(message)
+
+    async def close(self):
+        pass
+
+
+def _smtp_security() -> str:
+    if settings.EMAIL_SMTP_SECURITY != "auto":
+        return settings.EMAIL_SMTP_SECURITY
+    return "ssl" if settings.BREVO_SMTP_PORT == 465 else "starttls"
+
+
+def create_transport():
+    if settings.EMAIL_TRANSPORT == "memory":
+        return MemoryTransport()
+
+    return SMTPTransport(
+        settings.BREVO_SMTP_SERVER,
+        settings.BREVO_SMTP_PORT,
+        settings.BREVO_SMTP_LOGIN,
+        settings.BREVO_SMTP_KEY,
+        security=_smtp_security(),
+        size=settings.EMAIL_POOL_SIZE,
+        idle_timeout=settings.EMAIL_CONNECTION_IDLE_TIMEOUT,
+        timeout=settings.EMAIL_TIMEOUT,
+    )
+
+
+email_transport = create_transport()
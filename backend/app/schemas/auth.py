@@ -7,3 +7,12 @@ class LoginRequest(BaseModel):
 class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
+
+class Principal(BaseModel):
+    """Authenticated caller, built from verified access-token claims."""
+    sub: str
+    role: str
+    company_id: int | None = None
+    ngo_id: int | None = None
+    clinic_id: int | None = None
+    exp: int | None = None
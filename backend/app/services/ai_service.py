@@ -40,7 +40,6 @@ from datetime import date, timedelta
 from app.models.clinic_uploads import ClinicUpload
 from app.models.ocr_extracted_data import OCRExtractedData
 from app.models.clinic_requirments import ClinicRequirements
-from app.blockchain.audit_chain import write_to_blockchain
 
 
 
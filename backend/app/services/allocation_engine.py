@@ -0,0 +1,182 @@
+import heapq
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+
+# Units of an EMERGENCY requirement are filled before any HIGH unit, and
+# so on down. Unknown priorities count as NORMAL.
+PRIORITY_WEIGHTS = {
+    "EMERGENCY": 3,
+    "HIGH": 2,
+    "NORMAL": 1,
+    "LOW": 0,
+}
+
+
+@dataclass(frozen=True)
+class Supply:
+    donation_id: int
+    asset: str
+    quantity: int
+
+
+@dataclass(frozen=True)
+class Demand:
+    requirement_id: int
+    clinic_id: int
+    asset: str
+    quantity: int
+    priority: str
+    created_at: datetime | None = None
+
+
+@dataclass(frozen=True)
+class PlannedAllocation:
+    donation_id: int
+    requirement_id: int
+    clinic_id: int
+    asset: str
+    quantity: int
+
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_asset_name(name: str) -> str:
+    """
+    "Paracetamol  500mg Tablets" and "paracetamol-500mg tablet" → the same key.
+    Lower case, punctuation to single spaces, naive singular.
+    """
+    words = _NON_WORD.sub(" ", name.lower()).split()
+    return " ".join(
+        w[:-1] if len(w) > 3 and w.endswith("s") and not w.endswith("ss") else w
+        for w in words
+    )
+
+
+def _demand_key(demand: Demand):
+    # highest weight first, then oldest request, then id for a stable order
+    return (
+        -PRIORITY_WEIGHTS.get(demand.priority, PRIORITY_WEIGHTS["NORMAL"]),
+        demand.created_at or datetime.max,
+        demand.requirement_id,
+    )
+
+
+# ----------------------------------------
+# Per-asset solvers
+# ----------------------------------------
+# Every unit of one asset is interchangeable, so filling demands in
+# priority order from the oldest donations first is an optimal
+# priority-weighted matching; both paths return the same plan.
+
+def _fill_heap(supplies: list[Supply], demands: list[Demand]) -> list[PlannedAllocation]:
+    heap = [(_demand_key(d), i) for i, d in enumerate(demands)]
+    heapq.heapify(heap)
+
+    plan = []
+    s, left = 0, supplies[0].quantity if supplies else 0
+
+    while heap and s < len(supplies):
+        _, i = heapq.heappop(heap)
+        demand = demands[i]
+        need = demand.quantity
+
+        while need > 0 and s < len(supplies):
+            take = min(need, left)
+            if take:
+                plan.append(PlannedAllocation(
+                    donation_id=supplies[s].donation_id,
+                    requirement_id=demand.requirement_id,
+                    clinic_id=demand.clinic_id,
+                    asset=demand.asset,
+                    quantity=take,
+                ))
+                need -= take
+                left -= take
+
+            if left == 0:
+                s += 1
+                left = supplies[s].quantity if s < len(supplies) else 0
+
+    return plan
+
+
+def _fill_vectorized(np, supplies: list[Supply], demands: list[Demand]) -> list[PlannedAllocation]:
+    """
+    Lay ordered demand and supply end to end as two number lines; every
+    segment between consecutive boundaries is one (donation, requirement)
+    allocation.
+    """
+    demands = sorted(demands, key=_demand_key)
+
+    d_end = np.cumsum([d.quantity for d in demands])
+    s_end = np.cumsum([s.quantity for s in supplies])
+    total = min(d_end[-1], s_end[-1])
+    if total <= 0:
+        return []
+
+    cuts = np.union1d(d_end, s_end)
+    cuts = np.concatenate(([0], cuts[cuts <= total]))
+    starts, lengths = cuts[:-1], np.diff(cuts)
+    starts, lengths = starts[lengths > 0], lengths[lengths > 0]
+
+    d_idx = np.searchsorted(d_end, starts, side="right")
+    s_idx = np.searchsorted(s_end, starts, side="right")
+
+    return [
+        PlannedAllocation(
+            donation_id=supplies[si].donation_id,
+            requirement_id=demands[di].requirement_id,
+            clinic_id=demands[di].clinic_id,
+            asset=demands[di].asset,
+            quantity=int(qty),
+        )
+        for di, si, qty in zip(d_idx.tolist(), s_idx.tolist(), lengths.tolist())
+    ]
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def solve_allocation(
+    supplies: list[Supply],
+    demands: list[Demand],
+    vectorize_from: int = 256,
+) -> list[PlannedAllocation]:
+    """
+    Match donation stock to requirements of the same (normalized) asset.
+
+    `supplies` are used in the order given (callers pass oldest first).
+    Assets with at least `vectorize_from` rows are solved with NumPy when
+    it is installed, smaller ones with a heap.
+    """
+    supply_by_asset = defaultdict(list)
+    for supply in supplies:
+        if supply.quantity > 0:
+            supply_by_asset[supply.asset].append(supply)
+
+    demand_by_asset = defaultdict(list)
+    for demand in demands:
+        if demand.quantity > 0:
+            demand_by_asset[demand.asset].append(demand)
+
+    np = _numpy()
+    plan = []
+    for asset, asset_demands in demand_by_asset.items():
+        asset_supplies = supply_by_asset.get(asset)
+        if not asset_supplies:
+            continue
+
+        if np is not None and len(asset_demands) + len(asset_supplies) >= vectorize_from:
+            plan.extend(_fill_vectorized(np, asset_supplies, asset_demands))
+        else:
+            plan.extend(_fill_heap(asset_supplies, asset_demands))
+
+    return plan
@@ -0,0 +1,136 @@
+from sqlalchemy import select, func, distinct
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.clinic import Clinic
+from app.models.clinic_requirments import ClinicRequirements
+from app.models.donation import Donation
+from app.models.donation_allocation import DonationAllocation
+
+
+# Donation statuses from NGO acceptance onwards
+DONATION_ACCEPTED_STATUSES = ("ACCEPTED", "ALLOCATED", "FORWARDED", "RECEIVED")
+
+
+# ---------------------------------------------------------
+# KPI column sets
+# Each dashboard is computed in ONE query using
+# COUNT(*) FILTER (WHERE ...) instead of loading rows.
+# ---------------------------------------------------------
+
+def clinic_kpi_columns():
+    return (
+        func.count().label("total_requirements"),
+        func.count().filter(
+            ClinicRequirements.status == "CONFIRMED"
+        ).label("confirmed"),
+        func.count().filter(
+            ClinicRequirements.status == "ALLOCATED"
+        ).label("allocated"),
+        func.count().filter(
+            ClinicRequirements.priority == "EMERGENCY"
+        ).label("emergency_cases"),
+    )
+
+
+def ngo_kpi_columns():
+    return (
+        func.count().filter(
+            ClinicRequirements.status == "CONFIRMED"
+        ).label("confirmed_needs"),
+        func.count().filter(
+            ClinicRequirements.status == "ALLOCATED"
+        ).label("allocated_needs"),
+        func.count().filter(
+            ClinicRequirements.priority == "EMERGENCY"
+        ).label("emergency_cases"),
+    )
+
+
+def csr_kpi_columns():
+    return (
+        func.count(distinct(Donation.id)).label("total_donations"),
+        func.count(distinct(Donation.id)).filter(
+            Donation.status.in_(DONATION_ACCEPTED_STATUSES)
+        ).label("donations_accepted"),
+        func.count(DonationAllocation.id).label("total_allocations"),
+        func.count(DonationAllocation.id).filter(
+            DonationAllocation.received.is_(True)
+        ).label("allocations_received"),
+        func.count(
+            distinct(DonationAllocation.clinic_requirement_id)
+        ).label("clinics_supported"),
+    )
+
+
+def platform_kpi_columns():
+    return (
+        func.count().label("total_requirements"),
+        func.count().filter(
+            ClinicRequirements.status == "CONFIRMED"
+        ).label("confirmed"),
+        func.count().filter(
+            ClinicRequirements.status == "ALLOCATED"
+        ).label("allocated"),
+    )
+
+
+# ---------------------------------------------------------
+# Tenant-scoped KPI queries
+# ---------------------------------------------------------
+
+async def get_clinic_kpis(db: AsyncSession, clinic_id: int) -> dict:
+    """
+    Requirement counters for a single clinic.
+    """
+    result = await db.execute(
+        select(*clinic_kpi_columns())
+        .select_from(ClinicRequirements)
+        .where(ClinicRequirements.clinic_id == clinic_id)
+    )
+    return dict(result.mappings().one())
+
+
+async def get_ngo_kpis(db: AsyncSession, ngo_id: int) -> dict:
+    """
+    Requirement counters across all clinics onboarded by the NGO.
+    """
+    result = await db.execute(
+        select(*ngo_kpi_columns())
+        .select_from(ClinicRequirements)
+        .join(Clinic, Clinic.id == ClinicRequirements.clinic_id)
+        .where(Clinic.ngo_id == ngo_id)
+    )
+    kpis = dict(result.mappings().one())
+    kpis["pending_allocations"] = (
+        kpis["confirmed_needs"] - kpis["allocated_needs"]
+    )
+    return kpis
+
+
+async def get_csr_kpis(db: AsyncSession, company_id: int) -> dict:
+    """
+    Donation and allocation counters for a CSR company.
+    Only allocations of the company's own donations are counted.
+    """
+    result = await db.execute(
+        select(*csr_kpi_columns())
+        .select_from(Donation)
+        .outerjoin(
+            DonationAllocation,
+            DonationAllocation.donation_id == Donation.id,
+        )
+        .where(Donation.company_id == company_id)
+    )
+    return dict(result.mappings().one())
+
+
+
+async def get_platform_kpis(db: AsyncSession) -> dict:
+    """
+    Platform-wide requirement counters (admin dashboard).
+    """
+    result = await db.execute(
+        select(*platform_kpi_columns())
+        .select_from(ClinicRequirements)
+    )
+    return dict(result.mappings().one())
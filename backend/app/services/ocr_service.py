@@ -1,13 +1,38 @@
-import cv2,re
-import numpy as np
-import pytesseract
-from PIL import Image
+import asyncio
+import io
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
 
+from fastapi.concurrency import run_in_threadpool
 
-def preprocess_image(pil_image: Image.Image):
+from app.core.config import settings
+from app.core.metrics import observe_span, traced
+
+# cv2, numpy, pytesseract, pdf2image and PIL are imported inside the
+# functions that need them: API workers that never OCR never load them,
+# and with OCR_WORKERS > 0 only the OCR processes do.
+
+
+def load_image(file_bytes: bytes, filename: str):
+    """
+    File bytes → PIL Image (first page for PDFs).
+    """
+    if filename.lower().endswith(".pdf"):
+        from pdf2image import convert_from_bytes
+        return convert_from_bytes(file_bytes, first_page=1, last_page=1)[0]
+
+    from PIL import Image
+    return Image.open(io.BytesIO(file_bytes))
+
+
+def preprocess_image(pil_image):
     """
     Convert image to OCR-friendly format
     """
+    import cv2
+    import numpy as np
+
     # Convert PIL → OpenCV
     img = np.array(pil_image)
 
@@ -25,18 +50,96 @@ def preprocess_image(pil_image: Image.Image):
     return thresh
 
 
-def ocr_image(pil_image: Image.Image) -> str:
-    processed = preprocess_image(pil_image)
+def recognize_text(processed) -> str:
+    """
+    Tesseract over an image from preprocess_image
+    """
+    import pytesseract
 
-    text = pytesseract.image_to_string(
+    return pytesseract.image_to_string(
         processed,
         config="--psm 6"  # Assume uniform text blocks
     )
 
+
+def ocr_file(file_bytes: bytes, filename: str) -> str:
+    """
+    Whole pipeline for one upload. Top-level so it can run in a worker process.
+    """
+    return ocr_file_timed(file_bytes, filename)[0]
+
+
+def ocr_file_timed(file_bytes: bytes, filename: str) -> tuple[str, dict]:
+    """
+    `ocr_file` plus per-stage durations. Metrics live in the API process,
+    so the worker returns its timings instead of recording them.
+    """
+    timings = {}
+
+    started = time.perf_counter()
+    image = load_image(file_bytes, filename)
+    timings["load"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    processed = preprocess_image(image)
+    timings["preprocess"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    text = recognize_text(processed)
+    timings["recognize"] = time.perf_counter() - started
+
+    return text, timings
+
+
+# ----------------------------------------
+# OCR worker processes
+# ----------------------------------------
+
+_ocr_pool = None
+
+
+def _get_ocr_pool() -> ProcessPoolExecutor:
+    global _ocr_pool
+    if _ocr_pool is None:
+        _ocr_pool = ProcessPoolExecutor(max_workers=settings.OCR_WORKERS)
+    return _ocr_pool
+
+
+async def run_ocr(file_bytes: bytes, filename: str) -> str:
+    """
+    OCR off the event loop: in the OCR process pool when OCR_WORKERS > 0,
+    otherwise in the thread pool of this worker.
+    """
+    started = time.perf_counter()
+    try:
+        if settings.OCR_WORKERS > 0:
+            loop = asyncio.get_running_loop()
+            text, timings = await loop.run_in_executor(
+                _get_ocr_pool(), ocr_file_timed, file_bytes, filename
+            )
+        else:
+            text, timings = await run_in_threadpool(ocr_file_timed, file_bytes, filename)
+    except Exception:
+        observe_span("ocr", "total", time.perf_counter() - started, "error")
+        raise
+
+    # total includes the wait for a free OCR process
+    observe_span("ocr", "total", time.perf_counter() - started)
+    for stage, seconds in timings.items():
+        observe_span("ocr", stage, seconds)
+
     return text
 
+
+def shutdown_ocr_pool():
+    global _ocr_pool
+    if _ocr_pool is not None:
+        _ocr_pool.shutdown(wait=False, cancel_futures=True)
+        _ocr_pool = None
+
 IGNORE_KEYWORDS = ["date", "total", "day", "total patients","date"]
 
+@traced("ocr", "parse")
 def parse_assets(text: str):
     results = []
 
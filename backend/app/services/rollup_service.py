@@ -0,0 +1,270 @@
+import asyncio
+import logging
+from sqlalchemy import Integer, any_, bindparam, func, not_, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import invalidate_on_commit, response_cache, tenant_tag
+from app.models.clinic import Clinic
+from app.models.clinic_requirments import ClinicRequirements
+from app.models.dashboard_kpi import DashboardKPI
+from app.models.donation import Donation
+from app.models.donation_allocation import DonationAllocation
+from app.services.kpi_service import (
+    clinic_kpi_columns,
+    ngo_kpi_columns,
+    csr_kpi_columns,
+    get_clinic_kpis,
+    get_ngo_kpis,
+    get_csr_kpis,
+    get_platform_kpis,
+)
+
+logger = logging.getLogger(__name__)
+
+CLINIC = "CLINIC"
+NGO = "NGO"
+CSR = "CSR"
+PLATFORM = "PLATFORM"
+PLATFORM_TENANT_ID = 0
+
+LIVE_KPIS = {
+    CLINIC: get_clinic_kpis,
+    NGO: get_ngo_kpis,
+    CSR: get_csr_kpis,
+}
+
+
+# ---------------------------------------------------------
+# Grouped KPI queries (one query per tenant type)
+# ---------------------------------------------------------
+
+async def _clinic_rollups(db, clinic_ids=None) -> dict:
+    stmt = (
+        select(ClinicRequirements.clinic_id, *clinic_kpi_columns())
+        .group_by(ClinicRequirements.clinic_id)
+    )
+    if clinic_ids is not None:
+        stmt = stmt.where(ClinicRequirements.clinic_id.in_(clinic_ids))
+
+    result = await db.execute(stmt)
+    return {
+        row.pop("clinic_id"): row
+        for row in map(dict, result.mappings().all())
+    }
+
+
+async def _ngo_rollups(db, ngo_ids=None) -> dict:
+    stmt = (
+        select(Clinic.ngo_id, *ngo_kpi_columns())
+        .select_from(ClinicRequirements)
+        .join(Clinic, Clinic.id == ClinicRequirements.clinic_id)
+        .group_by(Clinic.ngo_id)
+    )
+    if ngo_ids is not None:
+        stmt = stmt.where(Clinic.ngo_id.in_(ngo_ids))
+
+    result = await db.execute(stmt)
+
+    rollups = {}
+    for row in map(dict, result.mappings().all()):
+        row["pending_allocations"] = (
+            row["confirmed_needs"] - row["allocated_needs"]
+        )
+        rollups[row.pop("ngo_id")] = row
+    return rollups
+
+
+async def _csr_rollups(db, company_ids=None) -> dict:
+    stmt = (
+        select(Donation.company_id, *csr_kpi_columns())
+        .select_from(Donation)
+        .outerjoin(
+            DonationAllocation,
+            DonationAllocation.donation_id == Donation.id,
+        )
+        .group_by(Donation.company_id)
+    )
+    if company_ids is not None:
+        stmt = stmt.where(Donation.company_id.in_(company_ids))
+
+    result = await db.execute(stmt)
+    return {
+        row.pop("company_id"): row
+        for row in map(dict, result.mappings().all())
+    }
+
+
+# ---------------------------------------------------------
+# Storage
+# ---------------------------------------------------------
+
+async def _store_rollups(db, tenant_type: str, rollups: dict):
+    rows = [
+        {
+            "tenant_type": tenant_type,
+            "tenant_id": tenant_id,
+            "metric": metric,
+            "value": value or 0,
+        }
+        for tenant_id, kpis in rollups.items()
+        for metric, value in kpis.items()
+    ]
+    if not rows:
+        return
+
+    stmt = insert(DashboardKPI).values(rows)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["tenant_type", "tenant_id", "metric"],
+            set_={
+                "value": stmt.excluded.value,
+                "updated_at": func.now(),
+            },
+        )
+    )
+
+
+async def _zero_other_tenants(db, tenant_type: str, tenant_ids):
+    """
+    Zero the stored counters of every tenant of `tenant_type` outside
+    `tenant_ids`, i.e. tenants whose last base rows are gone.
+    """
+    await db.execute(
+        update(DashboardKPI)
+        .where(
+            DashboardKPI.tenant_type == tenant_type,
+            # one array parameter, however many tenants there are
+            not_(DashboardKPI.tenant_id == any_(
+                bindparam("tenant_ids", list(tenant_ids), type_=ARRAY(Integer))
+            )),
+            DashboardKPI.value != 0,
+        )
+        .values(value=0, updated_at=func.now())
+    )
+
+
+async def refresh_dashboard_rollups(
+    db: AsyncSession,
+    clinic_ids=(),
+    company_ids=(),
+):
+    """
+    Recompute the rollups touched by a state change.
+
+    Must be called BEFORE db.commit() so the counters are written
+    in the same transaction as the change that produced them.
+    Requirement changes also refresh the owning NGO and the platform.
+    Cached dashboard responses of these tenants are dropped on commit.
+    """
+    clinic_ids = {c for c in clinic_ids if c is not None}
+    company_ids = {c for c in company_ids if c is not None}
+
+    if clinic_ids:
+        result = await db.execute(
+            select(Clinic.ngo_id).where(Clinic.id.in_(clinic_ids)).distinct()
+        )
+        ngo_ids = set(result.scalars().all())
+
+        clinic_rollups = await _clinic_rollups(db, clinic_ids)
+        ngo_rollups = await _ngo_rollups(db, ngo_ids)
+
+        # tenants that no longer have any rows drop back to zero
+        for clinic_id in clinic_ids - clinic_rollups.keys():
+            clinic_rollups[clinic_id] = dict.fromkeys(
+                c.name for c in clinic_kpi_columns()
+            )
+        for ngo_id in ngo_ids - ngo_rollups.keys():
+            ngo_rollups[ngo_id] = dict.fromkeys(
+                [c.name for c in ngo_kpi_columns()] + ["pending_allocations"]
+            )
+
+        await _store_rollups(db, CLINIC, clinic_rollups)
+        await _store_rollups(db, NGO, ngo_rollups)
+        await _store_rollups(
+            db, PLATFORM, {PLATFORM_TENANT_ID: await get_platform_kpis(db)}
+        )
+
+        invalidate_on_commit(
+            db,
+            tenant_tag(PLATFORM, PLATFORM_TENANT_ID),
+            *(tenant_tag(CLINIC, c) for c in clinic_ids),
+            *(tenant_tag(NGO, n) for n in ngo_ids),
+        )
+
+    if company_ids:
+        await _store_rollups(db, CSR, await _csr_rollups(db, company_ids))
+
+        invalidate_on_commit(
+            db, *(tenant_tag(CSR, c) for c in company_ids)
+        )
+
+
+async def get_dashboard_kpis(
+    db: AsyncSession,
+    tenant_type: str,
+    tenant_id: int = PLATFORM_TENANT_ID,
+) -> dict:
+    """
+    Read a tenant's dashboard counters from the rollup table.
+    The first read for a tenant computes and stores them.
+    """
+    result = await db.execute(
+        select(DashboardKPI.metric, DashboardKPI.value).where(
+            DashboardKPI.tenant_type == tenant_type,
+            DashboardKPI.tenant_id == tenant_id,
+        )
+    )
+    kpis = dict(result.all())
+    if kpis:
+        return kpis
+
+    if tenant_type == PLATFORM:
+        kpis = await get_platform_kpis(db)
+    else:
+        kpis = await LIVE_KPIS[tenant_type](db, tenant_id)
+
+    await _store_rollups(db, tenant_type, {tenant_id: kpis})
+    await db.commit()
+
+    return kpis
+
+
+# ---------------------------------------------------------
+# Reconciliation
+# ---------------------------------------------------------
+
+async def reconcile_dashboard_rollups(db: AsyncSession):
+    """
+    Recompute every rollup from the base tables.
+    Corrects drift from write paths that do not refresh rollups;
+    stored tenants the grouped queries no longer return drop to zero.
+    """
+    for tenant_type, rollups in (
+        (CLINIC, await _clinic_rollups(db)),
+        (NGO, await _ngo_rollups(db)),
+        (CSR, await _csr_rollups(db)),
+    ):
+        await _store_rollups(db, tenant_type, rollups)
+        await _zero_other_tenants(db, tenant_type, rollups.keys())
+
+    await _store_rollups(
+        db, PLATFORM, {PLATFORM_TENANT_ID: await get_platform_kpis(db)}
+    )
+    await db.commit()
+
+    response_cache.clear()
+
+
+async def run_rollup_reconciler(session_factory, interval_seconds: int):
+    """
+    Background loop started on application startup.
+    """
+    while True:
+        try:
+            async with session_factory() as db:
+                await reconcile_dashboard_rollups(db)
+        except Exception:
+            logger.exception("Dashboard rollup reconciliation failed")
+
+        await asyncio.sleep(interval_seconds)
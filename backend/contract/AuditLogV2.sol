@@ -0,0 +1,84 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+/// Audit log v2: fixed-size hashes, small action codes and a batch
+/// entry point, so many records share one transaction's base cost.
+/// With storeEntries = false records only live in the event log,
+/// which avoids per-record storage writes entirely.
+contract AuditLogV2 {
+
+    struct AuditEntry {
+        bytes32 recordHash;
+        uint8 actionCode;
+        uint64 timestamp;
+    }
+
+    address public immutable owner;
+    bool public immutable storeEntries;
+
+    AuditEntry[] private logs;
+    uint256 public totalRecords;
+
+    event AuditRecorded(
+        bytes32 indexed recordHash,
+        uint8 actionCode,
+        uint256 timestamp
+    );
+
+    event AuditBatchLogged(
+        uint256 indexed firstIndex,
+        uint256 count,
+        uint256 timestamp
+    );
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "not owner");
+        _;
+    }
+
+    constructor(bool _storeEntries) {
+        owner = msg.sender;
+        storeEntries = _storeEntries;
+    }
+
+    function logAction(bytes32 recordHash, uint8 actionCode) external onlyOwner {
+        if (storeEntries) {
+            logs.push(AuditEntry(recordHash, actionCode, uint64(block.timestamp)));
+        }
+        emit AuditRecorded(recordHash, actionCode, block.timestamp);
+        totalRecords += 1;
+    }
+
+    function logBatch(
+        bytes32[] calldata hashes,
+        uint8[] calldata actionCodes
+    ) external onlyOwner {
+        uint256 count = hashes.length;
+        require(count > 0, "empty batch");
+        require(count == actionCodes.length, "length mismatch");
+
+        uint256 firstIndex = totalRecords;
+        uint64 timestamp = uint64(block.timestamp);
+
+        for (uint256 i = 0; i < count; ) {
+            if (storeEntries) {
+                logs.push(AuditEntry(hashes[i], actionCodes[i], timestamp));
+            }
+            emit AuditRecorded(hashes[i], actionCodes[i], block.timestamp);
+            unchecked { ++i; }
+        }
+
+        totalRecords = firstIndex + count;
+        emit AuditBatchLogged(firstIndex, count, block.timestamp);
+    }
+
+    function getLog(uint256 index)
+        external
+        view
+        returns (bytes32, uint8, uint256)
+    {
+        require(storeEntries, "event-only deployment");
+        AuditEntry memory e = logs[index];
+        return (e.recordHash, e.actionCode, e.timestamp);
+    }
+}
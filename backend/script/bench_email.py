@@ -0,0 +1,90 @@
+"""
+Email delivery benchmark against the local SMTP sink.
+
+Compares one connection per message (the old send path) with the
+pooled SMTPTransport, using the real templates.
+
+    cd backend && PYTHONPATH=. python script/bench_email.py --messages 500
+"""
+
+import argparse
+import asyncio
+import smtplib
+import time
+
+from smtp_sink import SMTPSink
+
+from app.notifications.templating import render_email
+from app.notifications.transport import SMTPTransport, build_message
+
+
+def _messages(count: int):
+    for i in range(count):
+        rendered = render_email(
+            "clinic_invitation",
+            clinic_name=f"Clinic {i}",
+            invite_link=f"https://example.org/invite?token={i}",
+            ngo_name="Bench NGO",
+            csr1_number="CSR00000001",
+            reference_id=f"INV-BENCH-{i:06d}",
+        )
+        yield build_message(
+            f"clinic{i}@example.org",
+            rendered.subject,
+            rendered.text,
+            rendered.html,
+        )
+
+
+def _send_one_per_connection(port: int, message):
+    with smtplib.SMTP("127.0.0.1", port) as s:
+        s.login("bench", "bench")
+        s.send_message(message)
+
+
+async def bench_per_message(port: int, messages) -> float:
+    loop = asyncio.get_running_loop()
+    start = time.perf_counter()
+    for message in messages:
+        await loop.run_in_executor(None, _send_one_per_connection, port, message)
+    return time.perf_counter() - start
+
+
+async def bench_pooled(port: int, messages, pool_size: int) -> float:
+    transport = SMTPTransport(
+        "127.0.0.1", port, "bench", "bench", security="none", size=pool_size
+    )
+    start = time.perf_counter()
+    await asyncio.gather(*(transport.send(m) for m in messages))
+    elapsed = time.perf_counter() - start
+    await transport.close()
+    return elapsed
+
+
+async def main(count: int, pool_size: int):
+    sink = await SMTPSink(port=0, keep=False).start()
+
+    start = time.perf_counter()
+    messages = list(_messages(count))
+    render_time = time.perf_counter() - start
+
+    per_message = await bench_per_message(sink.port, messages)
+    connections = sink.connections
+
+    pooled = await bench_pooled(sink.port, messages, pool_size)
+    pooled_connections = sink.connections - connections
+
+    await sink.stop()
+
+    print(f"rendered {count} messages in {render_time * 1000:.1f} ms")
+    print(f"per-message connections: {per_message:.3f}s ({connections} connections)")
+    print(f"pooled transport:        {pooled:.3f}s ({pooled_connections} connections)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Email delivery benchmark")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=2)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.messages, args.pool_size))
@@ -0,0 +1,96 @@
+"""
+Startup and route-matching benchmark.
+
+Measures how long building the app takes (router imports plus
+registration), prints the final routing table, and times matching a
+request path against the table the way the router does: route by route,
+in order, until one matches.
+
+    cd backend && PYTHONPATH=. python script/bench_routing.py
+    cd backend && PYTHONPATH=. python script/bench_routing.py --table --rounds 20000
+"""
+
+import argparse
+import re
+import sys
+import time
+
+from starlette.routing import Match
+
+
+def _concrete_path(path: str) -> str:
+    return re.sub(r"\{[^}]+\}", "1", path)
+
+
+def _scope(method: str, path: str) -> dict:
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "root_path": "",
+        "query_string": b"",
+        "headers": [],
+    }
+
+
+def _match_position(routes, scope) -> int:
+    for position, route in enumerate(routes, start=1):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return position
+    return len(routes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=5000)
+    parser.add_argument("--table", action="store_true", help="print the routing table")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    from app.main import app
+    from app.core.routes import registered_routes, routing_table
+    startup_ms = (time.perf_counter() - started) * 1000
+
+    routes = list(registered_routes(app))
+    table = routing_table(app)
+
+    if args.table:
+        for row in table:
+            print(f"  {','.join(row['methods']):<10} {row['path']:<50} {row['endpoint']}")
+        print()
+
+    requests = [
+        (method, _concrete_path(row["path"]))
+        for row in table
+        for method in row["methods"][:1]
+        if row["path"] and method != "HEAD"
+    ]
+    requests.append(("GET", "/no/such/route"))
+
+    positions = [_match_position(routes, _scope(m, p)) for m, p in requests]
+
+    scopes = [_scope(m, p) for m, p in requests]
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        for scope in scopes:
+            _match_position(routes, scope)
+    elapsed = time.perf_counter() - started
+    per_match_us = elapsed / (args.rounds * len(scopes)) * 1e6
+
+    miss_scope = _scope("GET", "/no/such/route")
+    started = time.perf_counter()
+    for _ in range(args.rounds):
+        _match_position(routes, miss_scope)
+    miss_us = (time.perf_counter() - started) / args.rounds * 1e6
+
+    print(f"Python {sys.version.split()[0]}")
+    print(f"App import + router registration: {startup_ms:.0f} ms")
+    print(f"Routes in table:                  {len(routes)}")
+    print(f"Routes tried per request (avg):   {sum(positions) / len(positions):.1f}")
+    print(f"Match time per request (avg):     {per_match_us:.1f} us")
+    print(f"Unmatched path (full scan):       {miss_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+JSON serialization micro-benchmark for list responses.
+
+Compares, on a donation-history-shaped page:
+  - jsonable_encoder + json.dumps (FastAPI's path without a response model)
+  - app.core.responses.dumps (orjson when installed)
+  - Pydantic dump_json through the typed response model
+
+    cd backend && PYTHONPATH=. python script/bench_serialization.py --rows 200 --rounds 500
+"""
+
+import argparse
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.core.pagination import Page
+from app.core.responses import dumps, orjson
+from app.donations.schema import DonationHistoryItem
+
+
+def _page(rows: int) -> dict:
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return {
+        "items": [
+            {
+                "donation_id": i,
+                "item_name": f"Medical kit {i % 40}",
+                "quantity": 10 + i % 500,
+                "purpose": "Rural healthcare support for primary clinics",
+                "status": ("AUTHORIZED", "ACCEPTED", "ALLOCATED")[i % 3],
+                "created_at": start + timedelta(minutes=i),
+            }
+            for i in range(rows)
+        ],
+        "next_cursor": "WyIyMDI2LTAxLTAxVDAwOjAwOjAwKzAwOjAwIiwgMV0",
+    }
+
+
+def _time(fn, rounds: int) -> float:
+    fn()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=500)
+    args = parser.parse_args()
+
+    page = _page(args.rows)
+    adapter = TypeAdapter(Page[DonationHistoryItem])
+
+    paths = {
+        "jsonable_encoder + json.dumps": lambda: json.dumps(
+            jsonable_encoder(page), separators=(",", ":")
+        ).encode(),
+        f"responses.dumps ({'orjson' if orjson else 'stdlib json'})": lambda: dumps(page),
+        "pydantic dump_json (response model)": lambda: adapter.dump_json(
+            adapter.validate_python(page), exclude_unset=True
+        ),
+    }
+
+    sizes = {name: len(fn()) for name, fn in paths.items()}
+    baseline = None
+    print(f"{args.rows} rows per page, {args.rounds} rounds\n")
+    for name, fn in paths.items():
+        us = _time(fn, args.rounds)
+        baseline = baseline or us
+        print(f"  {name:<38} {us:>9.1f} us/page  {baseline / us:>5.1f}x  {sizes[name]} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Compile and deploy the AuditLogV2 contract.
+
+    cd backend && PYTHONPATH=. python script/deploy_audit_v2.py --rpc-url http://127.0.0.1:7545
+    cd backend && PYTHONPATH=. python script/deploy_audit_v2.py --eth-tester --event-only
+    cd backend && PYTHONPATH=. python script/deploy_audit_v2.py --abi-only
+
+Every run regenerates app/blockchain/audit_log_v2.json from the compiled
+contract; --abi-only stops there. Deploying prints the address to put in
+AUDIT_CONTRACT_ADDRESS (with AUDIT_CONTRACT_VERSION=2).
+Needs web3 and py-solc-x; --eth-tester also needs eth-tester.
+"""
+
+import argparse
+import json
+
+from app.blockchain.audit_v2 import ABI_PATH, compile_audit_v2
+
+
+def deploy(w3, abi, bytecode, store_entries: bool = True):
+    account = w3.eth.accounts[0]
+    factory = w3.eth.contract(abi=abi, bytecode=bytecode)
+
+    tx_hash = factory.constructor(store_entries).transact({"from": account})
+    receipt = w3.eth.wait_for_transaction_receipt(tx_hash)
+
+    return receipt.contractAddress
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deploy AuditLogV2")
+    parser.add_argument("--rpc-url", default="http://127.0.0.1:7545")
+    parser.add_argument("--eth-tester", action="store_true", help="deploy to an in-process eth-tester chain")
+    parser.add_argument("--event-only", action="store_true", help="keep records in events only, no storage")
+    parser.add_argument("--abi-only", action="store_true", help="regenerate the ABI file without deploying")
+    args = parser.parse_args()
+
+    abi, bytecode = compile_audit_v2()
+    ABI_PATH.write_text(json.dumps(abi, indent=2) + "\n")
+    print("✅ ABI written to", ABI_PATH)
+
+    if args.abi_only:
+        raise SystemExit(0)
+
+    from web3 import Web3
+
+    if args.eth_tester:
+        w3 = Web3(Web3.EthereumTesterProvider())
+    else:
+        w3 = Web3(Web3.HTTPProvider(args.rpc_url))
+        assert w3.is_connected(), "❌ Chain not reachable"
+
+    address = deploy(w3, abi, bytecode, store_entries=not args.event_only)
+
+    print("✅ AuditLogV2 deployed")
+    print("📍 Address:", address)
+    print("🗄️  Storage:", "event-only" if args.event_only else "events + storage")
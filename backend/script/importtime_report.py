@@ -0,0 +1,126 @@
+"""
+Import-time report for the API entry point, from `python -X importtime`.
+
+Runs a fresh interpreter that imports the target module, then sums the
+self time per top-level package and lists the slowest packages and
+modules. Save a report with --json and compare a later run against it
+with --baseline; the exit code is 1 when the total import time regresses
+by more than --max-regression percent, or when a --forbid package loads.
+
+    cd backend && python script/importtime_report.py
+    cd backend && python script/importtime_report.py --json importtime.json
+    cd backend && python script/importtime_report.py --baseline importtime.json --forbid cv2 web3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def collect(module: str) -> list[tuple[str, int, int]]:
+    """
+    [(module, self_us, cumulative_us)] in import order.
+    """
+    pythonpath = [str(BACKEND_DIR), os.environ.get("PYTHONPATH", "")]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in pythonpath if p))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        tail = proc.stderr.strip().splitlines()[-5:]
+        raise SystemExit(f"Importing {module} failed:\n" + "\n".join(tail))
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def summarise(rows: list[tuple[str, int, int]], top: int) -> dict:
+    per_package = defaultdict(int)
+    for name, self_us, _ in rows:
+        per_package[name.split(".")[0]] += self_us
+
+    return {
+        "total_ms": round(sum(r[1] for r in rows) / 1000, 1),
+        "module_count": len(rows),
+        "packages_ms": {
+            name: round(us / 1000, 1)
+            for name, us in sorted(per_package.items(), key=lambda kv: -kv[1])[:top]
+        },
+        "slowest_modules_ms": {
+            name: round(cumulative / 1000, 1)
+            for name, _, cumulative in sorted(rows, key=lambda r: -r[2])[:top]
+        },
+        "loaded": sorted(per_package),
+    }
+
+
+def print_report(module: str, report: dict):
+    print(f"import {module}: {report['total_ms']} ms over {report['module_count']} modules\n")
+
+    print("Self time per top-level package:")
+    for name, ms in report["packages_ms"].items():
+        print(f"  {ms:>9.1f} ms  {name}")
+
+    print("\nSlowest modules (cumulative):")
+    for name, ms in report["slowest_modules_ms"].items():
+        print(f"  {ms:>9.1f} ms  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=3, help="report the fastest of N runs")
+    parser.add_argument("--json", help="write the report to this file")
+    parser.add_argument("--baseline", help="compare against a report written with --json")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="percent")
+    parser.add_argument("--forbid", nargs="*", default=[], help="packages that must not load")
+    args = parser.parse_args()
+
+    reports = [summarise(collect(args.module), args.top) for _ in range(args.runs)]
+    report = min(reports, key=lambda r: r["total_ms"])
+    print_report(args.module, report)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+    failed = False
+
+    forbidden = sorted(set(args.forbid) & set(report["loaded"]))
+    if forbidden:
+        print(f"\nFAIL: loaded at import: {', '.join(forbidden)}")
+        failed = True
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        change = (report["total_ms"] - baseline["total_ms"]) / baseline["total_ms"] * 100
+        print(f"\nBaseline {baseline['total_ms']} ms → {report['total_ms']} ms ({change:+.1f}%)")
+
+        new_packages = sorted(set(report["loaded"]) - set(baseline.get("loaded", [])))
+        if new_packages:
+            print("Newly loaded packages:", ", ".join(new_packages))
+
+        if change > args.max_regression:
+            print(f"FAIL: import time regressed more than {args.max_regression}%")
+            failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Local SMTP stand-in for tests and benchmarks.
+
+Accepts any AUTH, never uses TLS, and keeps received messages in
+memory (or just counts them). Point the app at it with:
+
+    BREVO_SMTP_SERVER=127.0.0.1 BREVO_SMTP_PORT=2525 EMAIL_SMTP_SECURITY=none
+
+Run standalone:
+
+    python script/smtp_sink.py --port 2525
+"""
+
+import argparse
+import asyncio
+
+
+class SMTPSink:
+    def __init__(self, host: str = "127.0.0.1", port: int = 2525, keep: bool = True):
+        self.host = host
+        self.port = port
+        self.keep = keep
+        self.messages = []
+        self.received = 0
+        self.connections = 0
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(
+            self._handle, self.host, self.port
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+
+        def reply(line: str):
+            writer.write(line.encode() + b"\r\n")
+
+        reply("220 smtp-sink ready")
+        await writer.drain()
+
+        mail_from, rcpt_to = None, []
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+
+            command = line.decode(errors="replace").strip()
+            verb = command.split(" ", 1)[0].upper()
+
+            if verb == "EHLO":
+                reply("250-smtp-sink")
+                reply("250-AUTH PLAIN LOGIN")
+                reply("250 8BITMIME")
+            elif verb == "HELO":
+                reply("250 smtp-sink")
+            elif verb == "AUTH":
+                parts = command.split()
+                if parts[1].upper() == "LOGIN" and len(parts) == 2:
+                    # username and password prompts
+                    reply("334 VXNlcm5hbWU6")
+                    await writer.drain()
+                    await reader.readline()
+                    reply("334 UGFzc3dvcmQ6")
+                    await writer.drain()
+                    await reader.readline()
+                elif parts[1].upper() == "LOGIN":
+                    reply("334 UGFzc3dvcmQ6")
+                    await writer.drain()
+                    await reader.readline()
+                reply("235 Authentication successful")
+            elif verb == "MAIL":
+                mail_from, rcpt_to = command[10:], []
+                reply("250 OK")
+            elif verb == "RCPT":
+                rcpt_to.append(command[8:])
+                reply("250 OK")
+            elif verb == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                await writer.drain()
+
+                data = []
+                while True:
+                    chunk = await reader.readline()
+                    if chunk in (b".\r\n", b".\n", b""):
+                        break
+                    data.append(chunk)
+
+                self.received += 1
+                if self.keep:
+                    self.messages.append(
+                        {"from": mail_from, "to": rcpt_to, "data": b"".join(data)}
+                    )
+                reply("250 OK queued")
+            elif verb in ("RSET", "NOOP"):
+                reply("250 OK")
+            elif verb == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("502 Command not implemented")
+
+            await writer.drain()
+
+        writer.close()
+
+
+async def _serve(host: str, port: int):
+    sink = await SMTPSink(host, port, keep=False).start()
+    print(f"SMTP sink listening on {sink.host}:{sink.port}")
+
+    try:
+        while True:
+            await asyncio.sleep(10)
+            print(f"connections={sink.connections} messages={sink.received}")
+    finally:
+        await sink.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SMTP stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2525)
+    args = parser.parse_args()
+
+    asyncio.run(_serve(args.host, args.port))
@@ -0,0 +1,106 @@
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.allocation_engine import (
+    Demand,
+    PlannedAllocation,
+    Supply,
+    _fill_heap,
+    _fill_vectorized,
+    normalize_asset_name,
+    solve_allocation,
+)
+
+T0 = datetime(2025, 1, 1)
+
+
+@pytest.mark.parametrize("a, b", [
+    ("Paracetamol  500mg Tablets", "paracetamol-500mg tablet"),
+    ("N95 Masks", "n95 mask"),
+    ("Gloves (Latex)", "glove latex"),
+    ("ORS sachets", "ors sachet"),
+])
+def test_normalize_asset_name_matches_spelling_variants(a, b):
+    assert normalize_asset_name(a) == normalize_asset_name(b)
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Bandages", "bandage"),
+    ("gas", "gas"),              # too short to be a plural
+    ("Dressings, sterile", "dressing sterile"),
+    ("Glass", "glass"),          # -ss is not a plural
+    ("  ", ""),
+])
+def test_normalize_asset_name(name, key):
+    assert normalize_asset_name(name) == key
+
+
+def test_priority_wins_over_age():
+    supplies = [Supply(1, "mask", 10)]
+    demands = [
+        Demand(1, clinic_id=1, asset="mask", quantity=10, priority="LOW", created_at=T0),
+        Demand(2, clinic_id=2, asset="mask", quantity=10, priority="EMERGENCY", created_at=T0 + timedelta(days=3)),
+        Demand(3, clinic_id=3, asset="mask", quantity=10, priority="HIGH", created_at=T0),
+    ]
+
+    assert solve_allocation(supplies, demands) == [
+        PlannedAllocation(donation_id=1, requirement_id=2, clinic_id=2, asset="mask", quantity=10),
+    ]
+
+
+def test_same_priority_is_filled_oldest_first_across_donations():
+    supplies = [Supply(1, "mask", 4), Supply(2, "mask", 6)]
+    demands = [
+        Demand(1, clinic_id=1, asset="mask", quantity=5, priority="HIGH", created_at=T0 + timedelta(days=1)),
+        Demand(2, clinic_id=2, asset="mask", quantity=5, priority="HIGH", created_at=T0),
+        Demand(3, clinic_id=3, asset="mask", quantity=5, priority="UNKNOWN", created_at=T0),
+    ]
+
+    plan = solve_allocation(supplies, demands)
+
+    assert [(p.donation_id, p.requirement_id, p.quantity) for p in plan] == [
+        (1, 2, 4),
+        (2, 2, 1),
+        (2, 1, 5),
+    ]
+
+
+def test_assets_are_never_mixed():
+    plan = solve_allocation(
+        [Supply(1, "mask", 5)],
+        [Demand(1, clinic_id=1, asset="glove", quantity=5, priority="EMERGENCY")],
+    )
+    assert plan == []
+
+
+def _random_case(rng: random.Random):
+    supplies = [
+        Supply(i, "mask", rng.randint(1, 50))
+        for i in range(rng.randint(1, 40))
+    ]
+    demands = [
+        Demand(
+            requirement_id=i,
+            clinic_id=rng.randint(1, 5),
+            asset="mask",
+            quantity=rng.randint(1, 50),
+            priority=rng.choice(["EMERGENCY", "HIGH", "NORMAL", "LOW", "OTHER"]),
+            created_at=rng.choice([None, T0 + timedelta(hours=rng.randint(0, 72))]),
+        )
+        for i in range(rng.randint(1, 40))
+    ]
+    return supplies, demands
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_vectorized_plan_equals_heap_plan(seed):
+    np = pytest.importorskip("numpy")
+    supplies, demands = _random_case(random.Random(seed))
+
+    heap_plan = _fill_heap(supplies, demands)
+
+    assert _fill_vectorized(np, supplies, demands) == heap_plan
+    allocated = sum(p.quantity for p in heap_plan)
+    assert allocated == min(sum(s.quantity for s in supplies), sum(d.quantity for d in demands))
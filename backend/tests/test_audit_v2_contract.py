@@ -0,0 +1,88 @@
+"""
+AuditLogV2 compiled from source and exercised on an in-process
+eth-tester chain: the committed ABI, logBatch, receipts and event
+decoding through get_audit_logs.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("solcx")
+pytest.importorskip("eth_tester")
+
+from web3 import Web3
+
+from app.blockchain.audit_chain import get_audit_logs, get_receipts, submit_merkle_roots
+from app.blockchain.audit_v2 import AUDIT_V2_ABI, AuditLogV2Client, compile_audit_v2
+
+HASHES = [bytes([i]) * 32 for i in range(1, 4)]
+
+
+def _signature(entry: dict) -> tuple:
+    return (
+        entry["type"],
+        entry.get("name", ""),
+        tuple((i["type"], i["name"], i.get("indexed", False)) for i in entry.get("inputs", [])),
+        tuple(o["type"] for o in entry.get("outputs", [])),
+        entry.get("stateMutability", ""),
+    )
+
+
+@pytest.fixture(scope="module")
+def compiled():
+    try:
+        return compile_audit_v2()
+    except Exception as exc:  # offline, or no solc build for this platform
+        pytest.skip(f"solc unavailable: {exc}")
+
+
+@pytest.fixture
+def chain(compiled):
+    abi, bytecode = compiled
+    w3 = Web3(Web3.EthereumTesterProvider())
+    owner = w3.eth.accounts[0]
+
+    tx = w3.eth.contract(abi=abi, bytecode=bytecode).constructor(True).transact({"from": owner})
+    address = w3.eth.wait_for_transaction_receipt(tx).contractAddress
+
+    # the shape chain_call hands to the wrapped functions
+    return SimpleNamespace(w3=w3, contract=None, audit_v2=AuditLogV2Client(w3, address))
+
+
+def test_committed_abi_matches_the_contract_source(compiled):
+    abi, _ = compiled
+    assert sorted(map(_signature, abi)) == sorted(map(_signature, AUDIT_V2_ABI))
+
+
+def test_log_batch_events_decode_through_get_audit_logs(chain):
+    hashes = [h.hex() for h in HASHES]
+    tx_hash = chain.audit_v2.log_batch(
+        hashes,
+        ["MERKLE_ROOT", "DONATION_ACCEPTED", "NGO_ALLOCATION"],
+        chain.w3.eth.accounts[0],
+    )
+
+    assert tx_hash.startswith("0x")
+    receipts = get_receipts.__wrapped__(chain, [tx_hash])
+    assert receipts[tx_hash]["status"] == 1
+
+    events = get_audit_logs.__wrapped__(chain, 0, chain.w3.eth.block_number)
+
+    assert [e["record_hash"] for e in events] == hashes
+    assert [e["action"] for e in events] == ["MERKLE_ROOT", "DONATION_ACCEPTED", "NGO_ALLOCATION"]
+    assert {e["tx_hash"] for e in events} == {tx_hash}
+    assert chain.audit_v2.total_records() == 3
+    assert chain.audit_v2.get_log(1)["record_hash"] == hashes[1]
+
+
+def test_submitted_roots_are_tracked_by_their_receipt(chain):
+    roots = [h.hex() for h in HASHES[:2]]
+
+    tx_hash, nonce, gas_price = submit_merkle_roots.__wrapped__(chain, roots)
+
+    assert tx_hash.startswith("0x")
+    assert gas_price > 0
+    receipts = get_receipts.__wrapped__(chain, [tx_hash])
+    assert receipts[tx_hash]["status"] == 1
+    assert [e["record_hash"] for e in get_audit_logs.__wrapped__(chain, 0, "latest")] == roots
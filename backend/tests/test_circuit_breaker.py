@@ -0,0 +1,70 @@
+import pytest
+
+from app.blockchain import client as client_module
+from app.blockchain.client import BlockchainUnavailable, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(client_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _fail():
+    raise ConnectionError("node down")
+
+
+def _trip(breaker, times):
+    for _ in range(times):
+        with pytest.raises(ConnectionError):
+            breaker.call(_fail)
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    _trip(breaker, 2)
+    assert breaker.state == "CLOSED"
+    _trip(breaker, 1)
+    assert breaker.state == "OPEN"
+
+    with pytest.raises(BlockchainUnavailable):
+        breaker.call(lambda: "never called")
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+
+    _trip(breaker, 2)
+    assert breaker.call(lambda: "ok") == "ok"
+    _trip(breaker, 2)
+
+    assert breaker.state == "CLOSED"
+
+
+def test_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    _trip(breaker, 1)
+
+    clock[0] += 30
+    assert breaker.state == "HALF_OPEN"
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_success()
+    assert breaker.state == "CLOSED"
+
+
+def test_failed_probe_opens_again(clock):
+    breaker = CircuitBreaker(failure_threshold=5, reset_timeout=30)
+    _trip(breaker, 5)
+
+    clock[0] += 31
+    _trip(breaker, 1)
+
+    assert breaker.state == "OPEN"
+    clock[0] += 29
+    assert breaker.state == "OPEN"
+    clock[0] += 1
+    assert breaker.state == "HALF_OPEN"
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.db.base import Base
+from app.models.clinic import Clinic
+from app.models.clinic_requirments import ClinicRequirements
+from app.models.donation import Donation
+from app.ngo import router as ngo_router
+from app.ngo.schema import ForwardDonationRequest
+
+NGO_ID, OTHER_NGO_ID = 1, 2
+
+
+def _donation(id, status, ngo_id):
+    return Donation(
+        id=id,
+        company_id=10,
+        ngo_id=ngo_id,
+        item_name="N95 Masks",
+        quantity=100,
+        purpose="Clinic stock",
+        board_resolution_ref="BR-1",
+        csr_policy_declared=True,
+        status=status,
+    )
+
+
+def _clinic(id, ngo_id):
+    return Clinic(
+        id=id,
+        clinic_name=f"Clinic {id}",
+        facility_id=f"F-{id}",
+        facility_id_type="ABHA",
+        pincode="560001",
+        official_email=f"clinic{id}@example.com",
+        ngo_id=ngo_id,
+    )
+
+
+@pytest.fixture
+def forward(monkeypatch):
+    """
+    Runs _forward_donation against an in-memory database holding:
+    donation 1 accepted by our NGO, 2 accepted by another NGO, 3 already
+    forwarded; clinic 1 ours, clinic 2 the other NGO's.
+    Returns (status, ngo_id) of the donation and the requirement statuses.
+    """
+    refreshed = []
+
+    async def refresh_dashboard_rollups(db, clinic_ids=(), company_ids=()):
+        refreshed.append((list(clinic_ids), list(company_ids)))
+
+    monkeypatch.setattr(ngo_router, "refresh_dashboard_rollups", refresh_dashboard_rollups)
+
+    async def run(donation_id, clinic_id):
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(
+                Base.metadata.create_all,
+                tables=[Donation.__table__, Clinic.__table__, ClinicRequirements.__table__],
+            )
+
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        async with session_factory() as db:
+            db.add_all([
+                _clinic(1, NGO_ID),
+                _clinic(2, OTHER_NGO_ID),
+                _donation(1, "ACCEPTED", NGO_ID),
+                _donation(2, "ACCEPTED", OTHER_NGO_ID),
+                _donation(3, "FORWARDED", NGO_ID),
+                ClinicRequirements(id=1, clinic_id=1, asset_name="N95 Masks", suggested_quantity=50, status="CONFIRMED"),
+            ])
+            await db.commit()
+
+        try:
+            async with session_factory() as db:
+                response = await ngo_router._forward_donation(
+                    db, NGO_ID, ForwardDonationRequest(donation_id=donation_id, clinic_id=clinic_id)
+                )
+                # idempotent_json commits after the handler returns
+                await db.commit()
+
+            async with session_factory() as db:
+                donation = await db.get(Donation, donation_id)
+                requirement = await db.get(ClinicRequirements, 1)
+                return response, (donation.status, donation.ngo_id), requirement.status
+        finally:
+            await engine.dispose()
+
+    return lambda donation_id, clinic_id: asyncio.run(run(donation_id, clinic_id)), refreshed
+
+
+def test_accepted_donation_is_forwarded(forward):
+    run, refreshed = forward
+
+    response, donation, requirement_status = run(1, 1)
+
+    assert response == {
+        "message": "Donation forwarded to clinic successfully",
+        "donation_id": 1,
+        "clinic_id": 1,
+    }
+    assert donation == ("FORWARDED", NGO_ID)
+    assert requirement_status == "ALLOCATED"
+    assert refreshed == [([1], [10])]
+
+
+@pytest.mark.parametrize("donation_id, clinic_id, status_code", [
+    (2, 1, 404),    # another NGO's donation
+    (99, 1, 404),   # no such donation
+    (1, 2, 404),    # another NGO's clinic
+    (3, 1, 400),    # already forwarded
+])
+def test_forward_is_refused(forward, donation_id, clinic_id, status_code):
+    run, _ = forward
+
+    with pytest.raises(HTTPException) as exc:
+        run(donation_id, clinic_id)
+
+    assert exc.value.status_code == status_code
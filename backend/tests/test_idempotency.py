@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from starlette.requests import Request
+
+from app.core.idempotency import idempotent_json
+
+NGO = {"role": "NGO", "sub": "ngo@example.com", "ngo_id": 7}
+
+
+class Result:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeSession:
+    """
+    Records what idempotent_json does to the session; the key claim
+    always succeeds and nothing is written anywhere.
+    """
+
+    def __init__(self, fail_on_update=False):
+        self.fail_on_update = fail_on_update
+        self.log = []
+
+    async def execute(self, stmt):
+        kind = stmt.__visit_name__
+        self.log.append(kind)
+        if kind == "update" and self.fail_on_update:
+            raise ConnectionError("connection lost")
+        return Result("key-1")
+
+    async def commit(self):
+        self.log.append("commit")
+
+    async def rollback(self):
+        self.log.append("rollback")
+
+
+def _request(key=None):
+    headers = [(b"idempotency-key", key.encode())] if key else []
+
+    async def receive():
+        return {"type": "http.request", "body": b'{"donation_id": 1}'}
+
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": "/ngo/donations/forward",
+            "query_string": b"",
+            "headers": headers,
+        },
+        receive,
+    )
+
+
+def _build(db):
+    async def build():
+        db.log.append("write")
+        return {"message": "ok"}
+
+    return build
+
+
+def test_write_and_stored_response_commit_together():
+    db = FakeSession()
+
+    response = asyncio.run(idempotent_json(_request("key-1"), db, NGO, _build(db)))
+
+    assert response.status_code == 200
+    assert db.log == ["insert", "write", "update", "commit"]
+
+
+def test_failed_completion_commits_nothing():
+    # a retry must be able to run the write again: none of it may be committed
+    db = FakeSession(fail_on_update=True)
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(idempotent_json(_request("key-1"), db, NGO, _build(db)))
+
+    assert "commit" not in db.log
+    assert db.log[-1] == "rollback"
+
+
+def test_without_header_the_write_is_committed_once():
+    db = FakeSession()
+
+    assert asyncio.run(idempotent_json(_request(), db, NGO, _build(db))) == {"message": "ok"}
+    assert db.log == ["write", "commit"]
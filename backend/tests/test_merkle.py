@@ -0,0 +1,54 @@
+import pytest
+
+from app.blockchain.merkle import (
+    build_levels,
+    inclusion_proof,
+    leaf_hash,
+    merkle_root,
+    node_hash,
+    verify_proof,
+)
+
+
+def _leaves(n):
+    return [leaf_hash(f"record-{i}".encode()) for i in range(n)]
+
+
+def test_empty_tree_is_rejected():
+    with pytest.raises(ValueError):
+        build_levels([])
+
+
+def test_single_leaf_is_its_own_root():
+    leaf = leaf_hash(b"only")
+    assert merkle_root([leaf]) == leaf
+    assert inclusion_proof(build_levels([leaf]), 0) == []
+
+
+def test_unpaired_node_is_promoted():
+    a, b, c = _leaves(3)
+    assert merkle_root([a, b, c]) == node_hash(node_hash(a, b), c)
+
+
+def test_leaf_and_node_hashes_are_domain_separated():
+    a, b = _leaves(2)
+    assert leaf_hash(a + b) != node_hash(a, b)
+
+
+@pytest.mark.parametrize("n", [1, 2, 3, 5, 8, 13, 64])
+def test_every_leaf_proves_against_the_root(n):
+    leaves = _leaves(n)
+    levels = build_levels(leaves)
+    root = levels[-1][0]
+
+    for i, leaf in enumerate(leaves):
+        assert verify_proof(leaf, inclusion_proof(levels, i), root)
+
+
+def test_proof_fails_for_another_leaf_or_root():
+    leaves = _leaves(6)
+    levels = build_levels(leaves)
+    proof = inclusion_proof(levels, 2)
+
+    assert not verify_proof(leaves[3], proof, levels[-1][0])
+    assert not verify_proof(leaves[2], proof, merkle_root(leaves[:5]))
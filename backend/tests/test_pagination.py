@@ -0,0 +1,40 @@
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import func
+
+from app.core.pagination import decode_cursor, encode_cursor
+from app.models.donation import Donation
+from app.models.donation_allocation import DonationAllocation
+
+SORT = (Donation.created_at, Donation.id)
+
+
+def test_cursor_round_trips_datetimes_and_ids():
+    values = (datetime(2025, 3, 1, 12, 30, 15, 123456), 42)
+
+    cursor = encode_cursor(values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, SORT) == list(values)
+
+
+def test_cursor_over_a_coalesced_column():
+    sort = (*SORT, func.coalesce(DonationAllocation.id, 0))
+    values = [datetime(2025, 3, 1), 7, 0]
+
+    assert decode_cursor(encode_cursor(values), sort) == values
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64!",
+    encode_cursor([1]),                        # wrong arity
+    encode_cursor(["yesterday", 1]),           # not a timestamp
+    "bnVsbA",                                  # "null"
+])
+def test_invalid_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor, SORT)
+
+    assert exc.value.status_code == 400
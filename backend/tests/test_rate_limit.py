@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.core import rate_limit
+from app.core.rate_limit import SharedRateLimitBackend, SlidingWindowLimiter
+
+
+class FakeRedis:
+    """
+    In-memory stand-in for redis.asyncio with the three commands the
+    shared backend uses. Keys expire on the same clock as the limiter.
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.values = {}
+        self.expires = {}
+        self.expire_calls = 0
+
+    def _alive(self, key):
+        if key in self.expires and self.expires[key] <= self.clock[0]:
+            del self.values[key], self.expires[key]
+        return key in self.values
+
+    async def incr(self, key):
+        value = int(self.values[key]) + 1 if self._alive(key) else 1
+        self.values[key] = str(value).encode()
+        return value
+
+    async def expire(self, key, seconds):
+        self.expire_calls += 1
+        if self._alive(key):
+            self.expires[key] = self.clock[0] + seconds
+
+    async def get(self, key):
+        return self.values[key] if self._alive(key) else None
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # start on a window boundary so elapsed time is easy to read
+    now = [600.0]
+    monkeypatch.setattr(rate_limit.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def redis(clock):
+    return FakeRedis(clock)
+
+
+def _hits(limiter, n, key="login:ip:1.2.3.4", limit=5, period=60):
+    async def run():
+        return [await limiter.hit(key, limit, period) for _ in range(n)]
+
+    return asyncio.run(run())
+
+
+def test_limit_applies_within_a_window(redis):
+    limiter = SlidingWindowLimiter(SharedRateLimitBackend(redis))
+
+    assert _hits(limiter, 5) == [None] * 5
+    assert _hits(limiter, 1) == [60]
+    assert redis.expire_calls == 1
+
+
+def test_workers_share_the_counters(redis):
+    a = SlidingWindowLimiter(SharedRateLimitBackend(redis))
+    b = SlidingWindowLimiter(SharedRateLimitBackend(redis))
+
+    _hits(a, 3)
+    _hits(b, 2)
+
+    assert _hits(a, 1) == [60]
+    assert set(redis.values) == {"ratelimit:login:ip:1.2.3.4:10"}
+
+
+def test_previous_window_is_weighted_by_overlap(redis, clock):
+    limiter = SlidingWindowLimiter(SharedRateLimitBackend(redis))
+    _hits(limiter, 5)
+
+    # 15s into the next window 3/4 of the old one still counts: 3.75 + 1
+    clock[0] += 75
+    assert _hits(limiter, 1) == [None]
+    assert _hits(limiter, 1) == [45]
+
+    # 45s in only 1/4 counts: 1.25 + 2 + 1
+    clock[0] += 30
+    assert _hits(limiter, 1) == [None]
+
+
+def test_counters_expire_after_two_periods(redis, clock):
+    limiter = SlidingWindowLimiter(SharedRateLimitBackend(redis))
+    _hits(limiter, 6)
+
+    clock[0] += 120
+    assert asyncio.run(redis.get("ratelimit:login:ip:1.2.3.4:10")) is None
+    assert _hits(limiter, 5) == [None] * 5
+
+
+def test_keys_are_isolated(redis):
+    limiter = SlidingWindowLimiter(SharedRateLimitBackend(redis))
+    _hits(limiter, 6, key="login:account:a@example.com")
+
+    assert _hits(limiter, 1, key="login:account:b@example.com") == [None]
@@ -0,0 +1,61 @@
+import asyncio
+
+from app.core import revocation
+from app.core.revocation import BloomFilter, is_token_revoked
+
+
+class Result:
+    def __init__(self, row):
+        self.row = row
+
+    def first(self):
+        return self.row
+
+
+class FakeSession:
+    """
+    Answers every query with `row`; records the SQL it was asked.
+    """
+
+    def __init__(self, row):
+        self.row = row
+        self.queries = []
+
+    async def execute(self, stmt):
+        self.queries.append(str(stmt))
+        return Result(self.row)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(size_bits=4096, hash_count=4)
+    values = [f"jti-{i}" for i in range(200)]
+    for value in values:
+        bloom.add(value)
+
+    assert all(value in bloom for value in values)
+
+
+def test_single_use_check_asks_the_database_on_a_filter_miss():
+    # revoked by another worker since this worker's last sync
+    assert "jti-used-elsewhere" not in revocation.revocation_filter
+    db = FakeSession(row=(1,))
+
+    assert asyncio.run(is_token_revoked("jti-used-elsewhere", db)) is True
+    assert "pg_advisory_xact_lock" in db.queries[0]
+    assert "revoked_tokens" in db.queries[1]
+
+
+def test_unused_single_use_token_is_not_revoked():
+    db = FakeSession(row=None)
+
+    assert asyncio.run(is_token_revoked("jti-fresh", db)) is False
+
+
+def test_access_token_check_skips_the_database_on_a_filter_miss(monkeypatch):
+    def no_database():
+        raise AssertionError("database queried")
+
+    monkeypatch.setattr(revocation, "AsyncSessionLocal", no_database)
+
+    assert asyncio.run(is_token_revoked("jti-not-revoked")) is False
+    assert asyncio.run(is_token_revoked(None)) is False